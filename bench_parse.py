@@ -0,0 +1,80 @@
+"""
+Parse-time benchmark for DrillingEdge detail pages.
+
+Compares the reference parser (whole page, html.parser) with the strained
+lxml parser used by scrape_production.py, on pages from an HTML cache
+(--cache_dir from scrape_production.py) or a directory of saved .html files,
+and checks that both produce the same fields.
+
+Usage:
+    python3 bench_parse.py --cache_dir output/html_cache
+    python3 bench_parse.py --html_dir saved_pages/ --repeat 5
+"""
+
+import argparse
+import time
+from pathlib import Path
+
+from html_cache import HtmlCache
+from scrape_production import (
+    DETAIL_PARSER, is_detail_page, new_row, parse_detail_html, parse_detail_html_full,
+)
+
+
+def load_pages(args) -> list[str]:
+    pages = []
+    if args.cache_dir:
+        if not Path(args.cache_dir).is_dir():
+            raise SystemExit(f"ERROR: no HTML cache at {args.cache_dir}")
+        cache = HtmlCache(Path(args.cache_dir))
+        # a page cached under several URLs counts once
+        pages.extend(dict.fromkeys(html for _, html in cache.iter_pages()))
+        cache.close()
+    if args.html_dir:
+        for p in sorted(Path(args.html_dir).rglob("*.html")):
+            pages.append(p.read_text(encoding="utf-8", errors="replace"))
+    pages = [h for h in pages if is_detail_page(h)]
+    return pages[:args.max_pages] if args.max_pages > 0 else pages
+
+
+def time_parser(fn, pages, repeat: int):
+    """Best-of-repeat total seconds, plus the parsed rows of the last round."""
+    best, rows = float("inf"), []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        rows = [fn(h, new_row({})) for h in pages]
+        best = min(best, time.perf_counter() - t0)
+    return best, rows
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark DrillingEdge detail page parsers.")
+    ap.add_argument("--cache_dir", default="", help="HTML cache written by scrape_production.py --cache_dir")
+    ap.add_argument("--html_dir", default="", help="Directory of saved detail pages (*.html)")
+    ap.add_argument("--max_pages", type=int, default=0)
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    pages = load_pages(args)
+    if not pages:
+        print("No detail pages found (give --cache_dir and/or --html_dir).")
+        return
+    print(f"{len(pages)} detail pages, {sum(len(h) for h in pages) / len(pages) / 1024:.1f} KB avg")
+
+    t_full, rows_full = time_parser(parse_detail_html_full, pages, args.repeat)
+    t_fast, rows_fast = time_parser(parse_detail_html, pages, args.repeat)
+    n = len(pages)
+    print(f"  html.parser, whole page     {t_full / n * 1000:8.3f} ms/page")
+    print(f"  {DETAIL_PARSER:<11s}, strained       {t_fast / n * 1000:8.3f} ms/page   ({t_full / max(t_fast, 1e-9):.1f}x)")
+
+    # scraped_at is the time each row was made, not a parsed field
+    diffs = [(i, k) for i, (a, b) in enumerate(zip(rows_full, rows_fast))
+             for k in a.keys() if k != "scraped_at" and a[k] != b.get(k)]
+    if diffs:
+        print(f"  WARNING: {len(diffs)} field mismatches, e.g. page {diffs[0][0]} field {diffs[0][1]!r}")
+    else:
+        print("  Parsed fields identical.")
+
+
+if __name__ == "__main__":
+    main()
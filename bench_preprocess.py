@@ -0,0 +1,124 @@
+"""
+Row mode vs --columnar benchmark for preprocess.py.
+
+Builds N-row batches per table by cycling through the rows of an existing
+data dir (inline raw OCR text is dropped so 1M rows fit in memory; a share
+of the numeric values is turned into strings like "1,234" so the per-value
+fallback is exercised too), cleans them both ways and checks the JSON output
+is identical.
+
+Usage:
+    python3 bench_preprocess.py --data_dir output/parsed --sizes 10000,100000,1000000
+"""
+
+import argparse
+import json
+import random
+import time
+from pathlib import Path
+
+import preprocess as pp
+
+TABLES = [
+    ("well_info", pp.preprocess_well),
+    ("stimulation_data", pp.preprocess_stim),
+    ("production_data", pp.preprocess_production),
+]
+DROP = ("raw_text", "raw_text_clean") + pp.STAMP_KEYS
+
+
+def template_lines(path: Path, fn, string_share: float, rng: random.Random) -> list:
+    lines = []
+    for line in path.read_text(encoding="utf-8").splitlines():
+        if not line.strip():
+            continue
+        row = json.loads(line)
+        for k in DROP:
+            row.pop(k, None)
+        for name, _ in pp.NUMERIC_FIELDS[fn]:
+            v = row.get(name)
+            if isinstance(v, (int, float)) and rng.random() < string_share:
+                row[name] = f"{v:,}"
+        lines.append(json.dumps(row, ensure_ascii=False))
+    return lines
+
+
+def numeric_columns(rows: list, fields):
+    """The numeric half of preprocess_columnar (rows already carry every field)."""
+    for name, conv in fields:
+        col = [row[name] for row in rows]
+        for row, v in zip(rows, pp.COLUMN_OPS[conv](col)):
+            row[name] = v
+
+
+def run(lines: list, n: int, fn, batch: int):
+    """
+    Seconds for n rows: (whole clean in row mode, in columnar mode, numeric fields
+    only per row, numeric fields only per column); raises if outputs differ.
+    """
+    fields = pp.NUMERIC_FIELDS[fn]
+    t_row = t_col = t_num_row = t_num_col = 0.0
+    for start in range(0, n, batch):
+        chunk = [lines[i % len(lines)] for i in range(start, min(n, start + batch))]
+        a = [json.loads(x) for x in chunk]
+        b = [json.loads(x) for x in chunk]
+        t0 = time.perf_counter()
+        a = [fn(r) for r in a]
+        t1 = time.perf_counter()
+        b = pp.preprocess_columnar(b, fn)
+        t2 = time.perf_counter()
+        t_row += t1 - t0
+        t_col += t2 - t1
+
+        c = [json.loads(x) for x in chunk]
+        d = [json.loads(x) for x in chunk]
+        for r in d:
+            pp.coerce(r, fields, numeric=False)
+        t0 = time.perf_counter()
+        for r in c:
+            pp.coerce(r, fields)
+        t1 = time.perf_counter()
+        numeric_columns(d, fields)
+        t2 = time.perf_counter()
+        t_num_row += t1 - t0
+        t_num_col += t2 - t1
+        if [json.dumps(r, ensure_ascii=False) for r in a] != [json.dumps(r, ensure_ascii=False) for r in b]:
+            raise SystemExit(f"MISMATCH at rows {start}..{start + len(chunk)}")
+    return t_row, t_col, t_num_row, t_num_col
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark preprocess.py row mode against --columnar.")
+    ap.add_argument("--data_dir", default="output/parsed", help="Rows to cycle through (*.jsonl, or *.jsonl.bak)")
+    ap.add_argument("--sizes", default="10000,100000,1000000")
+    ap.add_argument("--batch", type=int, default=50000, help="Rows per batch (like --columnar_rows)")
+    ap.add_argument("--string_share", type=float, default=0.05, help="Share of numbers turned into strings")
+    args = ap.parse_args()
+
+    if pp.np is None:
+        print("ERROR: needs numpy (pip install numpy)")
+        return
+    rng = random.Random(0)
+    data_dir = Path(args.data_dir)
+    sizes = [int(x) for x in args.sizes.split(",") if x.strip()]
+
+    print(f"{'':<28s} {'whole clean':^29s}  {'numeric fields only':^29s}")
+    print(f"{'table':<18s} {'rows':>9s} {'row s':>8s} {'columnar s':>11s} {'speedup':>8s}  "
+          f"{'row s':>8s} {'columnar s':>11s} {'speedup':>8s}")
+    for label, fn in TABLES:
+        path = data_dir / f"{label}.jsonl"
+        if not path.exists():
+            path = path.with_suffix(".jsonl.bak")
+        if not path.exists():
+            print(f"{label:<18s} (no data)")
+            continue
+        lines = template_lines(path, fn, args.string_share, rng)
+        for n in sizes:
+            t_row, t_col, t_num_row, t_num_col = run(lines, n, fn, args.batch)
+            print(f"{label:<18s} {n:>9d} {t_row:>8.2f} {t_col:>11.2f} {t_row / t_col:>7.2f}x  "
+                  f"{t_num_row:>8.2f} {t_num_col:>11.2f} {t_num_row / t_num_col:>7.2f}x", flush=True)
+    print("Outputs identical.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+"""
+Scraper throughput benchmark against the local DrillingEdge stand-in.
+
+Starts drillingedge_stub.py (unless --base_url points at a running one), runs
+scrape_production.py once per engine against it and reports, per engine:
+wells/min, p50/p95 time per well (each well's own start -> finish time,
+as logged by the scraper; concurrent wells overlap), and CPU time
+and peak RSS of the scraper processes and of the browser (chrome /
+chromedriver) processes. Per-process numbers need psutil; without it only
+the combined CPU time / largest RSS of all children are shown.
+
+Usage:
+    python3 bench_scrape.py \
+        --well_jsonl output/parsed/well_info.jsonl \
+        --prod_jsonl output/parsed/production_data.jsonl \
+        --engines http,async --latency_ms 150 \
+        --scrape_args "--rate 8 --burst 4 --concurrency 8"
+"""
+
+import argparse
+import re
+import resource
+import shlex
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from pathlib import Path
+
+try:
+    import psutil
+except ImportError:  # optional: per-process CPU / RSS split
+    psutil = None
+
+HERE = Path(__file__).resolve().parent
+RE_ROW_DONE = re.compile(r"\b(OK  status=|FAIL \(|ERROR |MISS \()")
+RE_WELL_SECS = re.compile(r"\((\d+(?:\.\d+)?)s\)$")  # scrape_production.timed
+BROWSER_NAMES = ("chrome", "chromedriver", "chromium")
+
+
+def percentile(xs, q: float) -> float:
+    if not xs:
+        return 0.0
+    xs = sorted(xs)
+    return xs[min(len(xs) - 1, int(round(q * (len(xs) - 1))))]
+
+
+class TreeSampler(threading.Thread):
+    """Polls a process tree: last CPU time per pid and peak summed RSS, split scraper / browser."""
+
+    def __init__(self, pid: int, interval: float = 0.2):
+        super().__init__(daemon=True)
+        self.root = psutil.Process(pid)
+        self.interval = interval
+        self.cpu = {}  # pid -> (is_browser, cpu seconds)
+        self.peak = {"scraper": 0, "browser": 0}
+        self.stop = threading.Event()
+
+    def run(self):
+        while not self.stop.is_set():
+            try:
+                procs = [self.root] + self.root.children(recursive=True)
+            except psutil.NoSuchProcess:
+                break
+            rss = {"scraper": 0, "browser": 0}
+            for p in procs:
+                try:
+                    browser = any(n in p.name().lower() for n in BROWSER_NAMES)
+                    t = p.cpu_times()
+                    self.cpu[p.pid] = (browser, t.user + t.system)
+                    rss["browser" if browser else "scraper"] += p.memory_info().rss
+                except psutil.Error:
+                    continue
+            for k in rss:
+                self.peak[k] = max(self.peak[k], rss[k])
+            self.stop.wait(self.interval)
+
+    def cpu_seconds(self, browser: bool) -> float:
+        return sum(c for b, c in self.cpu.values() if b == browser)
+
+
+def run_engine(engine: str, args, base_url: str, out_dir: Path) -> dict:
+    out_jsonl = out_dir / f"production_{engine}.jsonl"
+    cmd = [sys.executable, "-u", str(HERE / "scrape_production.py"),
+           "--well_jsonl", args.well_jsonl, "--out_jsonl", str(out_jsonl),
+           "--engine", engine, "--base_url", base_url, "--delay", str(args.delay), "--headless"]
+    cmd += shlex.split(args.scrape_args)
+
+    before = resource.getrusage(resource.RUSAGE_CHILDREN)
+    t0 = time.perf_counter()
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, cwd=str(HERE))
+    sampler = TreeSampler(proc.pid) if psutil is not None else None
+    if sampler is not None:
+        sampler.start()
+
+    wells = 0
+    per_well = []
+    log = []
+    for line in proc.stdout:
+        log.append(line)
+        if RE_ROW_DONE.search(line):
+            wells += 1
+            m = RE_WELL_SECS.search(line.rstrip())
+            if m:
+                per_well.append(float(m.group(1)))
+    proc.wait()
+    wall = time.perf_counter() - t0
+    after = resource.getrusage(resource.RUSAGE_CHILDREN)
+    if sampler is not None:
+        sampler.stop.set()
+        sampler.join()
+    (out_dir / f"scrape_{engine}.log").write_text("".join(log), encoding="utf-8")
+
+    res = {
+        "engine": engine,
+        "rc": proc.returncode,
+        "wells": wells,
+        "ok": sum(1 for line in log if "OK  status=" in line),
+        "wall": wall,
+        "p50": percentile(per_well, 0.50),
+        "p95": percentile(per_well, 0.95),
+        "cpu_all": (after.ru_utime + after.ru_stime) - (before.ru_utime + before.ru_stime),
+        "maxrss_mb": after.ru_maxrss / 1024,
+    }
+    if sampler is not None:
+        res.update({
+            "cpu_scraper": sampler.cpu_seconds(False), "cpu_browser": sampler.cpu_seconds(True),
+            "rss_scraper_mb": sampler.peak["scraper"] / 2**20, "rss_browser_mb": sampler.peak["browser"] / 2**20,
+        })
+    return res
+
+
+def wait_for(url: str, timeout: float = 15.0):
+    end = time.time() + timeout
+    while time.time() < end:
+        try:
+            urllib.request.urlopen(url, timeout=1).read()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"stub server did not come up at {url}")
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark scrape_production.py engines against a local stand-in.")
+    ap.add_argument("--well_jsonl", required=True)
+    ap.add_argument("--prod_jsonl", default="", help="stub: synthesize pages from this production_data.jsonl")
+    ap.add_argument("--cache_dir", default="", help="stub: serve pages recorded with --cache_dir")
+    ap.add_argument("--base_url", default="", help="Use an already running stand-in instead of starting one")
+    ap.add_argument("--port", type=int, default=8790)
+    ap.add_argument("--latency_ms", type=float, default=150.0)
+    ap.add_argument("--jitter_ms", type=float, default=50.0)
+    ap.add_argument("--error_rate", type=float, default=0.0)
+    ap.add_argument("--rate_limit", type=float, default=0.0)
+    ap.add_argument("--engines", default="http,async", help="Comma-separated: selenium,http,async,pool")
+    ap.add_argument("--delay", type=float, default=0.0, help="--delay passed to the scraper")
+    ap.add_argument("--scrape_args", default="", help="Extra scrape_production.py arguments (quoted)")
+    ap.add_argument("--out_dir", default="", help="Where outputs / logs go (default: temp dir)")
+    args = ap.parse_args()
+
+    out_dir = Path(args.out_dir or tempfile.mkdtemp(prefix="bench_scrape_"))
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    stub = None
+    base_url = args.base_url.rstrip("/")
+    if not base_url:
+        if not (args.prod_jsonl or args.cache_dir):
+            print("ERROR: give --prod_jsonl / --cache_dir for the stub, or --base_url of a running one")
+            return
+        cmd = [sys.executable, str(HERE / "drillingedge_stub.py"), "--port", str(args.port),
+               "--latency_ms", str(args.latency_ms), "--jitter_ms", str(args.jitter_ms),
+               "--error_rate", str(args.error_rate), "--rate_limit", str(args.rate_limit)]
+        if args.prod_jsonl:
+            cmd += ["--prod_jsonl", args.prod_jsonl]
+        if args.cache_dir:
+            cmd += ["--cache_dir", args.cache_dir]
+        stub = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, cwd=str(HERE))
+        base_url = f"http://127.0.0.1:{args.port}"
+        wait_for(base_url + "/__stats")
+        print(f"Stub: {base_url}  latency={args.latency_ms}±{args.jitter_ms}ms  "
+              f"errors={args.error_rate}  rate_limit={args.rate_limit or 'none'}")
+
+    results = []
+    try:
+        for engine in [e.strip() for e in args.engines.split(",") if e.strip()]:
+            print(f"Running --engine {engine} ...", flush=True)
+            results.append(run_engine(engine, args, base_url, out_dir))
+    finally:
+        if stub is not None:
+            stub.terminate()
+            stub.wait()
+
+    print(f"\n{'engine':<9s} {'wells':>5s} {'ok':>4s} {'wall s':>7s} {'wells/min':>9s} "
+          f"{'p50 s':>6s} {'p95 s':>6s}  cpu / rss")
+    for r in results:
+        rate = r["wells"] / r["wall"] * 60 if r["wall"] else 0.0
+        if "cpu_scraper" in r:
+            res = (f"scraper {r['cpu_scraper']:.1f}s {r['rss_scraper_mb']:.0f}MB  "
+                   f"browser {r['cpu_browser']:.1f}s {r['rss_browser_mb']:.0f}MB")
+        else:
+            res = f"all children {r['cpu_all']:.1f}s, largest {r['maxrss_mb']:.0f}MB (pip install psutil for a split)"
+        flag = "" if r["rc"] == 0 else f"  (exit {r['rc']})"
+        print(f"{r['engine']:<9s} {r['wells']:>5d} {r['ok']:>4d} {r['wall']:>7.1f} {rate:>9.1f} "
+              f"{r['p50']:>6.2f} {r['p95']:>6.2f}  {res}{flag}")
+    print(f"\nOutputs and logs: {out_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+Content-addressed store for the raw OCR text referenced by parsed rows.
+
+filter_and_parse.py writes each raw_text / raw_text_clean body here once,
+zlib-compressed and keyed by its sha256. The JSONL rows only carry the hash
+(raw_text_sha, raw_text_clean_sha); load_to_mysql.py copies the referenced
+blobs into the text_blobs table so web/app.py can resolve them on demand.
+
+Layout:
+    <blob_dir>/ab/ab12...ef.z     (first two hex chars as fan-out dir)
+"""
+
+import hashlib
+import zlib
+from pathlib import Path
+from typing import Optional
+
+
+def text_sha(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class BlobStore:
+    def __init__(self, root: Path):
+        self.root = Path(root)
+
+    def path_for(self, sha: str) -> Path:
+        return self.root / sha[:2] / f"{sha}.z"
+
+    def put(self, text: Optional[str]) -> Optional[str]:
+        """Store text (if non-empty) and return its sha; identical bodies are written once."""
+        if not text:
+            return None
+        sha = text_sha(text)
+        p = self.path_for(sha)
+        if p.exists():
+            return sha
+        p.parent.mkdir(parents=True, exist_ok=True)
+        tmp = p.with_suffix(".tmp")
+        tmp.write_bytes(zlib.compress(text.encode("utf-8"), 6))
+        tmp.replace(p)
+        return sha
+
+    def get_compressed(self, sha: Optional[str]) -> Optional[bytes]:
+        if not sha:
+            return None
+        p = self.path_for(sha)
+        return p.read_bytes() if p.exists() else None
+
+    def get(self, sha: Optional[str]) -> Optional[str]:
+        data = self.get_compressed(sha)
+        return zlib.decompress(data).decode("utf-8") if data is not None else None
@@ -0,0 +1,173 @@
+"""
+Pool of long-lived headless Chrome workers for scrape_production.py (--engine pool).
+
+K worker processes each own one WellScraper("selenium") and pull wells from a
+shared task queue. Before every well the worker health-checks its browser and
+recycles it after --recycle_after pages or after a WebDriver crash, so leaks
+don't build up over a long run. All rows come back over a result queue to the
+parent process, which is the only writer of production_data.jsonl (in input
+order, so --resume keeps working). A worker process that dies is replaced and
+its in-flight well is recorded as failed.
+"""
+
+import multiprocessing as mp
+import queue as queue_mod
+import time
+from pathlib import Path
+
+from selenium.common.exceptions import WebDriverException
+
+from html_cache import HtmlCache
+from jsonl_journal import JsonlJournal
+from scrape_production import WellScraper, new_row, safe_name, timed
+from url_map import DetailUrlMap
+
+
+def browser_healthy(scraper: WellScraper) -> bool:
+    if scraper.driver is None:
+        return False
+    try:
+        return scraper.driver.execute_script("return 1") == 1
+    except WebDriverException:
+        return False
+
+
+def _worker(wid: int, tasks, results, opts: dict):
+    cache = HtmlCache(Path(opts["cache_dir"]), opts["cache_ttl"], opts["cache_max_bytes"]) if opts["cache_dir"] else None
+    # read-only copy of the map: the parent records new URLs from the returned rows
+    url_map = DetailUrlMap(Path(opts["url_map"]), save_every=0) if opts["url_map"] else None
+    scraper = WellScraper("selenium", opts["delay"], True, opts["base_url"], cache=cache, url_map=url_map,
+                          lean=opts["lean"])
+    pages = 0
+    try:
+        while True:
+            item = tasks.get()
+            if item is None:
+                break
+            seq, i, well = item
+            results.put(("start", wid, seq))
+            t0 = time.perf_counter()
+
+            if pages >= opts["recycle_after"] or (scraper.driver is not None and not browser_healthy(scraper)):
+                scraper.quit()
+                pages = 0
+            row = new_row(well)
+            try:
+                if scraper.driver is None:
+                    scraper.start_browser()
+                msg = scraper.scrape(row)
+                pages += 2  # search + detail
+            except WebDriverException as e:
+                msg = f"ERROR {type(e).__name__}: {str(e).splitlines()[0] if str(e) else ''} (browser recycled)"
+                scraper.quit()
+                pages = 0
+            except Exception as e:
+                msg = f"ERROR {type(e).__name__}: {e}"
+
+            results.put(("done", wid, (seq, i, row, timed(msg, t0))))
+            time.sleep(opts["delay"] * 0.5)
+    finally:
+        scraper.quit()
+        if scraper.page_stats:
+            print(f"[worker {wid}] browser pages: {scraper.page_summary()}", flush=True)
+        results.put(("exit", wid, (url_map.hits, url_map.invalidated) if url_map is not None else None))
+
+
+def run_pool(todo, total: int, out: JsonlJournal, args, stats: dict, url_map: DetailUrlMap = None):
+    """
+    todo: [(input index, well), ...] in input order; rows go to out in that order.
+    Counts go into stats ("success", "failed", "browser_restarts") as rows are written.
+    """
+    if url_map is not None:
+        url_map.save()  # workers load the seeded map from disk
+    opts = {
+        "delay": args.delay,
+        "base_url": args.base_url.rstrip("/"),
+        "recycle_after": args.recycle_after,
+        "cache_dir": args.cache_dir,
+        "cache_ttl": args.cache_ttl_days * 86400,
+        "cache_max_bytes": args.cache_max_mb * 1024 * 1024,
+        "url_map": str(url_map.path) if url_map is not None else "",
+        "lean": args.lean_browser,
+    }
+    ctx = mp.get_context("spawn")
+    tasks, results = ctx.Queue(), ctx.Queue()
+    for seq, (i, well) in enumerate(todo):
+        tasks.put((seq, i, well))
+    n_workers = max(1, min(args.workers, len(todo)))
+    for _ in range(n_workers):
+        tasks.put(None)
+
+    def spawn(wid):
+        p = ctx.Process(target=_worker, args=(wid, tasks, results, opts), daemon=True)
+        p.start()
+        return p
+
+    procs = {wid: spawn(wid) for wid in range(n_workers)}
+    in_flight: dict[int, int] = {}   # worker id -> seq
+    pending: dict[int, tuple] = {}   # seq -> (i, row, msg) waiting for earlier rows
+    wells_by_seq = {seq: (i, well) for seq, (i, well) in enumerate(todo)}
+    next_seq = 0
+    exited = set()
+    next_wid = n_workers
+
+    def replace_crashed(wid):
+        """Worker wid is gone mid-task: fail its well and start a replacement."""
+        nonlocal next_wid
+        seq = in_flight.pop(wid, None)
+        if seq is not None:
+            i, well = wells_by_seq[seq]
+            pending[seq] = (i, new_row(well), "ERROR worker process crashed")
+            flush_in_order()
+        stats["browser_restarts"] += 1
+        procs[next_wid] = spawn(next_wid)
+        next_wid += 1
+
+    def flush_in_order():
+        nonlocal next_seq
+        while next_seq in pending:
+            i, row, msg = pending.pop(next_seq)
+            print(f"[{i}/{total}] {row['api']}  {safe_name(row.get('well_name'))[:45]:<45s}  {msg}")
+            out.write(row)
+            stats["success" if row["scrape_success"] else "failed"] += 1
+            if url_map is not None and row["scrape_success"]:
+                url_map.set(row["api"], row["drillingedge_url"])
+            next_seq += 1
+
+    try:
+        while next_seq < len(todo):
+            try:
+                kind, wid, payload = results.get(timeout=5)
+            except queue_mod.Empty:
+                if not any(p.is_alive() for p in procs.values()) and not in_flight:
+                    print("All workers exited before the queue was drained.")
+                    break
+                # replace worker processes that died without saying goodbye
+                for wid, p in list(procs.items()):
+                    if wid in exited or p.is_alive():
+                        continue
+                    exited.add(wid)
+                    replace_crashed(wid)
+                continue
+
+            if kind == "start":
+                in_flight[wid] = payload
+            elif kind == "done":
+                seq, i, row, msg = payload
+                in_flight.pop(wid, None)
+                if "browser recycled" in msg:
+                    stats["browser_restarts"] += 1
+                pending[seq] = (i, row, msg)
+                flush_in_order()
+            elif kind == "exit":
+                exited.add(wid)
+                if payload and url_map is not None:
+                    url_map.hits += payload[0]
+                    url_map.invalidated += payload[1]
+                if wid in in_flight:
+                    replace_crashed(wid)
+    finally:
+        for p in procs.values():
+            p.join(timeout=10)
+            if p.is_alive():
+                p.terminate()
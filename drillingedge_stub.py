@@ -0,0 +1,240 @@
+"""
+Local DrillingEdge stand-in for testing and benchmarking scrape_production.py.
+
+Serves search and detail pages at the same URL shapes as the real site
+(SEARCH_TPL: /search?type=wells&...&api_no=<API#>, or operator_name= /
+county= for a list of wells; detail pages at the path of each well's
+drillingedge_url). Pages come from:
+
+    --cache_dir   HTML recorded by scrape_production.py --cache_dir
+    --prod_jsonl  synthesized from an existing production_data.jsonl
+                  (used for wells without recorded pages)
+
+Links to the real site inside recorded pages are rewritten to the stub.
+Site behaviour can be degraded on purpose: --latency_ms / --jitter_ms per
+response, --error_rate (HTTP 500), and --rate_limit requests/sec above which
+requests get 429 + Retry-After. GET /__stats returns request counters.
+
+Usage:
+    python3 drillingedge_stub.py --prod_jsonl output/parsed/production_data.jsonl --port 8765
+    python3 scrape_production.py ... --engine http --base_url http://127.0.0.1:8765
+"""
+
+import argparse
+import html
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+from html_cache import HtmlCache
+from scrape_production import BASE_URL, read_jsonl
+from well_plan import norm_operator
+
+
+#  Pages
+
+def search_page(api: str, detail_path: str, well_name: str) -> str:
+    rows = ""
+    if detail_path:
+        rows = (f'<tr><td>{html.escape(api)}</td>'
+                f'<td><a href="{html.escape(detail_path)}">{html.escape(well_name or api)}</a></td></tr>')
+    return (f"<html><body><h1>Search Wells</h1><table><tr><th>API #</th><th>Well Name</th></tr>"
+            f"{rows}</table></body></html>")
+
+
+def results_page(wells) -> str:
+    """Operator / county search: one row per matching well."""
+    rows = "".join(
+        f'<tr><td>{html.escape(api)}</td><td><a href="{html.escape(path)}">{html.escape(name or api)}</a></td>'
+        f'<td>{html.escape(op or "")}</td></tr>'
+        for api, path, name, op, _ in wells)
+    return (f"<html><body><h1>Search Wells</h1><table><tr><th>API #</th><th>Well Name</th><th>Operator</th></tr>"
+            f"{rows}</table></body></html>")
+
+
+def fmt_badge(v) -> str:
+    if v is None:
+        return ""
+    return f"{v / 1000:.1f} k" if v >= 1000 else f"{v:g}"
+
+
+def detail_page(row: dict) -> str:
+    """Detail page in the shape parse_detail_html expects: summary badges + paired-cell details table."""
+    pairs = [
+        ("Well Name", row.get("well_name")), ("Operator", row.get("operator")),
+        ("County", row.get("county_state")), ("Well Status", row.get("well_status")),
+        ("Well Type", row.get("well_type")), ("Closest City", row.get("closest_city")),
+        ("First Production Date", row.get("first_production_date")),
+        ("Most Recent Production Date", row.get("most_recent_production_date")),
+    ]
+    cells = ["<th>{}</th><td>{}</td>".format(html.escape(k), html.escape(str(v))) for k, v in pairs if v]
+    trs = "".join("<tr>" + "".join(cells[i:i + 2]) + "</tr>" for i in range(0, len(cells), 2))
+    badges = ""
+    if row.get("oil_barrels") is not None:
+        badges += f"<p>{fmt_badge(row['oil_barrels'])} Barrels of Oil Produced</p>"
+    if row.get("gas_mcf") is not None:
+        badges += f"<p>{fmt_badge(row['gas_mcf'])} MCF of Gas Produced</p>"
+    return (f"<html><body><h2>Well Summary</h2>{badges}<h2>Well Details</h2>"
+            f"<table>{trs}</table></body></html>")
+
+
+class PageStore:
+    """search pages by API#, detail pages by URL path, wells for operator / county searches."""
+
+    def __init__(self):
+        self.search: dict[str, str] = {}
+        self.detail: dict[str, str] = {}
+        self.wells: list[tuple] = []  # (api, detail path, well name, operator, county_state)
+
+    def load_jsonl(self, path: Path):
+        for row in read_jsonl(path):
+            api, url = row.get("api"), row.get("drillingedge_url")
+            if not api or api in self.search:
+                continue
+            detail_path = urlparse(url).path if url and row.get("scrape_success") else ""
+            self.search[api] = search_page(api, detail_path, row.get("well_name"))
+            if detail_path:
+                self.detail.setdefault(detail_path, detail_page(row))
+                self.wells.append((api, detail_path, row.get("well_name"), row.get("operator"),
+                                   row.get("county_state") or ""))
+
+    def find(self, operator: str, county: str) -> list:
+        op, county = norm_operator(operator), county.lower()
+        return [w for w in self.wells
+                if op in norm_operator(w[3]) and county in w[4].lower()]
+
+    def load_cache(self, root: Path):
+        """Recorded pages from an HtmlCache directory."""
+        cache = HtmlCache(root)
+        for url, page in cache.iter_pages():
+            u = urlparse(url)
+            if u.path.rstrip("/").endswith("/search"):
+                api = (parse_qs(u.query).get("api_no") or [""])[0]
+                if api:
+                    self.search[api] = page
+            else:
+                self.detail[u.path] = page
+        cache.close()
+
+
+#  Server
+
+class StubState:
+    def __init__(self, store: PageStore, args):
+        self.store = store
+        self.latency = args.latency_ms / 1000
+        self.jitter = args.jitter_ms / 1000
+        self.error_rate = args.error_rate
+        self.rate_limit = args.rate_limit
+        self.counts = {"requests": 0, "search": 0, "detail": 0, "not_found": 0, "errors": 0, "throttled": 0}
+        self.lock = threading.Lock()
+        self.window: list[float] = []  # request times in the last second
+
+    def throttled(self) -> bool:
+        if self.rate_limit <= 0:
+            return False
+        with self.lock:
+            now = time.monotonic()
+            self.window = [t for t in self.window if now - t < 1.0]
+            if len(self.window) >= self.rate_limit:
+                return True
+            self.window.append(now)
+            return False
+
+    def count(self, key: str):
+        with self.lock:
+            self.counts[key] += 1
+
+
+def make_handler(state: StubState, real_base: str):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive, like the real site
+
+        def log_message(self, *args):
+            pass
+
+        def send(self, code: int, body: str = "", headers: dict = None, ctype: str = "text/html; charset=utf-8"):
+            data = body.encode("utf-8")
+            self.send_response(code)
+            self.send_header("Content-Type", ctype)
+            self.send_header("Content-Length", str(len(data)))
+            for k, v in (headers or {}).items():
+                self.send_header(k, v)
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            u = urlparse(self.path)
+            if u.path == "/__stats":
+                return self.send(200, json.dumps(state.counts), ctype="application/json")
+            state.count("requests")
+            if state.throttled():
+                state.count("throttled")
+                return self.send(429, "Too Many Requests", {"Retry-After": "1"})
+            time.sleep(max(0.0, random.gauss(state.latency, state.jitter)) if state.jitter else state.latency)
+            if state.error_rate and random.random() < state.error_rate:
+                state.count("errors")
+                return self.send(500, "Internal Server Error")
+
+            if u.path.rstrip("/") == "/search":
+                q = {k: v[0] for k, v in parse_qs(u.query).items()}
+                api = q.get("api_no", "")
+                if not api and q.get("operator_name"):
+                    page = results_page(state.store.find(q["operator_name"], q.get("county", "")))
+                else:
+                    page = state.store.search.get(api) or search_page(api, "", "")
+                state.count("search")
+            else:
+                page = state.store.detail.get(u.path)
+                if page is None:
+                    state.count("not_found")
+                    return self.send(404, "Not Found")
+                state.count("detail")
+            # recorded pages link to the real site
+            own = f"http://{self.headers.get('Host', '127.0.0.1')}"
+            self.send(200, page.replace(real_base, own))
+
+    return Handler
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Local DrillingEdge stand-in serving recorded / synthesized pages.")
+    ap.add_argument("--prod_jsonl", default="", help="production_data.jsonl to synthesize pages from")
+    ap.add_argument("--cache_dir", default="", help="HTML cache recorded by scrape_production.py --cache_dir")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--latency_ms", type=float, default=0.0, help="Mean delay per response")
+    ap.add_argument("--jitter_ms", type=float, default=0.0, help="Std dev of the delay")
+    ap.add_argument("--error_rate", type=float, default=0.0, help="Fraction of requests answered with HTTP 500")
+    ap.add_argument("--rate_limit", type=float, default=0.0, help="Requests/sec before 429s (0 = unlimited)")
+    args = ap.parse_args()
+
+    store = PageStore()
+    if args.cache_dir:
+        if not Path(args.cache_dir).is_dir():
+            print(f"ERROR: no HTML cache at {args.cache_dir}")
+            return
+        store.load_cache(Path(args.cache_dir))
+    if args.prod_jsonl:
+        store.load_jsonl(Path(args.prod_jsonl))
+    if not store.search:
+        print("No pages to serve: give --prod_jsonl and/or --cache_dir")
+        return
+
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(StubState(store, args), BASE_URL))
+    server.daemon_threads = True
+    print(f"Serving {len(store.search)} search / {len(store.detail)} detail pages on "
+          f"http://{args.host}:{args.port}  (latency={args.latency_ms}ms  errors={args.error_rate}  "
+          f"rate_limit={args.rate_limit or 'none'})", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
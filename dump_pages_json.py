@@ -1,5 +1,6 @@
 import argparse
 import json
+import re
 import subprocess
 import shutil
 from pathlib import Path
@@ -113,12 +114,83 @@ def run_ocrmypdf(
             return False, str(e)
 
 
+# Layout key/value pairs
+KV_MAX_LABEL_WORDS = 4  # longer runs before a ':' are table headers or prose, not labels
+KV_MAX_VALUE_GAP = 40.0  # pt; a wider horizontal gap ends the value
+# label words: letters first, no digits ("API#", "No.", "/"); a number or "Nabors 419," ends the label
+RE_KV_LABEL_WORD = re.compile(r"^(?:[A-Za-z][A-Za-z#&/.'-]*|[#&/])$")
+
+
+def group_word_lines(words: list[dict], y_tol: float = 3.0) -> list[list[dict]]:
+    """Group pdfplumber words into visual lines (top within y_tol), left to right."""
+    lines: list[list[dict]] = []
+    for w in sorted(words, key=lambda w: (w["top"], w["x0"])):
+        if lines and abs(w["top"] - lines[-1][0]["top"]) <= y_tol:
+            lines[-1].append(w)
+        else:
+            lines.append([w])
+    return [sorted(ln, key=lambda w: w["x0"]) for ln in lines]
+
+
+def _run_text(words: list[dict]) -> str:
+    """Join words, stopping at the first wide horizontal gap."""
+    out = []
+    for w in words:
+        if out and w["x0"] - out[-1]["x1"] > KV_MAX_VALUE_GAP:
+            break
+        out.append(w)
+    return " ".join(w["text"] for w in out).strip()
+
+
+def extract_label_values(words: list[dict]) -> list[list[str]]:
+    """
+    'Label: value' pairs from word geometry.
+    A label is the closely spaced label words (RE_KV_LABEL_WORD) ending in ':', at
+    most KV_MAX_LABEL_WORDS of them and not starting lowercase; it never reaches back
+    into the previous pair's value. Its value is the rest of the line up to the next label or a wide gap, or,
+    if that is empty, the words on the next line that start under the label.
+    """
+    pairs: list[list[str]] = []
+    lines = group_word_lines(words)
+    for li, ln in enumerate(lines):
+        ends = [j for j, w in enumerate(ln) if len(w["text"]) > 1 and w["text"].endswith(":")]
+        starts = []
+        for n, j in enumerate(ends):
+            lo = ends[n - 1] + 1 if n else 0
+            k = j
+            while (k > lo and ln[k]["x0"] - ln[k - 1]["x1"] <= KV_MAX_VALUE_GAP
+                   and RE_KV_LABEL_WORD.match(ln[k - 1]["text"])):
+                k -= 1
+            starts.append(k)
+
+        for n, j in enumerate(ends):
+            if j - starts[n] + 1 > KV_MAX_LABEL_WORDS or ln[starts[n]]["text"][0].islower():
+                continue  # table header or prose ("... were described as:")
+            label = " ".join(w["text"] for w in ln[starts[n]:j + 1]).rstrip(":").strip()
+            nxt = starts[n + 1] if n + 1 < len(ends) else len(ln)
+            value = _run_text(ln[j + 1:nxt])
+
+            if not value and li + 1 < len(lines):
+                below = lines[li + 1]
+                height = max(ln[j]["bottom"] - ln[j]["top"], 1.0)
+                if below[0]["top"] - ln[j]["bottom"] <= 2 * height:
+                    x_left = ln[starts[n]]["x0"] - 5
+                    x_right = ln[nxt]["x0"] if nxt < len(ln) else float("inf")
+                    value = _run_text([w for w in below if x_left <= w["x0"] < x_right])
+            if label and value:
+                pairs.append([label, value])
+    return pairs
+
+
 # PDF text
-def extract_text_by_page(pdf_path: Path, *, truncate_chars: int = 0, compact: bool = False) -> list[dict]:
+def extract_text_by_page(
+    pdf_path: Path, *, truncate_chars: int = 0, compact: bool = False, emit_kv: bool = False
+) -> list[dict]:
     """
     Extract text per page.
     - compact=True: drop pages with empty text after stripping
     - truncate_chars: truncate each page text to limit JSON size
+    - emit_kv=True: also store layout 'Label: value' pairs per page under "kv"
     """
     pages_out: list[dict] = []
     with pdfplumber.open(str(pdf_path)) as pdf:
@@ -127,7 +199,10 @@ def extract_text_by_page(pdf_path: Path, *, truncate_chars: int = 0, compact: bo
             text = maybe_truncate_text(text, truncate_chars)
             if compact and (not text.strip()):
                 continue
-            pages_out.append({"page": i, "text": text})
+            out = {"page": i, "text": text}
+            if emit_kv:
+                out["kv"] = extract_label_values(page.extract_words(x_tolerance=2, y_tolerance=2))
+            pages_out.append(out)
     return pages_out
 
 
@@ -166,6 +241,12 @@ def main():
         help="Truncate each page text to N chars (0 = no truncation). Helps keep JSON small.",
     )
 
+    parser.add_argument(
+        "--emit_kv",
+        action="store_true",
+        help="Also store per-page 'Label: value' pairs from word positions (speeds up filter_and_parse.py).",
+    )
+
     parser.add_argument(
         "--try_fix_pdf",
         action="store_true",
@@ -284,6 +365,7 @@ def main():
                 pdf_to_read,
                 truncate_chars=args.truncate_chars,
                 compact=args.compact,
+                emit_kv=args.emit_kv,
             )
             total_chars, short_pages = text_quality(pages, short_threshold=50)
             print(f"  text_chars={total_chars}, short_pages(<50)={short_pages}/{len(pages)}")
@@ -309,6 +391,7 @@ def main():
                         pdf_to_read,
                         truncate_chars=args.truncate_chars,
                         compact=args.compact,
+                        emit_kv=args.emit_kv,
                     )
                     total_chars, short_pages = text_quality(pages, short_threshold=50)
                     print(f"  AFTER RETRY: text_chars={total_chars}, short_pages(<50)={short_pages}/{len(pages)}")
@@ -340,6 +423,7 @@ def main():
 
                 "compact": bool(args.compact),
                 "truncate_chars": int(args.truncate_chars),
+                "kv_emitted": bool(args.emit_kv),
 
                 "pages": pages,
             }
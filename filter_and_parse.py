@@ -3,6 +3,9 @@ from pathlib import Path
 from datetime import datetime, timezone
 from collections import Counter, defaultdict
 
+from blob_store import BlobStore
+from records import Stimulation, WellInfo, encode
+
 # ===================== IO =====================
 def rjson(p): return json.loads(Path(p).read_text(encoding="utf-8"))
 
@@ -14,7 +17,7 @@ def append_jsonl(rows, p: Path):
     p.parent.mkdir(parents=True, exist_ok=True)
     with p.open("a", encoding="utf-8") as f:
         for r in rows:
-            f.write(json.dumps(r, ensure_ascii=False) + "\n")
+            f.write(encode(r) + "\n")
 
 def iters(dirp: Path, suffix: str):
     return sorted([p for p in dirp.rglob(f"*{suffix}") if p.is_file()])
@@ -115,6 +118,37 @@ def pick_label_value(joined: str, labels):
             return v
     return None
 
+# ===================== layout key/value pairs =====================
+# dump_pages_json.py --emit_kv stores per-page [label, value] pairs from word geometry
+KV_LABELS = dict(
+    well_name=["well name and number", "well name"],
+    operator=["operator", "name of operator"],
+    address=["address"],
+    datum=["datum", "daturn"],
+    shl=["well surface hole location shl", "well surface hole location", "surface hole location",
+         "well surface location", "surface location"],
+)
+
+def kv_key(label: str) -> str:
+    return re.sub(r"[^a-z0-9]+", " ", (label or "").lower()).strip()
+
+def has_kv(pages): return any("kv" in p for p in pages or [])
+
+def kv_index(pages):
+    """label key -> first value over pages (in the given order)."""
+    idx = {}
+    for p in pages or []:
+        for label, value in p.get("kv") or []:
+            idx.setdefault(kv_key(label), value)
+    return idx
+
+def kv_lookup(idx, field):
+    for lab in KV_LABELS[field]:
+        v = clean_line(idx.get(lab))
+        if v and not BAD_VALUE_RX.search(v):
+            return v
+    return None
+
 # ===================== FIG detection =====================
 FIG1_GROUPS = rx_groups([
     [r"\bAPI\b", r"\bAPI\s*#\b", r"\bAPI\s*NO\b", r"\bAPI\s*NUMBER\b"],
@@ -409,16 +443,20 @@ def extract_job_type(text: str):
     v = find_value_after_label(t, "Job Type")
     return clean_line(v)
 
+def normalize_datum(v):
+    """OCR cleanup + NAD casing ("Nad 83" -> "NAD83"), for regex and layout (kv) values alike."""
+    v = clean_line(ocr_cleanup(v)) if v else None
+    if v:
+        v = v.replace("Nad", "NAD").replace("nad", "NAD")
+        v = re.sub(r"\bNAD\s*83\b", "NAD83", v, flags=re.I)
+    return v
+
 def extract_datum_any(text: str):
     if not text: return None
     t = ocr_cleanup(text)
     m = RE_DATUM_ANY.search(t)
     if m:
-        v = clean_line(m.group(1) or m.group(2))
-        if v:
-            v = v.replace("Nad", "NAD").replace("nad", "NAD")
-            v = re.sub(r"\bNAD\s*83\b", "NAD83", v, flags=re.I)
-        return v
+        return normalize_datum(m.group(1) or m.group(2))
     v = find_value_after_label(t, "Datum") or find_value_after_label(t, "Daturn")
     return clean_line(v)
 
@@ -628,10 +666,12 @@ def latlon_page_score(text: str):
     if re.search(r"\bGrid\s+Northing\b|\bGrid\s+Easting\b|\bNorthing\b|\bEasting\b", t, re.I): s += 1
     return s
 
-def extract_latlon_from_pages(pages, api10, ndic_file_no, max_scan=300):
+def extract_latlon_from_pages(pages, api10, ndic_file_no, max_scan=300, scores=None):
     if not pages: return (None, None, None, None, None, True)
 
-    scored = [(latlon_page_score(p.get("text") or ""), p) for p in pages]
+    if scores is None:
+        scores = [latlon_page_score(p.get("text") or "") for p in pages]
+    scored = list(zip(scores, pages))
     scored = [(sc, p) for sc, p in scored if sc > 0]
     scan = [p for _, p in sorted(scored, key=lambda x: x[0], reverse=True)[:max_scan]] if scored else pages[:min(40, len(pages))]
 
@@ -939,8 +979,24 @@ def candidates(pages, fig1_th, fig2_th, fig1_neg_penalty, disable_neg):
             c2.append({"page": p.get("page"), "score": s2, "hit_groups": g2, "text": t_raw})
     return c1, c2
 
+def candidates_clf(pages, model):
+    """Classifier mode: one batched predict over the document -> (c1, c2, coord page scores)."""
+    from page_classifier import page_text
+
+    proba = model.predict_proba([page_text(p) for p in pages])
+    c1, c2, coord = [], [], []
+    for p, (p1, p2, pc) in zip(pages, proba.tolist()):
+        t_raw = p.get("text") or ""
+        coord.append(pc if pc >= model.threshold else 0)
+        if not t_raw.strip(): continue
+        if p1 >= model.threshold:
+            c1.append({"page": p.get("page"), "score": p1, "hit_groups": ["clf:fig1"], "text": t_raw})
+        if p2 >= model.threshold:
+            c2.append({"page": p.get("page"), "score": p2, "hit_groups": ["clf:fig2"], "text": t_raw})
+    return c1, c2, coord
+
 # ===================== parse well =====================
-def parse_well(fig1_pages, all_pages, rel_path: str, latlon_scan_pages: int):
+def parse_well(fig1_pages, all_pages, rel_path: str, latlon_scan_pages: int, latlon_scores=None):
     joined = "\n".join((p.get("text") or "") for p in fig1_pages) if fig1_pages else ""
     joined_clean = ocr_cleanup(joined)
 
@@ -952,9 +1008,21 @@ def parse_well(fig1_pages, all_pages, rel_path: str, latlon_scan_pages: int):
     if (ndic is None) or (ndic == "600") or (len(str(ndic)) < 4):
         ndic = ndic_from_filename(rel_path) or ndic
 
-    well_name = pick_label_value(joined_clean, ["Well Name and Number", "Well Name"])
-    op = pick_label_value(joined_clean, ["Operator", "NAME OF OPERATOR", "OPERATOR"])
-    addr = pick_label_value(joined_clean, ["Address"])
+    # layout pairs (if dumped with --emit_kv): fig1 pages first, then all pages; the page scans still
+    # run whenever the kv lookup misses
+    by_no = {p.get("page"): p for p in all_pages or []}
+    kv_fig1 = kv_index([by_no.get(p.get("page"), p) for p in fig1_pages or []])
+    kv_all = kv_index(all_pages) if has_kv(all_pages) else None
+
+    def from_kv(field, fallback):
+        v = kv_lookup(kv_fig1, field) or fallback()
+        if v is None and kv_all is not None:
+            v = kv_lookup(kv_all, field)
+        return v
+
+    well_name = from_kv("well_name", lambda: pick_label_value(joined_clean, ["Well Name and Number", "Well Name"]))
+    op = from_kv("operator", lambda: pick_label_value(joined_clean, ["Operator", "NAME OF OPERATOR", "OPERATOR"]))
+    addr = from_kv("address", lambda: pick_label_value(joined_clean, ["Address"]))
 
     if op:
         op2 = re.sub(r"\(?\d{3}\)?[-\s]?\d{3}[-\s]?\d{4}.*$", "", op).strip()
@@ -971,10 +1039,10 @@ def parse_well(fig1_pages, all_pages, rel_path: str, latlon_scan_pages: int):
     job_type = extract_job_type(joined_clean) or scan_pages_for(
         RE_JOB_TYPE, all_pages, window_kw=r"\bJob\s*Type\b|\bEnesco\b|\bAPI\b"
     )
-    datum = extract_datum_any(joined_clean) or scan_pages_for(
+    datum = normalize_datum(from_kv("datum", lambda: extract_datum_any(joined_clean))) or scan_pages_for(
         RE_DATUM_ANY, all_pages, window_kw=r"\bDat(?:u|v|r)n\b|\bDatum\b|\bLatitude\b|\bLongitude\b"
     )
-    shl = extract_shl_any(joined_clean) or scan_pages_for(
+    shl = from_kv("shl", lambda: extract_shl_any(joined_clean)) or scan_pages_for(
         RE_SHL_ANY, all_pages, window_kw=r"\bSurface\b|\bLocation\b|\bSHL\b"
     )
 
@@ -982,7 +1050,7 @@ def parse_well(fig1_pages, all_pages, rel_path: str, latlon_scan_pages: int):
     latlon_page = None
     if (lat is None or lon is None) and all_pages:
         lat, lon, lat_raw, lon_raw, pno, suspect2 = extract_latlon_from_pages(
-            all_pages, api10, ndic, max_scan=latlon_scan_pages
+            all_pages, api10, ndic, max_scan=latlon_scan_pages, scores=latlon_scores
         )
         suspect, latlon_page = suspect2, pno
 
@@ -1026,6 +1094,9 @@ def main():
     ap.add_argument("--disable_fig1_negative", action="store_true")
     ap.add_argument("--fig1_neg_penalty", type=int, default=1)
     ap.add_argument("--latlon_scan_pages", type=int, default=350)
+    ap.add_argument("--blob_dir", default="", help="raw text blob store (default: <out_dir>/blobs)")
+    ap.add_argument("--page_model", default="", help="page_classifier.py model (.npz); regex scoring if unset")
+    ap.add_argument("--page_threshold", type=float, default=0.5)
 
     # optional for api
     ap.add_argument("--auto_api_jsonl", default="", help="final_wells_auto.jsonl path (optional)")
@@ -1043,6 +1114,11 @@ def main():
     well_out = out_dir/"well_info.jsonl"
     stim_out = out_dir/"stimulation_data.jsonl"
     rep_out  = out_dir/"parse_report.json"
+    page_model = None
+    if args.page_model:
+        from page_classifier import load_model
+        page_model = load_model(Path(args.page_model).expanduser().resolve(), args.page_threshold)
+    blobs = BlobStore(Path(args.blob_dir).expanduser().resolve() if args.blob_dir else out_dir/"blobs")
     for p in (well_out, stim_out):
         if p.exists(): p.unlink()
 
@@ -1053,6 +1129,7 @@ def main():
     report = dict(
         run_at=datetime.now(timezone.utc).isoformat(),
         num_files=len(text_files),
+        page_scoring="classifier" if page_model is not None else "regex",
         stats=dict(
             wells_total=0,
             api_present=0,
@@ -1081,19 +1158,23 @@ def main():
             if not all_pages:
                 continue
 
-            fig1_c, fig2_c = candidates(
-                all_pages,
-                args.fig1_threshold, args.fig2_threshold,
-                fig1_neg_penalty=args.fig1_neg_penalty,
-                disable_neg=args.disable_fig1_negative,
-            )
+            latlon_scores = None
+            if page_model is not None:
+                fig1_c, fig2_c, latlon_scores = candidates_clf(all_pages, page_model)
+            else:
+                fig1_c, fig2_c = candidates(
+                    all_pages,
+                    args.fig1_threshold, args.fig2_threshold,
+                    fig1_neg_penalty=args.fig1_neg_penalty,
+                    disable_neg=args.disable_fig1_negative,
+                )
             fig1_pages = pick(fig1_c, FIG1_PRIOR, args.fig1_keep_n) if fig1_c else []
             fig2_pages = pick(fig2_c, FIG2_PRIOR, args.fig2_keep_n) if fig2_c else []
 
             rel_path = payload.get("relative_path") or jf.name
             src_pdf  = payload.get("source_pdf")
 
-            well = parse_well(fig1_pages, all_pages, rel_path, args.latlon_scan_pages)
+            well = parse_well(fig1_pages, all_pages, rel_path, args.latlon_scan_pages, latlon_scores)
             stim = parse_stim(fig2_pages) if fig2_pages else dict(stim_present=False, stim_has_fields=False, raw_text="", raw_text_clean="", fig2_pages=[])
 
             # ========= fill api =========
@@ -1130,7 +1211,7 @@ def main():
 
             primary_id = well.get("api") or (f"NDIC-{well.get('ndic_file_no')}" if well.get("ndic_file_no") else rel_path)
 
-            well_row = dict(
+            well_row = WellInfo(
                 primary_id=primary_id,
                 source_pdf=src_pdf,
                 relative_path=rel_path,
@@ -1156,10 +1237,10 @@ def main():
                 latlon_page=well.get("latlon_page"),
                 latlon_suspect=well.get("latlon_suspect"),
                 fig1_pages=well.get("fig1_pages") or [],
-                raw_text=trunc(well.get("raw_text") or "", args.keep_debug_text_chars),
+                raw_text_sha=blobs.put(trunc(well.get("raw_text") or "", args.keep_debug_text_chars)),
             )
 
-            stim_row = dict(
+            stim_row = Stimulation(
                 primary_id=primary_id,
                 source_pdf=src_pdf,
                 relative_path=rel_path,
@@ -1194,8 +1275,8 @@ def main():
                 details=trunc(stim.get("details") or "", 2000) if stim.get("details") else None,
 
                 fig2_pages=stim.get("fig2_pages") or [],
-                raw_text=trunc(stim.get("raw_text") or "", args.keep_debug_text_chars),
-                raw_text_clean=trunc(stim.get("raw_text_clean") or "", args.keep_debug_text_chars),
+                raw_text_sha=blobs.put(trunc(stim.get("raw_text") or "", args.keep_debug_text_chars)),
+                raw_text_clean_sha=blobs.put(trunc(stim.get("raw_text_clean") or "", args.keep_debug_text_chars)),
             )
 
             wells_buf.append(well_row)
@@ -1232,6 +1313,7 @@ def main():
     print("well_info.jsonl ->", well_out)
     print("stimulation_data.jsonl ->", stim_out)
     print("parse_report.json ->", rep_out)
+    print("raw text blobs ->", blobs.root)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
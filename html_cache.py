@@ -0,0 +1,139 @@
+"""
+Disk cache of raw HTML pages for scrape_production.py.
+
+Bodies are zlib-compressed and content-addressed (identical pages are stored
+once); an SQLite index maps each URL to its body with a fetch time, a per-entry
+expiry (TTL) and a last-access time used for LRU eviction once the cache grows
+past its size cap.
+
+Layout:
+    <cache_dir>/index.sqlite3
+    <cache_dir>/objects/ab/ab12...ef.z
+"""
+
+import hashlib
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Iterator, Optional
+
+
+class HtmlCache:
+    def __init__(self, root: Path, ttl: float = 7 * 86400, max_bytes: int = 512 * 1024 * 1024):
+        self.root = Path(root)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.root / "index.sqlite3"), timeout=30, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " url TEXT PRIMARY KEY, sha TEXT NOT NULL, size INTEGER NOT NULL,"
+            " fetched_at REAL NOT NULL, expires_at REAL NOT NULL, last_access REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS entries_lru ON entries (last_access)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS entries_sha ON entries (sha)")
+        self._db.commit()
+
+    def _path(self, sha: str) -> Path:
+        return self.root / "objects" / sha[:2] / f"{sha}.z"
+
+    def get(self, url: str, *, allow_stale: bool = False, touch: bool = True) -> Optional[str]:
+        """
+        Cached HTML for url, or None if missing / expired (unless allow_stale).
+        touch=False skips the LRU update (read-only use, e.g. parallel reparsing).
+        """
+        now = time.time()
+        with self._lock:
+            row = self._db.execute("SELECT sha, expires_at FROM entries WHERE url = ?", (url,)).fetchone()
+            if row is None or (not allow_stale and row[1] < now):
+                self.misses += 1
+                return None
+            p = self._path(row[0])
+            if not p.exists():
+                self._db.execute("DELETE FROM entries WHERE url = ?", (url,))
+                self._db.commit()
+                self.misses += 1
+                return None
+            if touch:
+                self._db.execute("UPDATE entries SET last_access = ? WHERE url = ?", (now, url))
+                self._db.commit()
+            self.hits += 1
+        return zlib.decompress(p.read_bytes()).decode("utf-8")
+
+    def put(self, url: str, html: str, ttl: Optional[float] = None):
+        data = zlib.compress(html.encode("utf-8"), 6)
+        sha = hashlib.sha256(data).hexdigest()
+        p = self._path(sha)
+        now = time.time()
+        with self._lock:
+            # under the lock, so eviction can't unlink a body before it is indexed
+            if not p.exists():
+                p.parent.mkdir(parents=True, exist_ok=True)
+                tmp = p.with_suffix(".tmp")
+                tmp.write_bytes(data)
+                tmp.replace(p)
+            old = self._db.execute("SELECT sha FROM entries WHERE url = ?", (url,)).fetchone()
+            self._db.execute(
+                "INSERT OR REPLACE INTO entries (url, sha, size, fetched_at, expires_at, last_access)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (url, sha, len(data), now, now + (self.ttl if ttl is None else ttl), now),
+            )
+            if old and old[0] != sha:
+                self._drop_if_unreferenced(old[0])
+            self._db.commit()
+            self._evict()
+
+    def invalidate(self, url: str):
+        with self._lock:
+            row = self._db.execute("SELECT sha FROM entries WHERE url = ?", (url,)).fetchone()
+            self._db.execute("DELETE FROM entries WHERE url = ?", (url,))
+            if row:
+                self._drop_if_unreferenced(row[0])
+            self._db.commit()
+
+    def iter_pages(self) -> Iterator[tuple]:
+        """
+        (url, html) for every cached page, stale ones included, in URL order.
+        Read-only: no LRU update and no hit/miss counting (benchmarks, the stub server).
+        """
+        with self._lock:
+            entries = self._db.execute("SELECT url, sha FROM entries ORDER BY url").fetchall()
+        for url, sha in entries:
+            p = self._path(sha)
+            if p.exists():
+                yield url, zlib.decompress(p.read_bytes()).decode("utf-8")
+
+    def total_bytes(self) -> int:
+        row = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM (SELECT DISTINCT sha, size FROM entries)").fetchone()
+        return int(row[0])
+
+    def _drop_if_unreferenced(self, sha: str) -> bool:
+        if self._db.execute("SELECT 1 FROM entries WHERE sha = ? LIMIT 1", (sha,)).fetchone() is None:
+            self._path(sha).unlink(missing_ok=True)
+            return True
+        return False
+
+    def _evict(self):
+        """Drop least recently used entries until the cache fits under max_bytes."""
+        if self.max_bytes <= 0:
+            return
+        total = self.total_bytes()
+        if total <= self.max_bytes:
+            return
+        lru = self._db.execute("SELECT url, sha, size FROM entries ORDER BY last_access").fetchall()
+        for url, sha, size in lru:
+            if total <= self.max_bytes:
+                break
+            self._db.execute("DELETE FROM entries WHERE url = ?", (url,))
+            if self._drop_if_unreferenced(sha):
+                total -= size
+        self._db.commit()
+
+    def close(self):
+        with self._lock:
+            self._db.close()
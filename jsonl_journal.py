@@ -0,0 +1,206 @@
+"""
+Journaled JSONL output for scrape_production.py.
+
+JsonlJournal keeps the output file open and writes rows in batches. Every
+--checkpoint_rows rows or --checkpoint_secs seconds the batch is flushed and
+fsync'ed, then one line is appended to a sidecar index (<out>.done):
+
+    {"end": <byte offset of the checkpoint>, "last": "<last API#>", "apis": [...]}
+
+--resume loads the completed API#s from the index and only parses rows
+written after the last checkpoint, instead of reading the whole output. A
+torn trailing line (crash mid-write) is truncated before anything is read or
+appended. The index is checked against the data file (the row ending at the
+last checkpoint must carry the recorded API#); if the output was rewritten
+or truncated since, it is rebuilt with one full scan.
+"""
+
+import json
+import os
+import time
+from pathlib import Path
+from typing import Optional
+
+from records import encode
+
+TAIL_CHUNK = 1 << 16
+
+
+def index_path(path: Path) -> Path:
+    return path.with_name(path.name + ".done")
+
+
+def repair_tail(path: Path) -> int:
+    """Truncate a partial last line; returns the number of bytes dropped."""
+    if not path.exists():
+        return 0
+    size = path.stat().st_size
+    with path.open("r+b") as f:
+        pos = size
+        while pos > 0:
+            start = max(0, pos - TAIL_CHUNK)
+            f.seek(start)
+            chunk = f.read(pos - start)
+            if pos == size and chunk.endswith(b"\n"):
+                return 0
+            nl = chunk.rfind(b"\n")
+            if nl >= 0:
+                keep = start + nl + 1
+                break
+            pos = start
+        else:
+            keep = 0
+        f.truncate(keep)
+        f.flush()
+        os.fsync(f.fileno())
+    return size - keep
+
+
+def line_before(f, end: int) -> Optional[bytes]:
+    """The complete line ending at byte offset end (None if end is not a line boundary)."""
+    if end <= 0:
+        return None
+    start = max(0, end - TAIL_CHUNK)
+    f.seek(start)
+    chunk = f.read(end - start)
+    if not chunk.endswith(b"\n"):
+        return None
+    nl = chunk.rfind(b"\n", 0, len(chunk) - 1)
+    return chunk[nl + 1:]
+
+
+def read_rows(path: Path, start: int = 0):
+    """Rows from byte offset start (a checkpoint / line boundary) to the end of the file."""
+    with path.open("rb") as f:
+        f.seek(start)
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def load_done(path: Path) -> tuple[set, dict]:
+    """
+    Completed API#s in path, from the index plus the rows after its last
+    checkpoint. Returns (apis, info) with info: indexed / scanned / torn_bytes / rebuilt.
+    """
+    info = {"indexed": 0, "scanned": 0, "torn_bytes": 0, "rebuilt": False}
+    apis: set = set()
+    if not path.exists():
+        return apis, info
+    info["torn_bytes"] = repair_tail(path)
+    size = path.stat().st_size
+    idx = index_path(path)
+
+    end, last = 0, None
+    if idx.exists():
+        with idx.open("r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    rec = json.loads(line)
+                except ValueError:
+                    break  # torn index line; rows after the previous checkpoint are rescanned
+                apis.update(rec["apis"])
+                end, last = rec["end"], rec["last"]
+
+    valid = end <= size
+    if valid and end:
+        with path.open("rb") as f:
+            line = line_before(f, end)
+        try:
+            valid = line is not None and json.loads(line).get("api") == last
+        except ValueError:
+            valid = False
+    if not valid:
+        apis, end = set(), 0
+    info["indexed"] = len(apis)
+
+    tail = [r["api"] for r in read_rows(path, end) if r.get("api")]
+    apis.update(tail)
+    info["scanned"] = len(tail)
+    if not valid or not idx.exists():
+        info["rebuilt"] = True
+        write_index(path, sorted(apis), size, rewrite=True)
+    elif tail:
+        write_index(path, tail, size)
+    return apis, info
+
+
+def write_index(path: Path, apis, end: int, rewrite: bool = False):
+    """Append a checkpoint record (rewrite=True: replace the index with this one record)."""
+    if not end:
+        return
+    with path.open("rb") as f:
+        line = line_before(f, end)
+    try:
+        last = json.loads(line).get("api") if line else None
+    except ValueError:
+        last = None
+    rec = {"end": end, "last": last, "apis": list(apis)}
+    idx = index_path(path)
+    if rewrite:
+        tmp = idx.with_name(idx.name + ".tmp")
+        tmp.write_text(json.dumps(rec) + "\n", encoding="utf-8")
+        os.replace(tmp, idx)
+        return
+    with idx.open("a", encoding="utf-8") as f:
+        f.write(json.dumps(rec) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def rebuild_index(path: Path):
+    """Index path from scratch (after it was rewritten, e.g. by merge_rows)."""
+    if path.exists():
+        write_index(path, sorted({r["api"] for r in read_rows(path) if r.get("api")}), path.stat().st_size, rewrite=True)
+
+
+def reset(path: Path):
+    """Remove the output and its index (fresh run)."""
+    for p in (path, index_path(path)):
+        if p.exists():
+            p.unlink()
+
+
+class JsonlJournal:
+    """Append-only row writer (records or dicts): one open file, batched writes, fsync + index line per checkpoint."""
+
+    def __init__(self, path: Path, checkpoint_rows: int = 25, checkpoint_secs: float = 5.0):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.checkpoint_rows = max(1, checkpoint_rows)
+        self.checkpoint_secs = checkpoint_secs
+        self.torn_bytes = repair_tail(self.path)
+        self.start = self.path.stat().st_size if self.path.exists() else 0
+        self._f = self.path.open("ab")
+        self._batch: list[bytes] = []
+        self._apis: list[str] = []
+        self._last_sync = time.monotonic()
+        self.rows = 0
+        self.checkpoints = 0
+
+    def write(self, row: dict):
+        self._batch.append((encode(row) + "\n").encode("utf-8"))
+        if row.get("api"):
+            self._apis.append(row["api"])
+        self.rows += 1
+        if len(self._batch) >= self.checkpoint_rows or time.monotonic() - self._last_sync >= self.checkpoint_secs:
+            self.checkpoint()
+
+    def checkpoint(self):
+        self._last_sync = time.monotonic()
+        if not self._batch:
+            return
+        self._f.write(b"".join(self._batch))
+        self._f.flush()
+        os.fsync(self._f.fileno())
+        # the index only ever names rows that are already on disk
+        write_index(self.path, self._apis, self._f.tell())
+        self._batch.clear()
+        self._apis.clear()
+        self.checkpoints += 1
+
+    def close(self):
+        if self._f.closed:
+            return
+        self.checkpoint()
+        self._f.close()
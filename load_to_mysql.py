@@ -8,31 +8,548 @@ Usage:
         --stim_jsonl output/parsed/stimulation_data.jsonl \
         --prod_jsonl output/parsed/production_data.jsonl \
         --truncate
+
+Row mode (default) sends executemany batches of INSERT ... ON DUPLICATE KEY
+UPDATE. --bulk streams each file into a temporary TSV, LOAD DATA LOCAL
+INFILEs it into a staging table and upserts it in one INSERT ... SELECT
+(needs local_infile=ON on the server).
+--shadow loads into *_next tables and swaps them in with one RENAME TABLE
+(see table_swap.py); --rollback swaps the previous generation back.
+--connections N loads the child tables in chunks over N pooled connections
+once well_info is in.
+--delta only sends rows whose content hash (row_hash column) changed;
+--delete_missing deletes rows whose API# left the input files.
 """
 
 import argparse
+import hashlib
 import json
+import os
+import re
+import tempfile
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from itertools import zip_longest
 from pathlib import Path
 
 import mysql.connector
+import mysql.connector.pooling
 
-
-def iter_jsonl(path: Path):
-    with path.open("r", encoding="utf-8") as f:
-        for line_no, line in enumerate(f, start=1):
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                yield line_no, json.loads(line)
-            except json.JSONDecodeError as e:
-                raise RuntimeError(f"JSON decode error in {path} at line {line_no}: {e}") from e
+import table_swap
+from blob_store import BlobStore, text_sha
+from records import Production, Stimulation, WellInfo, chunk_ranges, iter_records
 
 
 def to_date(s):
     return s if s else None
 
 
+PACKET_SHARE = 0.5      # of max_allowed_packet per multi-row INSERT (executemany sends one statement per batch)
+
+
+def max_packet(cur) -> int:
+    cur.execute("SELECT @@max_allowed_packet")
+    return int(cur.fetchone()[0])
+
+
+class BlobRefs:
+    """Collects the text blobs referenced by loaded rows and ships each one once."""
+
+    def __init__(self, store: BlobStore, sent: set = None):
+        self.store = store
+        self.pending = {}  # sha -> compressed body, or None to read from the store at flush
+        self.inline = {}   # legacy inline text by sha, until its row is queued (compressed only if sent)
+        self.sent = set() if sent is None else sent  # shared by the loaders of one run
+        self.packet = None  # max_allowed_packet, read at the first flush
+
+    def ref(self, row, text_key: str, sha_key: str):
+        """Replace an inline text field (legacy rows) by its hash."""
+        text = row.pop(text_key, None)
+        sha = row.get(sha_key)
+        if not sha and text:
+            sha = text_sha(text)
+            self.inline.setdefault(sha, text)
+        row[sha_key] = sha or None
+
+    def want(self, rows: list, sha_keys: tuple):
+        """Queue the blobs of rows that are about to be sent; inline text of skipped rows is dropped."""
+        for row in rows:
+            for key in sha_keys:
+                sha = row.get(key)
+                if sha and sha not in self.sent and sha not in self.pending:
+                    text = self.inline.get(sha)
+                    self.pending[sha] = zlib.compress(text.encode("utf-8"), 6) if text is not None else None
+        self.inline.clear()
+
+    def flush(self, conn, cur):
+        """
+        Commit the pending blobs before the rows that reference them, in
+        INSERTs of at most PACKET_SHARE of max_allowed_packet. A blob only
+        counts as sent once its INSERT is committed.
+        """
+        if not self.pending:
+            return
+        if self.packet is None:
+            self.packet = max_packet(cur)
+        budget = self.packet * PACKET_SHARE
+        batch, size = [], 0
+        for sha, data in self.pending.items():
+            if data is None:
+                data = self.store.get_compressed(sha)
+                if data is None:
+                    print(f"WARNING: blob {sha[:12]}... not found in {self.store.root}")
+                    continue
+            # a lone blob over the budget still goes in its own INSERT
+            if batch and size + len(data) + len(sha) + 16 > budget:
+                self._send(conn, cur, batch)
+                batch, size = [], 0
+            batch.append((sha, data))
+            size += len(data) + len(sha) + 16  # escaping of compressed bytes fits in the PACKET_SHARE margin
+        if batch:
+            self._send(conn, cur, batch)
+        self.pending.clear()
+
+    def _send(self, conn, cur, batch: list):
+        # INSERT IGNORE: a retried or repeated blob is a no-op
+        run_batch(conn, cur, "INSERT IGNORE INTO text_blobs (sha, body) VALUES (%s, %s)", batch)
+        self.sent.update(sha for sha, _ in batch)
+
+
+#  Row normalization
+
+def norm_well(row: WellInfo, blobs: BlobRefs) -> dict:
+    row["latlon_suspect"] = int(bool(row.get("latlon_suspect")))
+    fig = row.get("fig1_pages")
+    row["fig1_pages"] = json.dumps(fig) if fig else None
+    blobs.ref(row, "raw_text", "raw_text_sha")
+    return row.to_dict()
+
+
+def norm_stim(row: Stimulation, blobs: BlobRefs) -> dict:
+    row["date_stimulated"] = to_date(row.get("date_stimulated"))
+    row["stim_present"] = int(bool(row.get("stim_present")))
+    row["stim_has_fields"] = int(bool(row.get("stim_has_fields")))
+    fig = row.get("fig2_pages")
+    row["fig2_pages"] = json.dumps(fig) if fig else None
+    blobs.ref(row, "raw_text", "raw_text_sha")
+    blobs.ref(row, "raw_text_clean", "raw_text_clean_sha")
+    return row.to_dict()
+
+
+def norm_prod(row: Production, blobs: BlobRefs) -> dict:
+    # every SQL parameter is a Production field, so missing keys decode as None
+    row["scrape_success"] = int(bool(row.get("scrape_success")))
+    # Ensure numeric types
+    try:
+        if row.get("oil_barrels") is not None:
+            row["oil_barrels"] = float(row["oil_barrels"])
+    except (ValueError, TypeError):
+        row["oil_barrels"] = None
+    try:
+        if row.get("gas_mcf") is not None:
+            row["gas_mcf"] = float(row["gas_mcf"])
+    except (ValueError, TypeError):
+        row["gas_mcf"] = None
+
+    # Preserve production date strings (or None)
+    row["first_production_date"] = to_date(row.get("first_production_date"))
+    row["most_recent_production_date"] = to_date(row.get("most_recent_production_date"))
+    return row.to_dict()
+
+
+#  Table specs
+
+HASH_COLUMN = "row_hash"
+
+
+class Table:
+    """One target table: its columns (in insert order), row record type, normalizer and blob columns."""
+
+    def __init__(self, name: str, record, norm, columns: list, blob_columns: tuple = (), key: str = "api"):
+        self.name = name
+        self.record = record
+        self.norm = norm
+        self.columns = columns
+        self.insert_columns = columns + [HASH_COLUMN]
+        self.blob_columns = blob_columns
+        self.key = key
+
+    def row_hash(self, row: dict) -> str:
+        """Content hash of a normalized row's column values (stored in HASH_COLUMN)."""
+        values = json.dumps([row[c] for c in self.columns], ensure_ascii=False, separators=(",", ":"))
+        return hashlib.blake2b(values.encode("utf-8"), digest_size=16).hexdigest()
+
+    def column_list(self) -> str:
+        return ", ".join(self.insert_columns)
+
+    def update_clause(self) -> str:
+        return ",\n  ".join(f"{c}=VALUES({c})" for c in self.insert_columns if c != self.key)
+
+    def upsert_sql(self, into: str = None) -> str:
+        params = ", ".join(f"%({c})s" for c in self.insert_columns)
+        return (f"INSERT INTO {into or self.name} ({self.column_list()})\nVALUES ({params})\n"
+                f"ON DUPLICATE KEY UPDATE\n  {self.update_clause()}")
+
+
+WELL_TABLE = Table("well_info", WellInfo, norm_well, [
+    "operator", "well_name", "api", "enesco_job", "job_type", "county_state", "shl_location",
+    "latitude", "longitude", "datum",
+    "ndic_file_no", "county", "state", "address",
+    "lat_raw", "lon_raw", "latlon_page", "latlon_suspect", "fig1_pages", "raw_text_sha",
+], blob_columns=("raw_text_sha",))
+STIM_TABLE = Table("stimulation_data", Stimulation, norm_stim, [
+    "date_stimulated", "stimulation_formation", "top_ft", "bottom_ft", "stimulation_stages",
+    "volume", "volume_units",
+    "treatment_type", "acid_pct", "lbs_proppant",
+    "max_treatment_pressure_psi", "max_treatment_rate_bbl_min",
+    "details",
+    "api",
+    "stim_present", "stim_has_fields",
+    "ndic_file_no", "fig2_pages",
+    "raw_text_sha", "raw_text_clean_sha",
+], blob_columns=("raw_text_sha", "raw_text_clean_sha"))
+PROD_TABLE = Table("production_data", Production, norm_prod, [
+    "api", "well_name", "well_status", "well_type", "closest_city",
+    "operator", "county_state", "first_production_date", "most_recent_production_date",
+    "oil_barrels", "gas_mcf",
+    "drillingedge_url", "scrape_success",
+])
+
+
+def iter_rows(table: Table, path: Path, blobs: BlobRefs, keys: set = None, span: tuple = (0, None),
+              delta=None):
+    """
+    Normalized, hashed parameter dicts for every loadable row of path, or of its
+    byte range span (keys added to keys); with a Delta, only the new or changed ones.
+    Blobs are queued for the rows yielded.
+    """
+    buf = []
+    for _, row in iter_records(path, table.record, *span):
+        # Only load rows that carry their key (production rows need an api in well_info)
+        if not row.get(table.key):
+            continue
+        if keys is not None:
+            keys.add(row[table.key])
+        out = table.norm(row, blobs)
+        out[HASH_COLUMN] = table.row_hash(out)
+        if delta is None:
+            blobs.want([out], table.blob_columns)
+            yield out
+            continue
+        buf.append(out)
+        if len(buf) >= delta.batch_size:
+            yield from delta.changed(table, buf, blobs)
+            buf = []
+    if buf:
+        yield from delta.changed(table, buf, blobs)
+
+
+#  Delta mode
+# Every row carries a hash of its normalized column values. A delta load reads
+# the stored hashes of a batch's keys in one query and only sends the rows that
+# are new or whose hash differs, so unchanged rows cost no writes, no index
+# maintenance and no blob reads.
+
+DELETE_BATCH = 1000
+
+
+class Delta:
+    """Filters batches of hashed rows against the hashes stored in target; counts what it skipped."""
+
+    def __init__(self, cur, target: str, batch_size: int):
+        self.cur = cur
+        self.target = target
+        self.batch_size = batch_size
+        self.unchanged = 0
+        self.seen = set()
+
+    def changed(self, table: Table, rows: list, blobs: BlobRefs) -> list:
+        keys = list({r[table.key] for r in rows})
+        self.cur.execute(f"SELECT {table.key}, {HASH_COLUMN} FROM {self.target} "
+                         f"WHERE {table.key} IN ({', '.join(['%s'] * len(keys))})", keys)
+        stored = dict(self.cur.fetchall())
+        out = []
+        for r in rows:
+            # a repeated key is always sent again, so the last row of the file wins as without --delta
+            # (with --connections all of a key's rows are in one chunk: see repeated_key_spans)
+            if r[table.key] in self.seen or stored.get(r[table.key]) != r[HASH_COLUMN]:
+                out.append(r)
+            self.seen.add(r[table.key])
+        self.unchanged += len(rows) - len(out)
+        blobs.want(out, table.blob_columns)
+        return out
+
+
+def find_missing(cur, table: Table, keys: set) -> tuple:
+    """(keys stored in table but not in keys, rows in table)."""
+    cur.execute(f"SELECT {table.key} FROM {table.name}")
+    stored = [k for (k,) in cur.fetchall()]
+    return [k for k in stored if k not in keys], len(stored)
+
+
+def delete_rows(conn, cur, table: Table, keys: list) -> int:
+    for i in range(0, len(keys), DELETE_BATCH):
+        part = keys[i:i + DELETE_BATCH]
+        cur.execute(f"DELETE FROM {table.name} WHERE {table.key} IN ({', '.join(['%s'] * len(part))})", part)
+        conn.commit()
+    return len(keys)
+
+
+#  Schema upgrades
+# Databases created from an older schema.sql are brought up to date at
+# startup: missing tables are created and missing columns added (existing
+# data is left alone, so retired columns like raw_text simply stop being written).
+
+TEXT_BLOBS_DDL = """CREATE TABLE IF NOT EXISTS text_blobs (
+    sha CHAR(64) NOT NULL,
+    body MEDIUMBLOB NOT NULL,
+    PRIMARY KEY (sha)
+)"""
+ADDED_COLUMNS = {
+    "well_info": [("raw_text_sha", "CHAR(64)"), (HASH_COLUMN, "CHAR(32)")],
+    "stimulation_data": [("raw_text_sha", "CHAR(64)"), ("raw_text_clean_sha", "CHAR(64)"), (HASH_COLUMN, "CHAR(32)")],
+    "production_data": [(HASH_COLUMN, "CHAR(32)")],
+}
+
+
+def upgrade_schema(conn, cur, tables: list):
+    """Create text_blobs and add the ADDED_COLUMNS that tables lack (rows without a row_hash then count as changed)."""
+    cur.execute(TEXT_BLOBS_DDL)
+    for t in tables:
+        if not table_swap.exists(cur, t):
+            continue
+        cur.execute("SELECT COLUMN_NAME FROM information_schema.COLUMNS "
+                    "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s", (t,))
+        have = {name for (name,) in cur.fetchall()}
+        missing = [(c, sql_type) for c, sql_type in ADDED_COLUMNS.get(t, []) if c not in have]
+        if missing:
+            cur.execute(f"ALTER TABLE {t} " + ", ".join(f"ADD COLUMN {c} {sql_type}" for c, sql_type in missing))
+            print(f"Upgraded {t}: added {', '.join(c for c, _ in missing)}")
+    conn.commit()
+
+
+#  Row mode
+
+# lock wait timeout / deadlock: concurrent loaders may collide on index pages; the batch is retried
+RETRY_ERRNOS = (1205, 1213)
+RETRIES = 3
+
+
+def run_batch(conn, cur, sql: str, rows: list = None):
+    """Execute (executemany if rows) and commit, retrying the transaction on a lock timeout or deadlock."""
+    for attempt in range(RETRIES + 1):
+        try:
+            if rows is None:
+                cur.execute(sql)
+            else:
+                cur.executemany(sql, rows)
+            conn.commit()
+            return
+        except mysql.connector.Error as e:
+            if e.errno not in RETRY_ERRNOS or attempt == RETRIES:
+                raise
+            conn.rollback()
+            time.sleep(0.2 * 2 ** attempt)
+
+
+def load_rows(conn, cur, table: Table, path: Path, blobs: BlobRefs, batch_size: int,
+              into: str = None, keys: set = None, span: tuple = (0, None), delta: Delta = None) -> int:
+    """executemany upserts of batch_size rows (into another table than table.name if given), committed per batch."""
+    sql = table.upsert_sql(into)
+    n = 0
+    buf = []
+    for row in iter_rows(table, path, blobs, keys, span, delta):
+        buf.append(row)
+        if len(buf) >= batch_size:
+            blobs.flush(conn, cur)
+            run_batch(conn, cur, sql, buf)
+            n += len(buf)
+            buf.clear()
+
+    if buf:
+        blobs.flush(conn, cur)
+        run_batch(conn, cur, sql, buf)
+        n += len(buf)
+    return n
+
+
+#  Bulk mode
+# LOAD DATA's default text format: tab-separated fields, newline-terminated
+# lines, backslash escapes, \N for NULL.
+
+TSV_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r", "\0": "\\0"})
+TSV_NULL = "\\N"
+
+
+def tsv_field(v) -> str:
+    if v is None:
+        return TSV_NULL
+    if v is True or v is False:
+        return "1" if v else "0"
+    if isinstance(v, (int, float)):
+        return repr(v)
+    return str(v).translate(TSV_ESCAPES)
+
+
+def write_tsv(table: Table, path: Path, blobs: BlobRefs, conn, cur, dst, batch_size: int, keys: set = None,
+              span: tuple = (0, None), delta: Delta = None) -> int:
+    """Normalized rows of path -> TSV lines in dst (table.insert_columns order); blobs shipped as they pile up."""
+    n = 0
+    for row in iter_rows(table, path, blobs, keys, span, delta):
+        dst.write("\t".join(tsv_field(row[c]) for c in table.insert_columns) + "\n")
+        n += 1
+        if len(blobs.pending) >= batch_size:
+            blobs.flush(conn, cur)
+    blobs.flush(conn, cur)
+    return n
+
+
+def load_bulk(conn, cur, table: Table, path: Path, blobs: BlobRefs, batch_size: int, tsv_dir: str = None,
+              into: str = None, keys: set = None, span: tuple = (0, None), delta: Delta = None) -> int:
+    """TSV -> LOAD DATA LOCAL INFILE into a temporary staging table -> one INSERT ... SELECT upsert."""
+    target = into or table.name
+    stage = f"{target}_stage"
+    fd, tsv = tempfile.mkstemp(prefix=f"{table.name}.", suffix=".tsv", dir=tsv_dir)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8", newline="\n") as dst:
+            n = write_tsv(table, path, blobs, conn, cur, dst, batch_size, keys, span, delta)
+        if not n:
+            return 0
+
+        cur.execute(f"DROP TEMPORARY TABLE IF EXISTS {stage}")
+        cur.execute(f"CREATE TEMPORARY TABLE {stage} LIKE {target}")
+        # keep every input row in file order, so the last row of a repeated key wins as in row mode
+        cur.execute(f"ALTER TABLE {stage} DROP PRIMARY KEY, ADD COLUMN _seq INT AUTO_INCREMENT PRIMARY KEY")
+        cur.execute(
+            f"LOAD DATA LOCAL INFILE %s INTO TABLE {stage} CHARACTER SET utf8mb4 "
+            f"FIELDS TERMINATED BY '\\t' ESCAPED BY '\\\\' LINES TERMINATED BY '\\n' "
+            f"({table.column_list()})",
+            (tsv,),
+        )
+        cur.execute("SHOW WARNINGS LIMIT 5")
+        for level, code, msg in cur.fetchall():
+            print(f"  [{table.name}] LOAD DATA {level} {code}: {msg}")
+
+        run_batch(
+            conn, cur,
+            f"INSERT INTO {target} ({table.column_list()})\n"
+            f"SELECT {table.column_list()} FROM {stage} ORDER BY _seq\n"
+            f"ON DUPLICATE KEY UPDATE\n  {table.update_clause()}"
+        )
+        cur.execute(f"DROP TEMPORARY TABLE IF EXISTS {stage}")
+    finally:
+        os.unlink(tsv)
+    return n
+
+
+#  Main
+
+#  Concurrent mode
+# well_info goes first over the main connection; the child tables only need
+# their parents in place, so their files are cut into byte-range chunks that
+# a thread pool loads over a pool of connections, both tables at once.
+
+SAMPLE_ROWS = 200
+MAX_AUTO_BATCH = 10000
+
+
+def fit_batch_size(cur, table: Table, path: Path, store: BlobStore) -> int:
+    """
+    Rows per batch so one multi-row INSERT of the largest sampled rows stays
+    within PACKET_SHARE of the packet limit (blobs go in their own INSERTs).
+    """
+    packet = max_packet(cur)
+    probe = BlobRefs(store)  # throwaway: the real load ships the sample's blobs
+    largest = 0
+    for i, row in enumerate(iter_rows(table, path, probe)):
+        # quoted literal + separator; escaping rarely adds more than the 4 spare bytes
+        largest = max(largest, sum(len(str(row[c]).encode("utf-8")) + 4 for c in table.columns))
+        if i + 1 >= SAMPLE_ROWS:
+            break
+    if not largest:
+        return 1
+    return max(1, min(MAX_AUTO_BATCH, int(packet * PACKET_SHARE / largest)))
+
+
+def repeated_key_spans(path: Path, key: str) -> list:
+    """
+    (start of first line, end of last line) of every key value found on more
+    than one line of path, read off the raw JSON without decoding the rows.
+    """
+    rx = re.compile(rb'"%s":\s*"((?:[^"\\]|\\.)*)"' % re.escape(key.encode()))
+    first, last = {}, {}
+    pos = 0
+    with path.open("rb") as f:
+        for line in f:
+            m = rx.search(line)
+            if m:
+                first.setdefault(m.group(1), pos)
+                last[m.group(1)] = (pos, pos + len(line))
+            pos += len(line)
+    return [(first[k], end) for k, (start, end) in last.items() if start != first[k]]
+
+
+def load_concurrent(args, pool, jobs: list, store: BlobStore, sent: set, batch_sizes: dict,
+                    into: dict, loaded: dict) -> dict:
+    """
+    Load jobs [(table, path), ...] as byte-range chunks, each over its own pooled
+    connection. Every row of a repeated key lands in the same chunk, so the
+    last one in the file wins as in a serial load. Returns {table name: (rows
+    sent, unchanged rows, chunks, seconds from first chunk start to last chunk end)}.
+    """
+    per_table = [[(table, path, span)
+                  for span in chunk_ranges(path, args.connections, repeated_key_spans(path, table.key))]
+                 for table, path in jobs]
+    # interleave the tables so every one of them is in flight from the start
+    tasks = [t for group in zip_longest(*per_table) for t in group if t is not None]
+
+    def work(table: Table, path: Path, span: tuple):
+        conn = pool.get_connection()
+        try:
+            cur = conn.cursor()
+            t0 = time.perf_counter()
+            n, unchanged = load_table(args, conn, cur, table, path, BlobRefs(store, sent), into.get(table.name),
+                                      loaded.get(table.name), batch_sizes[table.name], span)
+            cur.close()
+            return n, unchanged, t0, time.perf_counter()
+        finally:
+            conn.close()  # back to the pool
+
+    out = {}
+    with ThreadPoolExecutor(max_workers=args.connections) as ex:
+        futures = [(table, ex.submit(work, table, path, span)) for table, path, span in tasks]
+        for table, f in futures:
+            n, unchanged, t0, t1 = f.result()
+            rows, skipped, chunks, first, last = out.get(table.name, (0, 0, 0, t0, t1))
+            out[table.name] = (rows + n, skipped + unchanged, chunks + 1, min(first, t0), max(last, t1))
+    return {name: (rows, skipped, chunks, last - first) for name, (rows, skipped, chunks, first, last) in out.items()}
+
+
+def load_summary(name: str, n: int, unchanged: int, dt: float, detail: str) -> str:
+    """One "Loaded ..." line; rows/s counts every row read, sent or skipped as unchanged."""
+    skipped = f" ({unchanged} unchanged skipped)" if unchanged else ""
+    return f"Loaded {name} rows: {n}{skipped} in {dt:.2f}s ({(n + unchanged) / dt if dt else 0:.0f} rows/s, {detail})"
+
+
+def load_table(args, conn, cur, table: Table, path: Path, blobs: BlobRefs, into: str = None, keys: set = None,
+               batch_size: int = None, span: tuple = (0, None)) -> tuple:
+    """(rows sent, unchanged rows skipped by --delta)."""
+    batch_size = batch_size or args.batch_size or 500
+    delta = Delta(cur, into or table.name, batch_size) if args.delta else None
+    try:
+        if args.bulk:
+            n = load_bulk(conn, cur, table, path, blobs, batch_size, args.tsv_dir, into, keys, span, delta)
+        else:
+            n = load_rows(conn, cur, table, path, blobs, batch_size, into, keys, span, delta)
+        return n, delta.unchanged if delta else 0
+    except mysql.connector.Error as e:
+        if args.bulk and e.errno in (1148, 2068, 3948):  # LOAD DATA LOCAL disabled on client or server
+            raise SystemExit(f"ERROR: {e}\n--bulk needs local_infile=ON on the server "
+                             "(SET GLOBAL local_infile=1); or load without --bulk.")
+        raise
+
+
 def main():
     ap = argparse.ArgumentParser(description="Load Lab6 JSONL outputs into MySQL.")
     ap.add_argument("--host", default="localhost")
@@ -40,258 +557,170 @@ def main():
     ap.add_argument("--user", required=True)
     ap.add_argument("--password", required=True)
     ap.add_argument("--database", default="lab6")
-    ap.add_argument("--well_jsonl", required=True)
-    ap.add_argument("--stim_jsonl", required=True)
+    ap.add_argument("--well_jsonl", default="", help="Path to well_info.jsonl (required unless --rollback)")
+    ap.add_argument("--stim_jsonl", default="", help="Path to stimulation_data.jsonl (required unless --rollback)")
     ap.add_argument("--prod_jsonl", default="", help="Path to production_data.jsonl (optional)")
-    ap.add_argument("--batch_size", type=int, default=500)
+    ap.add_argument("--blob_dir", default="", help="Raw text blob store (default: <well_jsonl dir>/blobs)")
+    ap.add_argument("--batch_size", type=int, default=0,
+                    help="Rows per INSERT batch (default: 500, or fitted to max_allowed_packet with --connections)")
     ap.add_argument("--truncate", action="store_true")
+    ap.add_argument("--bulk", action="store_true",
+                    help="LOAD DATA LOCAL INFILE each file into a staging table, then one set-based upsert")
+    ap.add_argument("--tsv_dir", default=None, help="bulk: where the temporary TSV files go (default: system temp)")
+    ap.add_argument("--shadow", action="store_true",
+                    help="Load into *_next tables, verify, then swap them in with one atomic RENAME TABLE "
+                         "(previous generation kept as *_prev)")
+    ap.add_argument("--shadow_min_ratio", type=float, default=0.5,
+                    help="shadow: refuse to swap if a table would shrink below this share of its live rows")
+    ap.add_argument("--rollback", action="store_true", help="Swap the *_prev generation back in and exit")
+    ap.add_argument("--connections", type=int, default=1,
+                    help="After well_info, load the child tables in chunks over N pooled connections (1 = serial)")
+    ap.add_argument("--delta", action="store_true",
+                    help="Only send rows that are new or whose row_hash changed (one hash lookup per batch)")
+    ap.add_argument("--delete_missing", action="store_true",
+                    help="After loading, delete rows whose API# is no longer in the table's input file")
+    ap.add_argument("--delete_max_ratio", type=float, default=0.5,
+                    help="delete_missing: refuse if more than this share of a table's rows would be deleted")
     args = ap.parse_args()
-
-    conn = mysql.connector.connect(
+    if not args.rollback and not (args.well_jsonl and args.stim_jsonl):
+        ap.error("--well_jsonl and --stim_jsonl are required (unless --rollback)")
+    if args.shadow and args.truncate:
+        ap.error("--shadow replaces the tables as a whole; drop --truncate")
+    if args.shadow and (args.delta or args.delete_missing):
+        ap.error("--shadow rebuilds every row into empty tables; drop --delta / --delete_missing")
+    if args.delta and args.truncate:
+        ap.error("--delta compares against the loaded rows; drop --truncate")
+
+    db = dict(
         host=args.host,
         port=args.port,
         user=args.user,
         password=args.password,
         database=args.database,
         autocommit=False,
+        allow_local_infile=args.bulk,
     )
+    conn = mysql.connector.connect(**db)
     cur = conn.cursor()
+    group = [t.name for t in (WELL_TABLE, STIM_TABLE, PROD_TABLE)]
+
+    if args.rollback:
+        try:
+            table_swap.rollback(conn, cur, group)
+        except RuntimeError as e:
+            raise SystemExit(f"ERROR: {e}")
+        print(f"Rolled back: {', '.join(group)} swapped with their {table_swap.PREV} generation.")
+        cur.close()
+        conn.close()
+        return
+
+    upgrade_schema(conn, cur, group)
+    blob_dir = Path(args.blob_dir) if args.blob_dir else Path(args.well_jsonl).parent / "blobs"
+    blobs = BlobRefs(BlobStore(blob_dir))
 
     if args.truncate:
         cur.execute("SET FOREIGN_KEY_CHECKS=0")
         cur.execute("TRUNCATE TABLE IF EXISTS production_data")
         cur.execute("TRUNCATE TABLE stimulation_data")
         cur.execute("TRUNCATE TABLE well_info")
+        cur.execute("TRUNCATE TABLE text_blobs")
         cur.execute("SET FOREIGN_KEY_CHECKS=1")
         conn.commit()
 
-    # ==========================
-    # well_info (api as PK)
-    # ==========================
-    well_sql = """
-    INSERT INTO well_info (
-      operator, well_name, api, enesco_job, job_type, county_state, shl_location,
-      latitude, longitude, datum,
-      ndic_file_no, county, state, address,
-      lat_raw, lon_raw, latlon_page, latlon_suspect, fig1_pages, raw_text
-    ) VALUES (
-      %(operator)s, %(well_name)s, %(api)s, %(enesco_job)s, %(job_type)s, %(county_state)s, %(shl_location)s,
-      %(latitude)s, %(longitude)s, %(datum)s,
-      %(ndic_file_no)s, %(county)s, %(state)s, %(address)s,
-      %(lat_raw)s, %(lon_raw)s, %(latlon_page)s, %(latlon_suspect)s, %(fig1_pages)s, %(raw_text)s
-    )
-    ON DUPLICATE KEY UPDATE
-      operator=VALUES(operator),
-      well_name=VALUES(well_name),
-      enesco_job=VALUES(enesco_job),
-      job_type=VALUES(job_type),
-      county_state=VALUES(county_state),
-      shl_location=VALUES(shl_location),
-      latitude=VALUES(latitude),
-      longitude=VALUES(longitude),
-      datum=VALUES(datum),
-      ndic_file_no=VALUES(ndic_file_no),
-      county=VALUES(county),
-      state=VALUES(state),
-      address=VALUES(address),
-      lat_raw=VALUES(lat_raw),
-      lon_raw=VALUES(lon_raw),
-      latlon_page=VALUES(latlon_page),
-      latlon_suspect=VALUES(latlon_suspect),
-      fig1_pages=VALUES(fig1_pages),
-      raw_text=VALUES(raw_text)
-    """
-
-    def norm_well(row: dict):
-        row["latlon_suspect"] = int(bool(row.get("latlon_suspect")))
-        fig = row.get("fig1_pages")
-        row["fig1_pages"] = json.dumps(fig) if fig else None
-        return row
-
-    n_well = 0
-    buf = []
-    for _, row in iter_jsonl(Path(args.well_jsonl)):
-        buf.append(norm_well(row))
-        if len(buf) >= args.batch_size:
-            cur.executemany(well_sql, buf)
-            conn.commit()
-            n_well += len(buf)
-            buf.clear()
-
-    if buf:
-        cur.executemany(well_sql, buf)
-        conn.commit()
-        n_well += len(buf)
-
-    print(f"Loaded well_info rows: {n_well}")
-
-    # ==========================
-    # stimulation_data (api FK)
-    # ==========================
-    stim_sql = """
-    INSERT INTO stimulation_data (
-      date_stimulated, stimulation_formation, top_ft, bottom_ft, stimulation_stages,
-      volume, volume_units,
-      treatment_type, acid_pct, lbs_proppant,
-      max_treatment_pressure_psi, max_treatment_rate_bbl_min,
-      details,
-      api,
-      stim_present, stim_has_fields,
-      ndic_file_no, fig2_pages,
-      raw_text, raw_text_clean
-    ) VALUES (
-      %(date_stimulated)s, %(stimulation_formation)s, %(top_ft)s, %(bottom_ft)s, %(stimulation_stages)s,
-      %(volume)s, %(volume_units)s,
-      %(treatment_type)s, %(acid_pct)s, %(lbs_proppant)s,
-      %(max_treatment_pressure_psi)s, %(max_treatment_rate_bbl_min)s,
-      %(details)s,
-      %(api)s,
-      %(stim_present)s, %(stim_has_fields)s,
-      %(ndic_file_no)s, %(fig2_pages)s,
-      %(raw_text)s, %(raw_text_clean)s
-    )
-    ON DUPLICATE KEY UPDATE
-      stimulation_formation=VALUES(stimulation_formation),
-      top_ft=VALUES(top_ft),
-      bottom_ft=VALUES(bottom_ft),
-      stimulation_stages=VALUES(stimulation_stages),
-      volume=VALUES(volume),
-      volume_units=VALUES(volume_units),
-      treatment_type=VALUES(treatment_type),
-      acid_pct=VALUES(acid_pct),
-      lbs_proppant=VALUES(lbs_proppant),
-      max_treatment_pressure_psi=VALUES(max_treatment_pressure_psi),
-      max_treatment_rate_bbl_min=VALUES(max_treatment_rate_bbl_min),
-      details=VALUES(details),
-      stim_present=VALUES(stim_present),
-      stim_has_fields=VALUES(stim_has_fields),
-      ndic_file_no=VALUES(ndic_file_no),
-      fig2_pages=VALUES(fig2_pages),
-      raw_text=VALUES(raw_text),
-      raw_text_clean=VALUES(raw_text_clean)
-    """
-
-    def norm_stim(row: dict):
-        row["date_stimulated"] = to_date(row.get("date_stimulated"))
-        row["stim_present"] = int(bool(row.get("stim_present")))
-        row["stim_has_fields"] = int(bool(row.get("stim_has_fields")))
-        fig = row.get("fig2_pages")
-        row["fig2_pages"] = json.dumps(fig) if fig else None
-        return row
-
-    n_stim = 0
-    buf = []
-    for _, row in iter_jsonl(Path(args.stim_jsonl)):
-        buf.append(norm_stim(row))
-        if len(buf) >= args.batch_size:
-            cur.executemany(stim_sql, buf)
-            conn.commit()
-            n_stim += len(buf)
-            buf.clear()
-
-    if buf:
-        cur.executemany(stim_sql, buf)
-        conn.commit()
-        n_stim += len(buf)
-
-    print(f"Loaded stimulation_data rows: {n_stim}")
-
-    # ==========================
-    # production_data (api FK, web-scraped)
-    # ==========================
     prod_jsonl = Path(args.prod_jsonl) if args.prod_jsonl else None
-    n_prod = 0
-
+    jobs = [(WELL_TABLE, Path(args.well_jsonl)), (STIM_TABLE, Path(args.stim_jsonl))]
     if prod_jsonl and prod_jsonl.exists():
-        prod_sql = """
-        INSERT INTO production_data (
-            api, well_name, well_status, well_type, closest_city,
-            operator, county_state, first_production_date, most_recent_production_date,
-            oil_barrels, gas_mcf,
-            drillingedge_url, scrape_success
-        ) VALUES (
-          %(api)s, %(well_name)s, %(well_status)s, %(well_type)s, %(closest_city)s,
-                    %(operator)s, %(county_state)s, %(first_production_date)s, %(most_recent_production_date)s,
-                    %(oil_barrels)s, %(gas_mcf)s,
-                    %(drillingedge_url)s, %(scrape_success)s
-        )
-        ON DUPLICATE KEY UPDATE
-            well_name=VALUES(well_name),
-            well_status=VALUES(well_status),
-            well_type=VALUES(well_type),
-            closest_city=VALUES(closest_city),
-            operator=VALUES(operator),
-            county_state=VALUES(county_state),
-            first_production_date=VALUES(first_production_date),
-            most_recent_production_date=VALUES(most_recent_production_date),
-            oil_barrels=VALUES(oil_barrels),
-            gas_mcf=VALUES(gas_mcf),
-            drillingedge_url=VALUES(drillingedge_url),
-            scrape_success=VALUES(scrape_success)
-        """
-
-        def norm_prod(row: dict):
-            # Ensure all expected keys exist to avoid KeyError during executemany
-            expected_keys = [
-                "api", "well_name", "well_status", "well_type", "closest_city",
-                "field_name", "operator", "county_state", "first_production_date", "most_recent_production_date",
-                "oil_barrels", "gas_mcf", "drillingedge_url", "scrape_success"
-            ]
-            for k in expected_keys:
-                if k not in row:
-                    row[k] = None
-
-            row["scrape_success"] = int(bool(row.get("scrape_success")))
-            # Ensure numeric types
-            try:
-                if row.get("oil_barrels") is not None:
-                    row["oil_barrels"] = float(row["oil_barrels"])
-            except (ValueError, TypeError):
-                row["oil_barrels"] = None
-            try:
-                if row.get("gas_mcf") is not None:
-                    row["gas_mcf"] = float(row["gas_mcf"])
-            except (ValueError, TypeError):
-                row["gas_mcf"] = None
-
-            # Preserve production date strings (or None)
-            row["first_production_date"] = to_date(row.get("first_production_date"))
-            row["most_recent_production_date"] = to_date(row.get("most_recent_production_date"))
-
-            # operator and county_state should be strings (preprocessed), but ensure None if missing
-            row["operator"] = row.get("operator")
-            row["county_state"] = row.get("county_state")
-
-            return row
-
-        buf = []
-        for _, row in iter_jsonl(prod_jsonl):
-            # Only load rows whose api exists in well_info
-            if not row.get("api"):
-                continue
-            buf.append(norm_prod(row))
-            if len(buf) >= args.batch_size:
-                cur.executemany(prod_sql, buf)
-                conn.commit()
-                n_prod += len(buf)
-                buf.clear()
-
-        if buf:
-            cur.executemany(prod_sql, buf)
-            conn.commit()
-            n_prod += len(buf)
-
-        print(f"Loaded production_data rows: {n_prod}")
+        jobs.append((PROD_TABLE, prod_jsonl))
+    elif args.prod_jsonl:
+        print(f"WARNING: production_data file not found: {args.prod_jsonl} — skipping.")
     else:
-        if args.prod_jsonl:
-            print(f"WARNING: production_data file not found: {args.prod_jsonl} — skipping.")
-        else:
-            print("No --prod_jsonl specified — skipping production_data.")
-
-    cur.close()
-    conn.close()
-
-    print(f"\nDone. Total: well_info={n_well}, stimulation={n_stim}, production={n_prod}")
+        print("No --prod_jsonl specified — skipping production_data.")
+
+    mode = "bulk" if args.bulk else "row"
+    if args.connections > 1:
+        mode += f", {args.connections} connections"
+    if args.delta:
+        mode += ", delta"
+    shadow = None
+    if args.shadow:
+        mode += ", shadow"
+        shadow = table_swap.ShadowLoad(conn, cur, group)
+        shadow.create()
+    counts = {name: 0 for name in group}
+    unchanged = {name: 0 for name in group}
+    deleted = {}
+    loaded = {}
+    t_start = time.perf_counter()
+    into = {name: shadow.next_name(name) for name in group} if shadow else {}
+    if shadow or args.delete_missing:
+        for table, _ in jobs:
+            loaded[table.name] = set()
+    concurrent = args.connections > 1 and len(jobs) > 1
+    try:
+        # parents first: stimulation_data / production_data reference well_info(api)
+        for table, path in (jobs[:1] if concurrent else jobs):
+            t0 = time.perf_counter()
+            counts[table.name], unchanged[table.name] = load_table(args, conn, cur, table, path, blobs,
+                                                                   into.get(table.name), loaded.get(table.name))
+            print(load_summary(table.name, counts[table.name], unchanged[table.name], time.perf_counter() - t0,
+                               f"{mode} mode"))
+
+        if concurrent:
+            batch_sizes = {t.name: args.batch_size or fit_batch_size(cur, t, p, blobs.store) for t, p in jobs[1:]}
+            pool = mysql.connector.pooling.MySQLConnectionPool(pool_name="load_to_mysql",
+                                                               pool_size=args.connections, **db)
+            print(f"Loading {', '.join(batch_sizes)} over {args.connections} connections "
+                  f"(batch sizes: {', '.join(f'{k} {v}' for k, v in batch_sizes.items())})")
+            results = load_concurrent(args, pool, jobs[1:], blobs.store, blobs.sent, batch_sizes, into, loaded)
+            for name, (n, skipped, chunks, dt) in results.items():
+                counts[name], unchanged[name] = n, skipped
+                print(load_summary(name, n, skipped, dt, f"{chunks} chunks, {mode} mode"))
+
+        if args.delete_missing:
+            # check every table before deleting anything: a truncated input file must not empty a table
+            missing = {table.name: find_missing(cur, table, loaded[table.name]) for table, _ in jobs}
+            too_many = [f"{name} {len(gone)} of {total}" for name, (gone, total) in missing.items()
+                        if len(gone) > total * args.delete_max_ratio]
+            if too_many:
+                raise SystemExit(f"ERROR: --delete_missing would delete more than {args.delete_max_ratio:.0%} "
+                                 f"of the rows ({'; '.join(too_many)}); nothing deleted")
+            for table, path in reversed(jobs):  # children first; well_info deletes cascade anyway
+                deleted[table.name] = delete_rows(conn, cur, table, missing[table.name][0])
+                print(f"Deleted {table.name} rows: {deleted[table.name]} (API# no longer in {path.name})")
+
+        if shadow:
+            for name in group:
+                if name not in loaded:
+                    n = shadow.copy_live(name)
+                    print(f"Carried over {name} rows: {n} (no new input)")
+            t0 = time.perf_counter()
+            shadow.finish()
+            print(f"Built indexes and foreign keys in {time.perf_counter() - t0:.2f}s")
+            problems = shadow.verify({name: len(keys) for name, keys in loaded.items()}, args.shadow_min_ratio)
+            if problems:
+                raise SystemExit("ERROR: shadow load rejected: " + "; ".join(problems))
+            shadow.swap()
+            print(f"Swapped in: {', '.join(group)} (previous generation kept as *{table_swap.PREV}; "
+                  f"undo with --rollback)")
+    except BaseException:
+        if shadow:
+            try:
+                shadow.discard()
+                print("Shadow tables dropped; the live tables were not changed.")
+            except mysql.connector.Error as e:
+                print(f"WARNING: could not drop the *{table_swap.NEXT} tables ({e}); the live tables were not changed.")
+        raise
+    finally:
+        cur.close()
+        conn.close()
+
+    print(f"\nDone in {time.perf_counter() - t_start:.2f}s ({mode} mode). Total: well_info={counts['well_info']}, "
+          f"stimulation={counts['stimulation_data']}, production={counts['production_data']}, "
+          f"text_blobs={len(blobs.sent)}")
+    if args.delta:
+        print(f"Unchanged (skipped): {', '.join(f'{k}={v}' for k, v in unchanged.items())}")
+    if deleted:
+        print(f"Deleted: {', '.join(f'{k}={v}' for k, v in deleted.items())}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,210 @@
+"""
+Hashed-feature linear page classifier for filter_and_parse.py.
+
+Optional alternative to the regex tallies (group_score / latlon_page_score):
+every page of a document is turned into hashed unigram+bigram features in one
+NumPy batch and scored by a small logistic model with three heads
+(fig1, fig2, coord). The model is trained on labels produced by the current
+regex heuristics, which remain the fallback when no model / NumPy is present.
+
+Train:
+    python3 page_classifier.py \
+        --texts_dir output/texts \
+        --out output/page_model.npz
+
+Use:
+    python3 filter_and_parse.py ... --page_model output/page_model.npz
+"""
+
+import argparse
+import json
+import re
+import zlib
+from pathlib import Path
+from typing import Optional
+
+try:
+    import numpy as np
+except ImportError:  # classifier mode is optional; regex scoring needs nothing extra
+    np = None
+
+LABELS = ("fig1", "fig2", "coord")
+N_FEATURES = 1 << 18
+
+RE_TOKEN = re.compile(r"[a-z]+|\d+(?:\.\d+)?|[°º'\"#:%$]")
+RE_DIGIT = re.compile(r"\d")
+
+
+# ===================== features =====================
+def page_text(page: dict) -> str:
+    """The text the model sees for a page dict, in training and in filter_and_parse.py alike."""
+    return re.sub(r"\s+", " ", (page.get("text") or "").replace("\u00a0", " ")).strip()
+
+
+def page_tokens(text: str) -> list[str]:
+    """Lowercased word tokens; numbers collapse to their digit shape (48.12 -> 00.00)."""
+    toks = [RE_DIGIT.sub("0", t) for t in RE_TOKEN.findall((text or "").lower())]
+    return toks + [a + " " + b for a, b in zip(toks, toks[1:])]
+
+
+def hash_token(tok: str) -> int:
+    # crc32 instead of hash(): must be stable across processes for a saved model
+    return zlib.crc32(tok.encode("utf-8")) & (N_FEATURES - 1)
+
+
+def featurize(texts):
+    """
+    Hash a batch of page texts into a sparse COO matrix.
+    Returns (rows, cols, vals, n_rows); binary features, each row L2-normalized.
+    """
+    rows, cols = [], []
+    for i, t in enumerate(texts):
+        idx = {hash_token(tok) for tok in page_tokens(t)}
+        rows.extend([i] * len(idx))
+        cols.extend(idx)
+    rows = np.asarray(rows, dtype=np.int64)
+    cols = np.asarray(cols, dtype=np.int64)
+    nnz = np.bincount(rows, minlength=len(texts)).astype(np.float32)
+    vals = 1.0 / np.sqrt(np.maximum(nnz, 1.0))[rows]
+    return rows, cols, vals.astype(np.float32), len(texts)
+
+
+def linear_scores(W, b, feats):
+    rows, cols, vals, n = feats
+    out = np.empty((n, W.shape[1]), dtype=np.float32)
+    for k in range(W.shape[1]):
+        out[:, k] = np.bincount(rows, weights=W[cols, k] * vals, minlength=n)
+    return out + b
+
+
+def sigmoid(z):
+    return 1.0 / (1.0 + np.exp(-np.clip(z, -30, 30)))
+
+
+# ===================== model =====================
+class PageModel:
+    def __init__(self, W, b, threshold: float = 0.5):
+        self.W = W
+        self.b = b
+        self.threshold = threshold
+
+    def predict_proba(self, texts):
+        """(n_pages, 3) probabilities for LABELS, one batched matrix pass."""
+        if not texts:
+            return np.zeros((0, len(LABELS)), dtype=np.float32)
+        return sigmoid(linear_scores(self.W, self.b, featurize(texts)))
+
+    def save(self, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        np.savez_compressed(path, W=self.W, b=self.b, labels=np.array(LABELS), n_features=N_FEATURES)
+
+
+def load_model(path: Path, threshold: float = 0.5) -> Optional[PageModel]:
+    """Return the saved model, or None (regex fallback) if NumPy or the file is missing."""
+    if np is None:
+        print("NOTE: --page_model needs numpy (pip install numpy); using regex page scoring.")
+        return None
+    if not path.exists():
+        print(f"NOTE: page model not found: {path}; using regex page scoring.")
+        return None
+    d = np.load(path)
+    if int(d["n_features"]) != N_FEATURES or tuple(d["labels"]) != LABELS:
+        print(f"NOTE: page model {path} was built with different features; using regex page scoring.")
+        return None
+    return PageModel(d["W"], d["b"], threshold)
+
+
+def train(texts, Y, *, epochs: int = 60, lr: float = 0.5, l2: float = 1e-6) -> PageModel:
+    """Full-batch logistic regression (one head per label) with Adagrad steps."""
+    feats = featurize(texts)
+    rows, cols, vals, n = feats
+    K = Y.shape[1]
+    W = np.zeros((N_FEATURES, K), dtype=np.float32)
+    b = np.zeros(K, dtype=np.float32)
+    gW = np.full_like(W, 1e-8)
+    gb = np.full_like(b, 1e-8)
+
+    # positives are rare (2-3 pages per document): balance the two classes per head
+    pos = Y.sum(axis=0)
+    w_pos = np.where(pos > 0, (n - pos) / np.maximum(pos, 1), 1.0).astype(np.float32)
+    sw = np.where(Y > 0, w_pos, 1.0).astype(np.float32)
+
+    for _ in range(epochs):
+        err = (sigmoid(linear_scores(W, b, feats)) - Y) * sw / n
+        for k in range(K):
+            g = np.bincount(cols, weights=err[rows, k] * vals, minlength=N_FEATURES).astype(np.float32)
+            g += l2 * W[:, k]
+            gW[:, k] += g * g
+            W[:, k] -= lr * g / np.sqrt(gW[:, k])
+        g0 = err.sum(axis=0)
+        gb += g0 * g0
+        b -= lr * g0 / np.sqrt(gb)
+    return PageModel(W, b)
+
+
+# ===================== regex labels =====================
+def regex_labels(pages, fig1_th=2, fig2_th=2, fig1_neg_penalty=1, disable_neg=False):
+    """Label pages with the current regex heuristics: (n_pages, 3) 0/1 matrix."""
+    from filter_and_parse import candidates, latlon_page_score
+
+    c1, c2 = candidates(pages, fig1_th, fig2_th, fig1_neg_penalty, disable_neg)
+    fig1 = {c["page"] for c in c1}
+    fig2 = {c["page"] for c in c2}
+    Y = np.zeros((len(pages), len(LABELS)), dtype=np.float32)
+    for i, p in enumerate(pages):
+        Y[i, 0] = p.get("page") in fig1
+        Y[i, 1] = p.get("page") in fig2
+        Y[i, 2] = latlon_page_score(p.get("text") or "") > 0
+    return Y
+
+
+# ===================== main =====================
+def main():
+    ap = argparse.ArgumentParser(description="Train the hashed-feature page classifier on regex-labeled pages.")
+    ap.add_argument("--texts_dir", required=True, help="Per-page JSON dumps from dump_pages_json.py")
+    ap.add_argument("--out", required=True, help="Model path (.npz)")
+    ap.add_argument("--max_files", type=int, default=0)
+    ap.add_argument("--epochs", type=int, default=60)
+    ap.add_argument("--fig1_threshold", type=int, default=2)
+    ap.add_argument("--fig2_threshold", type=int, default=2)
+    args = ap.parse_args()
+
+    if np is None:
+        raise ImportError("page_classifier.py needs numpy: pip install numpy")
+
+    texts_dir = Path(args.texts_dir).expanduser().resolve()
+    files = sorted(p for p in texts_dir.rglob("*.json") if p.is_file())
+    if args.max_files and args.max_files > 0:
+        files = files[:args.max_files]
+
+    texts, labels = [], []
+    for jf in files:
+        pages = [p for p in (json.loads(jf.read_text(encoding="utf-8")).get("pages") or []) if p.get("text")]
+        if not pages:
+            continue
+        texts += [page_text(p) for p in pages]
+        labels.append(regex_labels(pages, args.fig1_threshold, args.fig2_threshold))
+
+    if not texts:
+        print(f"No pages found under {texts_dir}")
+        return
+
+    Y = np.concatenate(labels)
+    print(f"Training on {len(texts)} pages from {len(files)} files; positives: "
+          + ", ".join(f"{lab}={int(Y[:, k].sum())}" for k, lab in enumerate(LABELS)))
+
+    model = train(texts, Y, epochs=args.epochs)
+    pred = model.predict_proba(texts) >= model.threshold
+    for k, lab in enumerate(LABELS):
+        tp = int((pred[:, k] & (Y[:, k] > 0)).sum())
+        prec = tp / max(int(pred[:, k].sum()), 1)
+        rec = tp / max(int(Y[:, k].sum()), 1)
+        print(f"  {lab:<6s} agreement with regex: precision={prec:.3f} recall={rec:.3f}")
+
+    out = Path(args.out).expanduser().resolve()
+    model.save(out)
+    print(f"Model -> {out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Request pacing for scrape_production.py.
+
+TokenBucket / HostRateLimiter replace fixed time.sleep(delay) calls in the
+async engine: each host gets `rate` requests per second on average, with up
+to `burst` requests allowed back to back. AdaptivePacer (--adaptive) instead
+tunes the interval from observed latency and 429 / error responses.
+"""
+
+import asyncio
+import threading
+import time
+from typing import Optional
+from urllib.parse import urlparse
+
+
+class TokenBucket:
+    """`rate` tokens per second, holding at most `burst`; acquire() waits for one token."""
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = max(rate, 1e-6)
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self):
+        # the lock keeps waiters in FIFO order so no request starves
+        async with self._lock:
+            while True:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class HostRateLimiter:
+    """One TokenBucket per host (netloc)."""
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = burst
+        self.buckets: dict[str, TokenBucket] = {}
+
+    def bucket(self, url: str) -> TokenBucket:
+        host = urlparse(url).netloc
+        if host not in self.buckets:
+            self.buckets[host] = TokenBucket(self.rate, self.burst)
+        return self.buckets[host]
+
+    async def acquire(self, url: str):
+        await self.bucket(url).acquire()
+
+
+class AdaptivePacer:
+    """
+    Self-tuning spacing between requests (AIMD on the interval).
+
+    Every fast, successful response shrinks the interval by the fraction
+    `step`; a 429, 5xx, timeout or network error multiplies it by `backoff`
+    (and a Retry-After header is honoured), and slow responses widen it a
+    little. The interval always stays within [min_interval, max_interval].
+    The two balance at an error rate of roughly 20%, so occasional stray
+    errors don't stall the run, while a site that throttles above some
+    request rate keeps the interval oscillating just under that rate.
+
+    acquire(url) has the same shape as HostRateLimiter.acquire, so the async
+    engine can use either; wait() is the blocking form for the sequential loop.
+    """
+
+    def __init__(self, interval: float, min_interval: float = 0.25, max_interval: float = 30.0,
+                 slow_latency: float = 3.0, step: float = 0.1, backoff: float = 1.5):
+        self.min_interval = min_interval
+        self.max_interval = max(max_interval, min_interval)
+        self.interval = min(max(interval, min_interval), self.max_interval)
+        self.slow_latency = slow_latency
+        self.step = step
+        self.backoff = backoff
+        self.next_at = 0.0
+        self.latency = None  # EWMA, seconds
+        self.backed_off = False  # last response was a 429 / 5xx / timeout
+        self.counts = {"requests": 0, "throttled": 0, "errors": 0, "slow": 0}
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """Claim the next request slot; returns seconds to wait for it."""
+        with self._lock:
+            now = time.monotonic()
+            at = max(now, self.next_at)
+            self.next_at = at + self.interval
+            return at - now
+
+    def wait(self):
+        time.sleep(self._reserve())
+
+    async def acquire(self, url: str = ""):
+        await asyncio.sleep(self._reserve())
+
+    def record(self, status: Optional[int], latency: float, retry_after: Optional[float] = None):
+        """status None = timeout / connection error."""
+        with self._lock:
+            self.counts["requests"] += 1
+            self.latency = latency if self.latency is None else 0.8 * self.latency + 0.2 * latency
+            self.backed_off = status is None or status == 429 or status >= 500
+            if self.backed_off:
+                self.counts["throttled" if status == 429 else "errors"] += 1
+                self.interval = min(self.max_interval, max(self.interval * self.backoff, retry_after or 0.0))
+                # push the next slot out too, so requests already queued back off now
+                self.next_at = max(self.next_at, time.monotonic() + max(self.interval, retry_after or 0.0))
+            elif latency > self.slow_latency:
+                self.counts["slow"] += 1
+                self.interval = min(self.max_interval, self.interval * 1.1)
+            else:
+                self.interval = max(self.min_interval, self.interval * (1 - self.step))
+
+    def summary(self) -> str:
+        c = self.counts
+        lat = f"{self.latency:.2f}s" if self.latency is not None else "-"
+        return (f"interval={self.interval:.2f}s  latency~{lat}  requests={c['requests']}  "
+                f"429={c['throttled']}  errors={c['errors']}  slow={c['slow']}")
@@ -4,17 +4,39 @@ Applies to: well_info.jsonl, stimulation_data.jsonl, production_data.jsonl
 Usage:
     python3 preprocess.py --data_dir output/parsed
 
-This reads *.jsonl files in-place (backs up originals as *.jsonl.bak).
+Each *.jsonl file is streamed row by row into a temp file that atomically
+replaces the original, so memory stays flat and an interrupted run leaves
+the old file intact. The original is kept as *.jsonl.bak (--backup:
+hardlink = no extra disk space, copy, or none); it is only ever taken from
+an original file, never from one that already holds stamped rows.
+Cleaned rows are stamped with PP_VERSION and a hash of their content; a
+re-run copies rows with a current stamp without re-cleaning them (--force
+re-cleans all), and leaves a file with nothing to clean, and its .bak, as is.
+--workers N cleans byte-range chunks of each file in a process pool;
+--columnar converts the numeric columns of each batch with NumPy.
 """
 
 import argparse
+import hashlib
 import json
+import mmap
+import os
 import re
 import shutil
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from datetime import datetime
+from functools import lru_cache
+from operator import itemgetter
 from typing import Optional, Any
 
+from records import chunk_ranges
+
+try:
+    import numpy as np
+except ImportError:  # --columnar is optional; row mode needs nothing extra
+    np = None
+
 #  Regex patterns 
 
 RE_HTML_TAG = re.compile(r"<[^>]+>")
@@ -39,6 +61,48 @@ STATE_MAP = {
     "wyoming": "Wyoming",
 }
 
+#  Memoized normalizers 
+# Dates, states and county strings take a few hundred distinct values across
+# a whole run, so each raw string is normalized once and then served from a
+# bounded LRU cache. Hit rates are printed at the end of the run.
+
+NORMALIZER_CACHE_SIZE = 4096
+
+RE_ISO_DATE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+ISO = "%Y-%m-%d"
+MONTH_YEAR = "%B %Y"
+
+# Loose shape of a date string -> the strptime formats that can match it, in the
+# order they were tried before (full dates -> ISO, month-year -> 'September 2019')
+RE_DATE_SHAPE = re.compile(
+    r"^(?:(?P<slash>[\d ]+/[\d ]+/[\d ]+)"
+    r"|(?P<dash>[\d ]+-[\d ]+-[\d ]+)"
+    r"|(?P<mdy>[A-Za-z]+\s+[\d ]+,\s*[\d ]+)"
+    r"|(?P<dmy>[\d ]+-[A-Za-z]+-[\d ]+)"
+    r"|(?P<my>[A-Za-z]+\s+\d+)"
+    r"|(?P<ym>\d+\s+[A-Za-z]+))$"
+)
+DATE_FORMATS = {
+    "slash": [("%m/%d/%Y", ISO), ("%Y/%m/%d", ISO), ("%m/%d/%y", ISO)],
+    "dash": [("%m-%d-%Y", ISO), ("%m-%d-%y", ISO)],
+    "mdy": [("%B %d, %Y", ISO), ("%b %d, %Y", ISO)],
+    "dmy": [("%d-%b-%Y", ISO), ("%d-%B-%Y", ISO)],
+    "my": [("%B %Y", MONTH_YEAR), ("%b %Y", MONTH_YEAR)],
+    "ym": [("%Y %B", MONTH_YEAR), ("%Y %b", MONTH_YEAR)],
+}
+
+
+def cache_counts() -> dict:
+    """{normalizer: [hits, misses]} for the memoized normalizers in this process."""
+    return {name: [fn.cache_info().hits, fn.cache_info().misses]
+            for name, fn in (("date", _normalize_date), ("state", _normalize_state),
+                             ("county_state", _normalize_county_state))}
+
+
+def diff_counts(after: dict, before: dict) -> dict:
+    return {k: [after[k][0] - before[k][0], after[k][1] - before[k][1]] for k in after}
+
+
 #  Cleaning Functions 
 
 def clean_string(s: Any) -> Optional[str]:
@@ -103,6 +167,11 @@ def normalize_state(s: Any) -> Optional[str]:
     """Normalize state name to full name."""
     if s is None:
         return None
+    return _normalize_state(s if isinstance(s, str) else str(s))
+
+
+@lru_cache(maxsize=NORMALIZER_CACHE_SIZE)
+def _normalize_state(s: str) -> Optional[str]:
     s = clean_string(s)
     if s is None:
         return None
@@ -110,6 +179,24 @@ def normalize_state(s: Any) -> Optional[str]:
     return STATE_MAP.get(key, s)
 
 
+def normalize_county_state(v: Any) -> Optional[str]:
+    """'McKenzie County, ND' -> 'McKenzie County, North Dakota' (county kept, state normalized)."""
+    if v is None:
+        return None
+    return _normalize_county_state(v if isinstance(v, str) else str(v))
+
+
+@lru_cache(maxsize=NORMALIZER_CACHE_SIZE)
+def _normalize_county_state(v: str) -> Optional[str]:
+    cs = clean_string(v)
+    if cs and "," in cs:
+        parts = [p.strip() for p in cs.split(",", 1)]
+        county = parts[0]
+        state = normalize_state(parts[1])
+        return f"{county}, {state}" if state else county
+    return cs
+
+
 def fix_longitude(lon: Any) -> Any:
     """
     North Dakota longitudes should be negative (western hemisphere).
@@ -142,41 +229,32 @@ def fix_latitude(lat: Any) -> Any:
 
 
 def normalize_date(s: Any) -> Optional[str]:
-    """Try to parse and normalize a date string to YYYY-MM-DD."""
+    """Try to parse and normalize a date string to YYYY-MM-DD (month-year dates to 'Month YYYY')."""
     if s is None:
         return None
-    s = str(s).strip()
+    return _normalize_date(s if isinstance(s, str) else str(s))
+
+
+@lru_cache(maxsize=NORMALIZER_CACHE_SIZE)
+def _normalize_date(raw: str) -> Optional[str]:
+    s = raw.strip()
     if not s:
         return None
-    # Already in good format
     # If already ISO full date
-    if re.match(r"^\d{4}-\d{2}-\d{2}$", s):
+    if RE_ISO_DATE.match(s):
         return s
 
-    # Try full-date formats -> return ISO YYYY-MM-DD
-    full_formats = [
-        "%m/%d/%Y", "%m-%d-%Y", "%Y/%m/%d",
-        "%m/%d/%y", "%m-%d-%y",
-        "%B %d, %Y", "%b %d, %Y",
-        "%d-%b-%Y", "%d-%B-%Y",
-    ]
-    for fmt in full_formats:
-        try:
-            dt = datetime.strptime(s, fmt)
-            return dt.strftime("%Y-%m-%d")
-        except ValueError:
-            continue
-
-    # Try month-year formats and return as 'Month YYYY' (e.g. 'September 2019')
-    month_year_formats = ["%B %Y", "%b %Y", "%Y %B", "%Y %b"]
-    for fmt in month_year_formats:
+    # The shape of the string picks the only formats that could parse it, so
+    # strptime is not tried (and does not raise) for every format in turn
+    m = RE_DATE_SHAPE.match(s)
+    if m is None:
+        return s  # Return original if can't parse
+    for fmt, out in DATE_FORMATS[m.lastgroup]:
         try:
-            dt = datetime.strptime(s, fmt)
-            return dt.strftime("%B %Y")
+            return datetime.strptime(s, fmt).strftime(out)
         except ValueError:
             continue
-
-    return s  # Return original if can't parse
+    return s
 
 
 def to_int(v: Any) -> Optional[int]:
@@ -207,7 +285,22 @@ def to_float(v: Any) -> Optional[float]:
 
 #  Per-table Preprocessing 
 
-def preprocess_well(row: dict) -> dict:
+def coerce(row: dict, fields, numeric: bool = True):
+    """Apply the numeric converters of fields; numeric=False only places the raw values (columnar mode fills them)."""
+    for name, fn in fields:
+        row[name] = fn(row.get(name)) if numeric else row.get(name)
+
+
+WELL_NUMERIC = [("latitude", fix_latitude), ("longitude", fix_longitude)]
+STIM_NUMERIC = [
+    ("top_ft", to_int), ("bottom_ft", to_int), ("stimulation_stages", to_int),
+    ("volume", to_float), ("acid_pct", to_float), ("lbs_proppant", to_int),
+    ("max_treatment_pressure_psi", to_int), ("max_treatment_rate_bbl_min", to_float),
+]
+PROD_NUMERIC = [("oil_barrels", to_float), ("gas_mcf", to_float)]
+
+
+def preprocess_well(row: dict, numeric: bool = True) -> dict:
     """Clean a well_info record."""
     row["operator"] = clean_string(row.get("operator"))
     row["well_name"] = clean_well_name(row.get("well_name"))
@@ -215,14 +308,7 @@ def preprocess_well(row: dict) -> dict:
     row["enesco_job"] = clean_string(row.get("enesco_job"))
     row["job_type"] = clean_string(row.get("job_type"))
     # Normalize county_state: keep 'County' name and normalize state to full
-    cs = clean_string(row.get("county_state"))
-    if cs and "," in cs:
-        parts = [p.strip() for p in cs.split(",", 1)]
-        county = parts[0]
-        state = normalize_state(parts[1])
-        row["county_state"] = f"{county}, {state}" if state else county
-    else:
-        row["county_state"] = cs
+    row["county_state"] = normalize_county_state(row.get("county_state"))
     row["shl_location"] = clean_string(row.get("shl_location"))
     row["datum"] = clean_string(row.get("datum"))
     row["county"] = clean_string(row.get("county"))
@@ -232,18 +318,19 @@ def preprocess_well(row: dict) -> dict:
     row["state"] = normalize_state(row.get("state"))
 
     # Fix coordinates
-    row["latitude"] = fix_latitude(row.get("latitude"))
-    row["longitude"] = fix_longitude(row.get("longitude"))
+    coerce(row, WELL_NUMERIC, numeric)
 
     # Clean raw text fields (keep but clean)
     row["lat_raw"] = clean_ocr_text(row.get("lat_raw"))
     row["lon_raw"] = clean_ocr_text(row.get("lon_raw"))
-    row["raw_text"] = clean_ocr_text(row.get("raw_text"))
+    # raw_text now lives in the blob store (raw_text_sha); only legacy rows carry it inline
+    if "raw_text" in row:
+        row["raw_text"] = clean_ocr_text(row.get("raw_text"))
 
     return row
 
 
-def preprocess_stim(row: dict) -> dict:
+def preprocess_stim(row: dict, numeric: bool = True) -> dict:
     """Clean a stimulation_data record."""
     row["date_stimulated"] = normalize_date(row.get("date_stimulated"))
     row["stimulation_formation"] = clean_string(row.get("stimulation_formation"))
@@ -253,23 +340,18 @@ def preprocess_stim(row: dict) -> dict:
     row["api"] = clean_string(row.get("api"))
 
     # Ensure numeric fields
-    row["top_ft"] = to_int(row.get("top_ft"))
-    row["bottom_ft"] = to_int(row.get("bottom_ft"))
-    row["stimulation_stages"] = to_int(row.get("stimulation_stages"))
-    row["volume"] = to_float(row.get("volume"))
-    row["acid_pct"] = to_float(row.get("acid_pct"))
-    row["lbs_proppant"] = to_int(row.get("lbs_proppant"))
-    row["max_treatment_pressure_psi"] = to_int(row.get("max_treatment_pressure_psi"))
-    row["max_treatment_rate_bbl_min"] = to_float(row.get("max_treatment_rate_bbl_min"))
-
-    # Clean raw text
-    row["raw_text"] = clean_ocr_text(row.get("raw_text"))
-    row["raw_text_clean"] = clean_ocr_text(row.get("raw_text_clean"))
+    coerce(row, STIM_NUMERIC, numeric)
+
+    # Clean raw text (legacy rows only; new rows reference the blob store by hash)
+    if "raw_text" in row:
+        row["raw_text"] = clean_ocr_text(row.get("raw_text"))
+    if "raw_text_clean" in row:
+        row["raw_text_clean"] = clean_ocr_text(row.get("raw_text_clean"))
 
     return row
 
 
-def preprocess_production(row: dict) -> dict:
+def preprocess_production(row: dict, numeric: bool = True) -> dict:
     """Clean a production_data record."""
     row["api"] = clean_string(row.get("api"))
     row["well_name"] = clean_well_name(row.get("well_name"))
@@ -282,54 +364,273 @@ def preprocess_production(row: dict) -> dict:
     # New scraped fields
     row["operator"] = clean_string(row.get("operator"))
     # Normalize county_state similar to well preprocessing
-    cs = clean_string(row.get("county_state"))
-    if cs and "," in cs:
-        parts = [p.strip() for p in cs.split(",", 1)]
-        county = parts[0]
-        state = normalize_state(parts[1])
-        row["county_state"] = f"{county}, {state}" if state else county
-    else:
-        row["county_state"] = cs
+    row["county_state"] = normalize_county_state(row.get("county_state"))
 
     # Normalize month-year style production dates (keep as text like 'September 2019')
     row["first_production_date"] = normalize_date(row.get("first_production_date"))
     row["most_recent_production_date"] = normalize_date(row.get("most_recent_production_date"))
 
     # Ensure numeric
-    row["oil_barrels"] = to_float(row.get("oil_barrels"))
-    row["gas_mcf"] = to_float(row.get("gas_mcf"))
+    coerce(row, PROD_NUMERIC, numeric)
 
     return row
 
 
+#  Columnar mode 
+# Numeric columns are converted as whole NumPy arrays. Plain int / float values
+# (what JSON numbers load as) take the vectorized path; anything else (strings
+# like "1,234", None, bools) goes through the row converter, so the output is
+# identical to row mode.
+
+NUMERIC_FIELDS = {preprocess_well: WELL_NUMERIC, preprocess_stim: STIM_NUMERIC, preprocess_production: PROD_NUMERIC}
+INT64_LIMIT = float(2 ** 63)
+NAN = float("nan")
+NUMBER_TYPES = (int, float)
+
+
+def column_numbers(col: list):
+    """float64 array of col, NaN where the value is not a plain int / float (None, str, bool, NaN)."""
+    try:
+        return np.fromiter((v if type(v) in NUMBER_TYPES else NAN for v in col), dtype=np.float64, count=len(col))
+    except OverflowError:  # an int too big for a float: leave the column to the row converter
+        return np.full(len(col), NAN)
+
+
+def column_result(col: list, out: list, redo, row_fn) -> list:
+    """Entries flagged in redo (None, strings, edge cases) get the row converter's result."""
+    for i in np.flatnonzero(redo).tolist():
+        v = col[i]
+        out[i] = None if v is None else row_fn(v)  # every converter maps None to None
+    return out
+
+
+def col_to_float(col: list) -> list:
+    vals = column_numbers(col)
+    return column_result(col, vals.tolist(), np.isnan(vals), to_float)
+
+
+def col_to_int(col: list) -> list:
+    vals = column_numbers(col)
+    redo = ~(np.abs(vals) < INT64_LIMIT)  # NaN / inf / out of int64 range
+    ints = np.trunc(np.where(redo, 0.0, vals)).astype(np.int64)
+    return column_result(col, ints.tolist(), redo, to_int)
+
+
+def col_fix_latitude(col: list) -> list:
+    vals = column_numbers(col)
+    out = vals.tolist()
+    for i in np.flatnonzero((vals < -90) | (vals > 90)).tolist():
+        out[i] = None
+    return column_result(col, out, np.isnan(vals), fix_latitude)
+
+
+def col_fix_longitude(col: list) -> list:
+    vals = column_numbers(col)
+    flipped = np.where((vals >= 97) & (vals <= 110), -vals, vals)
+    return column_result(col, flipped.tolist(), np.isnan(vals), fix_longitude)
+
+
+COLUMN_OPS = {to_float: col_to_float, to_int: col_to_int, fix_latitude: col_fix_latitude,
+              fix_longitude: col_fix_longitude}
+
+
+def preprocess_columnar(rows: list, preprocess_fn) -> list:
+    """Clean a batch of rows: strings row by row, numeric fields column by column."""
+    for row in rows:
+        preprocess_fn(row, numeric=False)
+    for name, fn in NUMERIC_FIELDS[preprocess_fn]:
+        col = list(map(itemgetter(name), rows))
+        for row, v in zip(rows, COLUMN_OPS[fn](col)):
+            row[name] = v
+    return rows
+
+
+#  Version stamps 
+# Every cleaned row ends with {..., "_pp_version": N, "_pp_hash": "<hash>"}, the
+# hash taken over the cleaned row without the stamp. A row whose stamp matches
+# PP_VERSION and its own content is copied on the next run without being parsed;
+# rows added or rewritten since (a scraper merge, a hand edit) are cleaned again.
+
+PP_VERSION = 1  # bump whenever a change to the cleaning rules should re-clean every row
+STAMP_KEYS = ("_pp_version", "_pp_hash")
+RE_STAMP = re.compile(r'(?:, )?"_pp_version": (\d+), "_pp_hash": "([0-9a-f]+)"\}$')
+
+
+def row_hash(body: str) -> str:
+    return hashlib.blake2b(body.encode("utf-8"), digest_size=8).hexdigest()
+
+
+def stamped(row: dict) -> str:
+    """Cleaned row -> its JSON line (no newline) with the version stamp as the last keys."""
+    body = json.dumps(row, ensure_ascii=False)
+    sep = ", " if len(body) > 2 else ""
+    return f'{body[:-1]}{sep}"_pp_version": {PP_VERSION}, "_pp_hash": "{row_hash(body)}"}}'
+
+
+def is_clean(line: str) -> bool:
+    """True if line carries a current stamp whose hash matches the rest of the row."""
+    m = RE_STAMP.search(line)
+    return (m is not None and int(m.group(1)) == PP_VERSION
+            and row_hash(line[:m.start()] + "}") == m.group(2))
+
+
 #  File Processing 
 
-def process_jsonl(path: Path, preprocess_fn, label: str) -> int:
-    """Read a JSONL file, apply preprocessing, write back. Returns row count."""
-    if not path.exists():
-        print(f"  [{label}] SKIP — file not found: {path}")
-        return 0
+def has_stamps(path: Path) -> bool:
+    """True if any row of path carries a preprocess stamp (an earlier output, not an original)."""
+    if path.stat().st_size == 0:
+        return False
+    with path.open("rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+        return m.find(b'"_pp_version": ') != -1
+
 
-    # Backup original
+def backup(path: Path, mode: str) -> str:
+    """
+    Keep the original as path.bak. The cleaned file replaces path with a new
+    inode, so a hardlink is a snapshot of the original at no disk cost.
+    A path that already holds stamped rows is not an original: the existing
+    .bak (the raw rows of the first run) is kept and none is made from it.
+    Returns a note for the summary line.
+    """
+    if mode == "none":
+        return "none"
     bak = path.with_suffix(path.suffix + ".bak")
+    if has_stamps(path):
+        return f"{bak.name} kept" if bak.exists() else "none, input already cleaned"
+    if bak.exists():
+        bak.unlink()
+    if mode == "hardlink":
+        try:
+            os.link(path, bak)
+            return bak.name
+        except OSError:  # filesystem without hardlinks
+            pass
     shutil.copy2(path, bak)
+    return bak.name
 
-    rows = []
-    with path.open("r", encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if line:
-                rows.append(json.loads(line))
 
-    cleaned = [preprocess_fn(row) for row in rows]
+# normalizer cache counts reported back by --workers chunks
+worker_cache_counts = {k: [0, 0] for k in ("date", "state", "county_state")}
 
-    # Write back
-    with path.open("w", encoding="utf-8") as f:
-        for row in cleaned:
-            f.write(json.dumps(row, ensure_ascii=False) + "\n")
 
-    print(f"  [{label}] Processed {len(cleaned)} rows (backup: {bak.name})")
-    return len(cleaned)
+def clean_lines(lines, preprocess_fn, dst, columnar_rows: int = 0, force: bool = False):
+    """
+    Clean JSONL text lines into dst (columnar_rows > 0: in columnar batches).
+    Lines already stamped by this PP_VERSION are copied as they are unless force.
+    Returns (row count, rows skipped).
+    """
+    n = skipped = 0
+    pending = []  # columnar: skipped lines (str) and rows to clean (dict), in input order
+
+    def flush():
+        rows = [x for x in pending if isinstance(x, dict)]
+        if rows:
+            preprocess_columnar(rows, preprocess_fn)
+        for x in pending:
+            dst.write(x + "\n" if isinstance(x, str) else stamped(x) + "\n")
+        pending.clear()
+
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        n += 1
+        if not force and is_clean(line):
+            skipped += 1
+            if not columnar_rows:
+                dst.write(line + "\n")
+                continue
+            pending.append(line)
+        else:
+            row = json.loads(line)
+            for k in STAMP_KEYS:
+                row.pop(k, None)
+            if not columnar_rows:
+                dst.write(stamped(preprocess_fn(row)) + "\n")
+                continue
+            pending.append(row)
+        if len(pending) >= columnar_rows:
+            flush()
+    if pending:
+        flush()
+    return n, skipped
+
+
+def process_chunk(path: Path, start: int, end: int, preprocess_fn, part: Path, columnar_rows: int = 0,
+                  force: bool = False):
+    """Worker: clean the lines in [start, end) of path into part; returns (rows, skipped, cache counts)."""
+    def lines():
+        with path.open("rb") as src:
+            src.seek(start)
+            while src.tell() < end:
+                line = src.readline()
+                if not line:
+                    break
+                yield line.decode("utf-8")
+
+    before = cache_counts()
+    with part.open("w", encoding="utf-8") as dst:
+        n, skipped = clean_lines(lines(), preprocess_fn, dst, columnar_rows, force)
+    return n, skipped, diff_counts(cache_counts(), before)
+
+
+def process_jsonl(path: Path, preprocess_fn, label: str, backup_mode: str = "hardlink", pool=None,
+                  chunks: int = 1, columnar_rows: int = 0, force: bool = False) -> tuple:
+    """
+    Stream a JSONL file through preprocess_fn into a temp file, then atomically replace it.
+    With a process pool, byte-range chunks are cleaned in parallel into part files that are
+    concatenated in order (same output as the serial run). If every row was already clean,
+    the file and its .bak are left untouched. Returns (row count, rows skipped).
+    """
+    if not path.exists():
+        print(f"  [{label}] SKIP — file not found: {path}")
+        return 0, 0
+
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    ranges = chunk_ranges(path, chunks) if pool is not None and chunks > 1 else []
+    parts = [tmp.with_suffix(f".part{k}") for k in range(len(ranges))]
+    n = skipped = 0
+    try:
+        if len(ranges) > 1:
+            futures = [pool.submit(process_chunk, path, a, b, preprocess_fn, part, columnar_rows, force)
+                       for (a, b), part in zip(ranges, parts)]
+            for f in futures:
+                rows, rows_skipped, counts = f.result()
+                n += rows
+                skipped += rows_skipped
+                for k, (hits, misses) in counts.items():
+                    worker_cache_counts[k][0] += hits
+                    worker_cache_counts[k][1] += misses
+            with tmp.open("wb") as dst:
+                for part in parts:
+                    with part.open("rb") as src:
+                        shutil.copyfileobj(src, dst, 1 << 20)
+                    part.unlink()
+                dst.flush()
+                os.fsync(dst.fileno())
+        else:
+            with path.open("r", encoding="utf-8") as src, tmp.open("w", encoding="utf-8") as dst:
+                n, skipped = clean_lines(src, preprocess_fn, dst, columnar_rows, force)
+                dst.flush()
+                os.fsync(dst.fileno())
+    except BaseException:
+        for p in parts + [tmp]:
+            p.unlink(missing_ok=True)
+        raise
+
+    if skipped == n:
+        # nothing changed: keep the file, and the .bak that still holds the raw rows
+        tmp.unlink()
+        print(f"  [{label}] {n} rows already clean (version {PP_VERSION}), file unchanged")
+        return n, skipped
+
+    bak = backup(path, backup_mode)
+    os.replace(tmp, path)
+
+    how = f", {len(ranges)} chunks" if len(ranges) > 1 else ""
+    print(f"  [{label}] Processed {n} rows{how}: {n - skipped} cleaned, {skipped} already clean "
+          f"(backup: {bak})")
+    return n, skipped
 
 
 #  Main 
@@ -337,6 +638,16 @@ def process_jsonl(path: Path, preprocess_fn, label: str) -> int:
 def main():
     ap = argparse.ArgumentParser(description="Preprocess JSONL data before MySQL import.")
     ap.add_argument("--data_dir", required=True, help="Directory containing JSONL files")
+    ap.add_argument("--backup", choices=("hardlink", "copy", "none"), default="hardlink",
+                    help="Keep originals as *.jsonl.bak: hardlink (no extra space), copy, or none")
+    ap.add_argument("--workers", type=int, default=1,
+                    help="Clean byte-range chunks of each file in N processes (1 = serial)")
+    ap.add_argument("--chunk_mb", type=float, default=8.0, help="workers: target chunk size")
+    ap.add_argument("--columnar", action="store_true",
+                    help="Convert numeric columns with NumPy in batches of --columnar_rows rows")
+    ap.add_argument("--columnar_rows", type=int, default=50000, help="columnar: rows per batch")
+    ap.add_argument("--force", action="store_true",
+                    help="Re-clean every row, even rows already stamped by this preprocess version")
     args = ap.parse_args()
 
     data_dir = Path(args.data_dir)
@@ -344,14 +655,44 @@ def main():
         print(f"ERROR: {data_dir} not found")
         return
 
-    print(f"Preprocessing data in: {data_dir}\n")
+    columnar_rows = 0
+    if args.columnar:
+        if np is None:
+            print("NOTE: --columnar needs numpy (pip install numpy); using row mode.")
+        else:
+            columnar_rows = max(1, args.columnar_rows)
 
-    total = 0
-    total += process_jsonl(data_dir / "well_info.jsonl", preprocess_well, "well_info")
-    total += process_jsonl(data_dir / "stimulation_data.jsonl", preprocess_stim, "stimulation_data")
-    total += process_jsonl(data_dir / "production_data.jsonl", preprocess_production, "production_data")
+    print(f"Preprocessing data in: {data_dir}\n")
 
-    print(f"\nDone. Total rows preprocessed: {total}")
+    files = [
+        (data_dir / "well_info.jsonl", preprocess_well, "well_info"),
+        (data_dir / "stimulation_data.jsonl", preprocess_stim, "stimulation_data"),
+        (data_dir / "production_data.jsonl", preprocess_production, "production_data"),
+    ]
+    pool = ProcessPoolExecutor(max_workers=args.workers) if args.workers > 1 else None
+    total = total_skipped = 0
+    try:
+        for path, fn, label in files:
+            # enough chunks to keep every worker busy, none much bigger than --chunk_mb
+            size = path.stat().st_size if path.exists() else 0
+            chunks = max(args.workers, int(size / (args.chunk_mb * 1024 * 1024)) + 1)
+            n, skipped = process_jsonl(path, fn, label, args.backup, pool, chunks, columnar_rows, args.force)
+            total += n
+            total_skipped += skipped
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    print(f"\nDone. Total rows preprocessed: {total} ({total - total_skipped} cleaned, "
+          f"{total_skipped} already clean)")
+    counts = cache_counts()
+    parts = []
+    for k, (hits, misses) in counts.items():
+        hits, misses = hits + worker_cache_counts[k][0], misses + worker_cache_counts[k][1]
+        if hits + misses:
+            parts.append(f"{k} {hits / (hits + misses):.1%} of {hits + misses} ({misses} parsed)")
+    if parts:
+        print(f"Normalizer cache hits: {'  '.join(parts)}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,359 @@
+"""
+Typed row records shared by every stage of the pipeline.
+
+WellInfo / Stimulation (filter_and_parse.py -> preprocess.py -> load_to_mysql.py)
+and Production (scrape_production.py -> preprocess.py -> load_to_mysql.py) are
+defined once here from a field list. With msgspec installed they are
+msgspec Structs: compact, slot-based, and encoded / decoded straight to and
+from JSON bytes with their field types checked. Without it they fall back to
+plain __slots__ classes over the json module (same API, unknown keys are
+still rejected, types are not checked).
+
+Records keep the dict access the stages already use (row["api"],
+row.get(...), row[k] = v, update, pop, iterating the keys), so a stage
+only changes where rows are created, written and read. Setting or decoding
+a key that is not a field raises, so schema drift (a field renamed in one
+stage and not in the next) fails at the first row instead of loading NULLs.
+
+Fields marked OPTIONAL are only written when set: legacy inline raw text,
+the preprocess version stamp, and bookkeeping that older files lack.
+
+iter_records reads a JSONL file, or one of the line-aligned byte ranges
+chunk_ranges cuts it into for preprocess.py / load_to_mysql.py workers
+(optionally keeping given byte spans whole).
+"""
+
+import json
+from bisect import bisect_right
+from pathlib import Path
+from typing import Any, List, Optional, Union
+
+try:
+    import msgspec
+except ImportError:  # records work without it, just slower and untyped
+    msgspec = None
+
+if msgspec is not None:
+    UNSET = msgspec.UNSET
+    UnsetType = msgspec.UnsetType
+else:
+    class UnsetType:
+        """Marker for an OPTIONAL field that was never set (left out of the JSON)."""
+        __slots__ = ()
+
+        def __repr__(self):
+            return "UNSET"
+
+        def __bool__(self):
+            return False
+
+    UNSET = UnsetType()
+
+#  Field types
+
+TEXT = Optional[str]
+NUM = Union[int, float, str, None]       # numbers; raw parser output may still carry "1,234"
+FLAG = Union[bool, str, None]            # older files hold "True"/"False" strings
+PAGES = Union[List[Any], str, None]      # page lists; older files hold them as strings
+OPTIONAL = "optional"
+
+# (name, type[, OPTIONAL]); JSON key order follows this order
+WELL_FIELDS = [
+    ("primary_id", TEXT, OPTIONAL),
+    ("source_pdf", TEXT, OPTIONAL),
+    ("relative_path", TEXT, OPTIONAL),
+    ("operator", TEXT),
+    ("well_name", TEXT),
+    ("api", TEXT),
+    ("enesco_job", TEXT),
+    ("job_type", TEXT),
+    ("county_state", TEXT),
+    ("shl_location", TEXT),
+    ("latitude", NUM),
+    ("longitude", NUM),
+    ("datum", TEXT),
+    ("ndic_file_no", TEXT),
+    ("county", TEXT),
+    ("state", TEXT),
+    ("address", TEXT),
+    ("lat_raw", TEXT),
+    ("lon_raw", TEXT),
+    ("latlon_page", NUM),
+    ("latlon_suspect", FLAG),
+    ("fig1_pages", PAGES),
+    ("raw_text_sha", TEXT, OPTIONAL),
+    ("raw_text", TEXT, OPTIONAL),
+]
+
+STIM_FIELDS = [
+    ("primary_id", TEXT, OPTIONAL),
+    ("source_pdf", TEXT, OPTIONAL),
+    ("relative_path", TEXT, OPTIONAL),
+    ("operator", TEXT, OPTIONAL),
+    ("well_name", TEXT, OPTIONAL),
+    ("api", TEXT),
+    ("enesco_job", TEXT, OPTIONAL),
+    ("job_type", TEXT, OPTIONAL),
+    ("county_state", TEXT, OPTIONAL),
+    ("shl_location", TEXT, OPTIONAL),
+    ("latitude", NUM, OPTIONAL),
+    ("longitude", NUM, OPTIONAL),
+    ("datum", TEXT, OPTIONAL),
+    ("ndic_file_no", TEXT),
+    ("stim_present", FLAG),
+    ("stim_has_fields", FLAG),
+    ("date_stimulated", TEXT),
+    ("stimulation_formation", TEXT),
+    ("top_ft", NUM),
+    ("bottom_ft", NUM),
+    ("stimulation_stages", NUM),
+    ("volume", NUM),
+    ("volume_units", TEXT),
+    ("treatment_type", TEXT),
+    ("acid_pct", NUM),
+    ("lbs_proppant", NUM),
+    ("max_treatment_pressure_psi", NUM),
+    ("max_treatment_rate_bbl_min", NUM),
+    ("details", TEXT),
+    ("fig2_pages", PAGES),
+    ("raw_text_sha", TEXT, OPTIONAL),
+    ("raw_text_clean_sha", TEXT, OPTIONAL),
+    ("raw_text", TEXT, OPTIONAL),
+    ("raw_text_clean", TEXT, OPTIONAL),
+]
+
+PROD_FIELDS = [
+    ("api", TEXT),
+    ("well_name", TEXT),
+    ("well_status", TEXT),
+    ("well_type", TEXT),
+    ("closest_city", TEXT),
+    ("oil_barrels", NUM),
+    ("gas_mcf", NUM),
+    ("operator", TEXT),
+    ("county_state", TEXT),
+    ("first_production_date", TEXT),
+    ("most_recent_production_date", TEXT),
+    ("drillingedge_url", TEXT),
+    ("scrape_success", FLAG),
+    ("scraped_at", TEXT, OPTIONAL),
+    ("field_name", TEXT, OPTIONAL),  # written by older scrapers, never loaded
+]
+
+# preprocess.py stamp, always the last keys of a cleaned row
+STAMP_FIELDS = [("pp_version", Optional[int], OPTIONAL), ("pp_hash", TEXT, OPTIONAL)]
+RENAME = {"pp_version": "_pp_version", "pp_hash": "_pp_hash"}
+
+
+#  Dict-style access
+
+def _get(self, key, default=None):
+    v = getattr(self, key, UNSET) if key in self.__field_set__ else UNSET
+    return default if v is UNSET else v
+
+
+def _getitem(self, key):
+    v = _get(self, key, UNSET)
+    if v is UNSET:
+        raise KeyError(key)
+    return v
+
+
+def _setitem(self, key, value):
+    if key not in self.__field_set__:
+        raise KeyError(f"{type(self).__name__} has no field {key!r}")
+    setattr(self, key, value)
+
+
+def _contains(self, key):
+    return _get(self, key, UNSET) is not UNSET
+
+
+def _keys(self):
+    return [k for k in self.__struct_fields__ if getattr(self, k) is not UNSET]
+
+
+def _iter(self):
+    return iter(_keys(self))
+
+
+def _items(self):
+    return [(k, v) for k in self.__struct_fields__ if (v := getattr(self, k)) is not UNSET]
+
+
+def _update(self, other=(), **kw):
+    if other is self:
+        return
+    pairs = other.items() if hasattr(other, "items") else other
+    for k, v in pairs:
+        _setitem(self, k, v)
+    for k, v in kw.items():
+        _setitem(self, k, v)
+
+
+def _pop(self, key, default=None):
+    v = _get(self, key, UNSET)
+    if key in self.__field_set__:
+        setattr(self, key, UNSET if key in self.__optional__ else None)
+    return default if v is UNSET else v
+
+
+def _to_dict(self) -> dict:
+    """Plain dict of the set fields (attribute names), e.g. for named SQL parameters."""
+    return dict(_items(self))
+
+
+NAMESPACE = {
+    "get": _get, "__getitem__": _getitem, "__setitem__": _setitem, "__contains__": _contains,
+    "__iter__": _iter, "keys": _keys, "items": _items, "update": _update, "pop": _pop, "to_dict": _to_dict,
+}
+
+
+#  Record classes
+
+def _slots_init(self, **kw):
+    for name in self.__struct_fields__:
+        setattr(self, name, kw.pop(name, self.__defaults__[name]))
+    if kw:
+        raise TypeError(f"{type(self).__name__} has no field(s) {', '.join(sorted(kw))}")
+
+
+def _slots_eq(self, other):
+    return type(self) is type(other) and _items(self) == _items(other)
+
+
+def _slots_repr(self):
+    return f"{type(self).__name__}({', '.join(f'{k}={v!r}' for k, v in _items(self))})"
+
+
+def _slots_reduce(self):
+    return _rebuild, (type(self).__name__, _to_dict(self))
+
+
+def _rebuild(name: str, values: dict):
+    return RECORD_TYPES[name](**values)
+
+
+def define(name: str, fields: list):
+    spec = fields + STAMP_FIELDS
+    optional = frozenset(f[0] for f in spec if len(f) > 2)
+    ns = dict(NAMESPACE, __field_set__=frozenset(f[0] for f in spec), __optional__=optional)
+    if msgspec is not None:
+        struct_fields = [(f[0], Union[UnsetType, f[1]] if f[0] in optional else f[1],
+                          UNSET if f[0] in optional else None) for f in spec]
+        return msgspec.defstruct(name, struct_fields, namespace=ns, module=__name__, rename=RENAME,
+                                 forbid_unknown_fields=True)
+    names = tuple(f[0] for f in spec)
+    ns.update(
+        __slots__=names, __struct_fields__=names,
+        __struct_encode_fields__=tuple(RENAME.get(n, n) for n in names),
+        __defaults__={n: UNSET if n in optional else None for n in names},
+        __init__=_slots_init, __eq__=_slots_eq, __repr__=_slots_repr, __reduce__=_slots_reduce,
+        __module__=__name__,
+    )
+    return type(name, (), ns)
+
+
+WellInfo = define("WellInfo", WELL_FIELDS)
+Stimulation = define("Stimulation", STIM_FIELDS)
+Production = define("Production", PROD_FIELDS)
+RECORD_TYPES = {cls.__name__: cls for cls in (WellInfo, Stimulation, Production)}
+
+
+#  JSON
+
+if msgspec is not None:
+    _encoder = msgspec.json.Encoder()
+    _decoders = {cls: msgspec.json.Decoder(cls) for cls in RECORD_TYPES.values()}
+    DecodeError = msgspec.DecodeError  # ValueError subclass; ValidationError (bad type / unknown key) is one too
+else:
+    DecodeError = ValueError
+
+
+def is_record(row) -> bool:
+    return type(row) in _CLASSES
+
+
+_CLASSES = frozenset(RECORD_TYPES.values())
+
+
+def encode(row) -> str:
+    """One JSONL line (no newline) for a record, or for a plain dict."""
+    if not is_record(row):
+        return json.dumps(row, ensure_ascii=False)
+    if msgspec is not None:
+        return _encoder.encode(row).decode("utf-8")
+    return json.dumps({RENAME.get(k, k): v for k, v in _items(row)}, ensure_ascii=False)
+
+
+def decode(line, cls):
+    """JSON line (str or bytes) -> cls record; DecodeError on bad JSON, a wrong type or an unknown key."""
+    if msgspec is not None:
+        return _decoders[cls].decode(line)
+    return from_dict(json.loads(line), cls)
+
+
+def from_dict(row: dict, cls):
+    """Plain dict (JSON keys) -> cls record; DecodeError on an unknown key."""
+    inverse = {v: k for k, v in RENAME.items()}
+    values = {inverse.get(k, k): v for k, v in row.items()}
+    unknown = set(values) - cls.__field_set__
+    if unknown:
+        raise DecodeError(f"{cls.__name__}: unknown field(s) {', '.join(sorted(unknown))}")
+    return cls(**values)
+
+
+def iter_records(path: Path, cls, start: int = 0, end: int = None):
+    """
+    (line number, record) for every non-empty line of a JSONL file, or of the
+    byte range [start, end) on line boundaries (line numbers then count from the range start).
+    """
+    with Path(path).open("rb") as f:
+        f.seek(start)
+        line_no = 0
+        while end is None or f.tell() < end:
+            line = f.readline()
+            if not line:
+                break
+            line_no += 1
+            if not line.strip():
+                continue
+            try:
+                yield line_no, decode(line, cls)
+            except DecodeError as e:
+                raise RuntimeError(f"{cls.__name__} decode error in {path} at line {line_no}: {e}") from e
+
+
+def chunk_ranges(path: Path, n_chunks: int, keep: list = ()) -> list:
+    """
+    Split path into about n_chunks (start, end) byte ranges that begin and end on
+    line boundaries. No boundary falls inside one of the keep (start, end) spans,
+    so each of them ends up whole in one range.
+    """
+    spans = []
+    for s, e in sorted(keep):
+        if spans and s < spans[-1][1]:
+            spans[-1][1] = max(spans[-1][1], e)
+        else:
+            spans.append([s, e])
+    span_starts = [s for s, _ in spans]
+    size = path.stat().st_size
+    bounds = [0]
+    with path.open("rb") as f:
+        for k in range(1, n_chunks):
+            pos = size * k // n_chunks
+            if pos >= size:
+                break
+            if pos < bounds[-1]:
+                continue  # already past it (a long line or a kept span)
+            f.seek(pos)
+            f.readline()  # move to the start of the next line
+            pos = f.tell()
+            i = bisect_right(span_starts, pos) - 1
+            if i >= 0 and spans[i][0] < pos < spans[i][1]:
+                pos = spans[i][1]  # past the end of the span it would cut
+            if bounds[-1] < pos < size:
+                bounds.append(pos)
+    if bounds[-1] < size:
+        bounds.append(size)
+    return list(zip(bounds, bounds[1:]))
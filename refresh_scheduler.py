@@ -0,0 +1,150 @@
+"""
+Staleness-driven refresh planning for scrape_production.py (--refresh).
+
+Each existing production_data.jsonl row gets a refresh interval from its
+well_status and most_recent_production_date:
+
+    never scraped / last scrape failed    due now
+    producing recently (--recent_months)  --refresh_active_days
+    producing, but not recently           --refresh_idle_days
+    other / unknown status                --refresh_other_days
+    plugged / abandoned / dry             --refresh_pa_days (0 = never)
+
+Due wells are ranked by how overdue they are (age / interval) and taken in
+that order until the per-run request budget is spent. Scraped rows are then
+merged back into the output file by API# (atomic replace, original order kept).
+"""
+
+import json
+import os
+import re
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+RE_PA = re.compile(r"plugged|abandon|\bp\s*&\s*a\b|\bpa\b|dry", re.I)
+RE_ACTIVE = re.compile(r"\bactive\b|producing", re.I)
+
+DATE_FORMATS = ["%Y-%m-%d", "%B %Y", "%b %Y", "%m/%d/%Y", "%Y %B", "%Y %b"]
+
+
+def now_stamp() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+def parse_when(s) -> Optional[datetime]:
+    """scraped_at / production date text -> aware datetime (UTC), or None."""
+    if not s:
+        return None
+    s = str(s).strip()
+    try:
+        dt = datetime.fromisoformat(s)
+        return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+    except ValueError:
+        pass
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(s, fmt).replace(tzinfo=timezone.utc)
+        except ValueError:
+            continue
+    return None
+
+
+def refresh_interval(row: dict, now: datetime, args) -> Optional[float]:
+    """Days between scrapes for this row; 0 = due now, None = never refresh."""
+    if not row.get("scrape_success"):
+        return 0.0
+    status = row.get("well_status") or ""
+    if RE_PA.search(status):
+        return float(args.refresh_pa_days) if args.refresh_pa_days > 0 else None
+    if RE_ACTIVE.search(status):
+        last = parse_when(row.get("most_recent_production_date"))
+        if last is not None and (now - last).days <= args.recent_months * 31:
+            return float(args.refresh_active_days)
+        return float(args.refresh_idle_days)
+    return float(args.refresh_other_days)
+
+
+def plan_refresh(wells, rows: dict, uses_map, args, retry=None):
+    """
+    wells: input wells [(input index, well), ...]; rows: existing output rows by API#.
+    uses_map(api) -> True if the detail URL is known (1 request instead of 2).
+    retry: optional RetryQueue; wells that recently failed wait out their backoff,
+    and failed wells past the attempt cap are not scheduled again.
+    Returns (todo in input order, summary counts).
+    """
+    now = datetime.now(timezone.utc)
+    ranked = []
+    counts = {"new": 0, "due": 0, "fresh": 0, "never": 0, "backoff": 0}
+    for i, well in wells:
+        api = well.get("api")
+        row = rows.get(api)
+        if row is None:
+            counts["new"] += 1
+            ranked.append((float("inf"), i, well))
+            continue
+        if retry is not None and api in retry.entries and not retry.is_due(api):
+            if not retry.gave_up(api):
+                counts["backoff"] += 1
+                continue
+            if not row.get("scrape_success"):
+                counts["never"] += 1
+                continue
+        days = refresh_interval(row, now, args)
+        if days is None:
+            counts["never"] += 1
+            continue
+        scraped = parse_when(row.get("scraped_at"))
+        age = (now - scraped).total_seconds() / 86400 if scraped else float("inf")
+        if days > 0 and age < days:
+            counts["fresh"] += 1
+            continue
+        counts["due"] += 1
+        ranked.append((age / days if days > 0 else float("inf"), i, well))
+
+    ranked.sort(key=lambda t: (-t[0], t[1]))
+    todo, spent = [], 0
+    for _, i, well in ranked:
+        cost = 1 if uses_map(well.get("api")) else 2
+        if args.budget > 0 and spent + cost > args.budget:
+            break
+        spent += cost
+        todo.append((i, well))
+    counts["selected"] = len(todo)
+    counts["requests"] = spent
+    todo.sort(key=lambda t: t[0])
+    return todo, counts
+
+
+def merge_rows(path: Path, existing: list, updates: list) -> dict:
+    """
+    Merge refreshed rows into path by API#: successful rows replace the old
+    record in place, new wells are appended, and a failed refresh leaves a
+    previously successful record untouched.
+    """
+    by_api = {u["api"]: u for u in updates if u.get("api")}
+    out, seen = [], set()
+    counts = {"updated": 0, "kept": 0, "added": 0}
+    for row in existing:
+        api = row.get("api")
+        new = by_api.get(api)
+        seen.add(api)
+        if new is None:
+            out.append(row)
+        elif new.get("scrape_success") or not row.get("scrape_success"):
+            out.append(new)
+            counts["updated"] += 1
+        else:
+            out.append(row)
+            counts["kept"] += 1
+    for api, new in by_api.items():
+        if api not in seen:
+            out.append(new)
+            counts["added"] += 1
+
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with tmp.open("w", encoding="utf-8") as f:
+        for row in out:
+            f.write(json.dumps(row, ensure_ascii=False) + "\n")
+    os.replace(tmp, path)
+    return counts
@@ -0,0 +1,76 @@
+"""
+Persistent retry queue for wells that failed to scrape (--retry_queue).
+
+Each failed API# is kept with its attempt count, the time of the last
+failure and the time it may be retried (exponential backoff: base, 2x base,
+4x base, ...). After max_attempts failures a well is given up on and no
+longer scheduled. A successful scrape removes the entry. Saved as JSON with
+an atomic replace.
+"""
+
+import json
+import os
+import time
+from pathlib import Path
+
+
+class RetryQueue:
+    def __init__(self, path: Path, base_delay: float = 600.0, max_attempts: int = 5):
+        self.path = Path(path)
+        self.base_delay = base_delay
+        self.max_attempts = max_attempts
+        self.entries: dict[str, dict] = {}
+        if self.path.exists():
+            self.entries = json.loads(self.path.read_text(encoding="utf-8"))
+
+    def fail(self, api: str):
+        now = time.time()
+        e = self.entries.setdefault(api, {"attempts": 0})
+        e["attempts"] += 1
+        e["last_failed"] = now
+        e["next_at"] = now + self.base_delay * 2 ** (e["attempts"] - 1)
+
+    def succeed(self, api: str):
+        self.entries.pop(api, None)
+
+    def gave_up(self, api: str) -> bool:
+        e = self.entries.get(api)
+        return e is not None and e["attempts"] >= self.max_attempts
+
+    def is_due(self, api: str, now: float = None) -> bool:
+        """True if api is queued, not given up on, and its backoff has passed."""
+        e = self.entries.get(api)
+        if e is None or e["attempts"] >= self.max_attempts:
+            return False
+        return (now or time.time()) >= e["next_at"]
+
+    def record(self, rows) -> tuple[int, int]:
+        """Update from the rows of a run; returns (retries queued, cleared)."""
+        queued = cleared = 0
+        for row in rows:
+            api = row.get("api")
+            if not api:
+                continue
+            if row.get("scrape_success"):
+                cleared += api in self.entries
+                self.succeed(api)
+            else:
+                self.fail(api)
+                queued += 1
+        return queued, cleared
+
+    def counts(self) -> dict:
+        now = time.time()
+        out = {"due": 0, "waiting": 0, "gave_up": 0}
+        for api, e in self.entries.items():
+            if e["attempts"] >= self.max_attempts:
+                out["gave_up"] += 1
+            else:
+                out["due" if now >= e["next_at"] else "waiting"] += 1
+        return out
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        tmp.write_text(json.dumps(self.entries, indent=1, sort_keys=True), encoding="utf-8")
+        os.replace(tmp, self.path)
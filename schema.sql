@@ -29,7 +29,9 @@ CREATE TABLE well_info (
     latlon_suspect BOOLEAN,
 
     fig1_pages JSON,
-    raw_text TEXT,
+    raw_text_sha CHAR(64),
+
+    row_hash CHAR(32),          -- content hash of the loaded row (load_to_mysql.py --delta)
 
     PRIMARY KEY (api)
 );
@@ -59,8 +61,10 @@ CREATE TABLE stimulation_data (
 
     ndic_file_no VARCHAR(20),
     fig2_pages JSON,
-    raw_text TEXT,
-    raw_text_clean TEXT,
+    raw_text_sha CHAR(64),
+    raw_text_clean_sha CHAR(64),
+
+    row_hash CHAR(32),
 
     PRIMARY KEY (api),
     CONSTRAINT fk_stim_api
@@ -87,9 +91,21 @@ CREATE TABLE production_data (
     drillingedge_url TEXT,
     scrape_success BOOLEAN,
 
+    row_hash CHAR(32),
+
     PRIMARY KEY (api),
     CONSTRAINT fk_prod_api
         FOREIGN KEY (api)
         REFERENCES well_info(api)
         ON DELETE CASCADE
 );
+
+-- =========================
+-- Table: text_blobs (raw OCR text, content-addressed)
+-- =========================
+CREATE TABLE text_blobs (
+    sha CHAR(64) NOT NULL,
+    body MEDIUMBLOB NOT NULL,   -- zlib-compressed UTF-8 text
+
+    PRIMARY KEY (sha)
+);
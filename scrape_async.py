@@ -0,0 +1,162 @@
+"""
+Asyncio engine for scrape_production.py (--engine async).
+
+Keeps up to --concurrency wells in flight. Every HTTP request first takes a
+token from a per-host token bucket (--rate requests/sec, --burst), so pacing
+no longer depends on fixed sleeps. Blocking requests run in worker threads,
+detail pages are parsed in threads or a --parse_workers process pool; pages
+that need JavaScript fall back to one shared Chrome, used by one well at a time.
+
+Rows are written in input order (a reorder buffer holds finished wells until
+all earlier ones are written), so --resume sees the same prefix-of-input
+output as the sequential engines.
+"""
+
+import asyncio
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from jsonl_journal import JsonlJournal
+from politeness import AdaptivePacer, HostRateLimiter
+from scrape_production import (
+    WellScraper, fetch_page, find_well_href, is_detail_page, link_is_stale,
+    make_session, new_row, parse_fetched, safe_name, search_url, timed,
+)
+
+
+class AsyncScraper:
+    def __init__(self, limiter, concurrency: int, base_url: str,
+                 delay: float, headless: bool, cache=None, parse_pool=None, url_map=None, lean: bool = False):
+        self.limiter = limiter  # HostRateLimiter, or AdaptivePacer (--adaptive) which also sees outcomes
+        self.pacer = limiter if isinstance(limiter, AdaptivePacer) else None
+        self.parse_pool = parse_pool  # ProcessPoolExecutor for detail parsing, or None (threads)
+        self.base_url = base_url
+        self.cache = cache
+        self.url_map = url_map  # optional DetailUrlMap shared with the writer
+        self.session = make_session(pool_size=concurrency, status_retries=self.pacer is None)
+        # Chrome fallback for JS-only pages: one browser, one well at a time
+        self.browser = WellScraper("selenium", delay, headless, base_url, cache=cache, lean=lean)
+        self.browser_lock = asyncio.Lock()
+        self.browser_fallbacks = 0
+
+    async def get(self, url: str, usable):
+        """Cached or freshly fetched HTML; only pages passing usable(html) are cached."""
+        return (await self.get_status(url, usable))[1]
+
+    async def get_status(self, url: str, usable) -> tuple:
+        """(HTTP status, html) like get; a cache hit counts as 200, a network error / timeout as None."""
+        if self.cache is not None:
+            html = await asyncio.to_thread(self.cache.get, url)
+            if html is not None:
+                return 200, html
+        for _ in range(3 if self.pacer is not None else 1):
+            await self.limiter.acquire(url)
+            status, html = await asyncio.to_thread(fetch_page, self.session, url, 15.0, self.pacer)
+            # --adaptive: retry a throttled / failed request once the pacer has backed off
+            if html is not None or self.pacer is None or not self.pacer.backed_off:
+                break
+        if self.cache is not None and html and usable(html):
+            await asyncio.to_thread(self.cache.put, url, html)
+        return status, html
+
+    async def in_browser(self, fn, *args):
+        self.browser_fallbacks += 1
+        async with self.browser_lock:
+            await self.limiter.acquire(self.base_url)
+            return await asyncio.to_thread(fn, *args)
+
+    async def scrape(self, row: dict) -> str:
+        api = row["api"]
+        detail_url = self.url_map.get(api) if self.url_map is not None else None
+        if detail_url:
+            status, html = await self.get_status(detail_url, is_detail_page)
+            if html and is_detail_page(html):
+                return await self.parse(row, detail_url, html)
+            if link_is_stale(status, html):
+                self.url_map.invalidate(api)  # 404 / moved: search again
+
+        html = await self.get(search_url(api, self.base_url), lambda h: "<table" in h)
+        if html and "<table" in html:
+            detail_url = await asyncio.to_thread(find_well_href, html, api, self.base_url)
+        else:
+            detail_url = await self.in_browser(self.browser.find_detail_url, api)
+        if not detail_url:
+            return "FAIL (no link in results)"
+
+        html = await self.get(detail_url, is_detail_page)
+        if not (html and is_detail_page(html)):
+            html = await self.in_browser(self.browser.load_detail, detail_url)
+        if self.url_map is not None and is_detail_page(html):
+            self.url_map.set(api, detail_url)
+        return await self.parse(row, detail_url, html)
+
+    async def parse(self, row: dict, detail_url: str, html: str) -> str:
+        loop = asyncio.get_running_loop()
+        parsed, msg = await loop.run_in_executor(self.parse_pool, parse_fetched, row, detail_url, html)
+        row.update(parsed)
+        return msg
+
+    def close(self):
+        self.browser.quit()
+        self.session.close()
+
+
+async def _run(todo, total, out: JsonlJournal, args, stats: dict, cache=None, url_map=None):
+    if args.adaptive:
+        limiter = AdaptivePacer(1.0 / max(args.rate, 1e-6), args.min_delay, args.max_delay)
+    else:
+        limiter = HostRateLimiter(args.rate, args.burst)
+    parse_pool = ProcessPoolExecutor(args.parse_workers) if args.parse_workers > 0 else None
+    scraper = AsyncScraper(limiter, args.concurrency, args.base_url.rstrip("/"), args.delay, args.headless,
+                           cache, parse_pool, url_map, args.lean_browser)
+
+    queue: asyncio.Queue = asyncio.Queue()
+    for item in enumerate(todo):
+        queue.put_nowait(item)
+
+    done: dict[int, tuple] = {}
+    next_seq = 0
+
+    def flush_in_order():
+        nonlocal next_seq
+        while next_seq in done:
+            i, row, msg = done.pop(next_seq)
+            print(f"[{i}/{total}] {row['api']}  {safe_name(row.get('well_name'))[:45]:<45s}  {msg}")
+            out.write(row)
+            stats["success" if row["scrape_success"] else "failed"] += 1
+            next_seq += 1
+
+    async def worker():
+        while True:
+            try:
+                seq, (i, well) = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            row = new_row(well)
+            t0 = time.perf_counter()
+            try:
+                msg = await scraper.scrape(row)
+            except Exception as e:
+                msg = f"ERROR {type(e).__name__}: {e}"
+            done[seq] = (i, row, timed(msg, t0))
+            flush_in_order()
+
+    try:
+        await asyncio.gather(*(worker() for _ in range(max(1, args.concurrency))))
+    finally:
+        scraper.close()
+        if parse_pool is not None:
+            parse_pool.shutdown()
+        stats["browser_fallbacks"] = scraper.browser_fallbacks
+        if scraper.pacer is not None:
+            stats["pacer"] = scraper.pacer.summary()
+        if scraper.browser.page_stats:
+            stats["browser_pages"] = scraper.browser.page_summary()
+
+
+def run_async(todo, total: int, out: JsonlJournal, args, stats: dict, cache=None, url_map=None):
+    """
+    todo: [(input index, well), ...] in input order; rows go to out in that order.
+    Counts go into stats ("success", "failed", "browser_fallbacks") as rows are written.
+    """
+    asyncio.run(_run(todo, total, out, args, stats, cache, url_map))
@@ -13,37 +13,77 @@ Optional:
     --delay 2.0          Seconds between page loads (default: 2.0)
     --headless           Run Chrome headless
     --resume             Skip wells already in output file
+    --engine http        Fetch pages with a keep-alive requests.Session and only
+                         start Chrome for pages that need JavaScript
+    --engine async       Like http, with --concurrency wells in flight and a
+                         per-host token bucket (--rate/--burst) instead of sleeps
+    --engine pool        --workers headless Chrome processes sharing one queue,
+                         each browser recycled after --recycle_after pages
+    --cache_dir DIR      Keep raw search/detail HTML on disk (TTL + LRU size cap)
+    --reparse_only       Rebuild the output from cached HTML only, in parallel
+    --parse_workers N    Parse detail pages in N processes while the fetch loop
+                         moves on (selenium/http engines)
+    --url_map FILE       Remember API# -> detail URL and skip the search page
+    --refresh            Rescrape only stale wells (by status / last production /
+                         scraped_at) within --budget requests, merged in place
+    --adaptive           Tune the request interval from latency / 429s / errors
+    --retry_queue FILE   Retry failed wells on later runs with exponential backoff
+    --lean_browser       Chrome without images/fonts/media/third-party hosts,
+                         eager page loads and selector waits instead of sleeps
+    --batch_search       One operator/county results page per group of wells
+                         instead of one search per well (with --url_map)
+    --checkpoint_rows N  Rows are written in batches and fsync'ed every N rows /
+    --checkpoint_secs S  S seconds; completed API#s go to <out>.done for --resume
 """
 
 import argparse
+import html as htmllib
 import json
+import os
 import re
 import time
 import unicodedata
+from datetime import datetime, timezone
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import Optional, Dict, List
-from urllib.parse import quote_plus
+from urllib.parse import quote_plus, urlparse
 
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException
-from bs4 import BeautifulSoup
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from bs4 import BeautifulSoup, SoupStrainer
+
+from html_cache import HtmlCache
+from jsonl_journal import JsonlJournal, load_done, read_rows, rebuild_index, reset
+from politeness import AdaptivePacer
+from records import Production
+from refresh_scheduler import merge_rows, now_stamp, plan_refresh
+from retry_queue import RetryQueue
+from url_map import DetailUrlMap
+from well_plan import api_key, batch_groups, dedupe_wells, find_well_hrefs
 
 #  Constants 
 
+BASE_URL = "https://www.drillingedge.com"
+
 # From your screenshot: the search form submits as GET with these params
 SEARCH_TPL = (
-    "https://www.drillingedge.com/search"
+    "{base}/search"
     "?type=wells"
-    "&operator_name="
+    "&operator_name={operator}"
     "&well_name="
     "&api_no={api}"
     "&lease_key="
     "&state="
-    "&county="
+    "&county={county}"
     "&well_status="
     "&section="
     "&township="
@@ -55,8 +95,27 @@ SEARCH_TPL = (
     "&field_formation="
 )
 
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36"
+)
+
 RE_SPACES = re.compile(r"\s+")
 RE_MEMBERS = re.compile(r"Members\s*Only", re.I)
+RE_OIL_BADGE = re.compile(r"([\d,.]+\s*k?)\s*Barrels?\s*(?:of\s*)?Oil\s*Produced", re.I)
+RE_GAS_BADGE = re.compile(r"([\d,.]+\s*k?)\s*MCF\s*(?:of\s*)?Gas\s*Produced", re.I)
+RE_SCRIPT = re.compile(r"<(script|style)\b.*?</\1\s*>", re.I | re.S)
+RE_TAG = re.compile(r"<[^>]+>")
+
+try:
+    import lxml  # noqa: F401
+    DETAIL_PARSER = "lxml"
+except ImportError:  # the strained parse still works, just slower
+    DETAIL_PARSER = "html.parser"
+
+# Only the parts parse_detail_html reads: the details tables and the
+# "Well Summary" badges (short text blocks). Everything else is never built.
+DETAIL_STRAINER = SoupStrainer(["table", "p"])
 
 #  Helpers 
 
@@ -102,9 +161,43 @@ def safe_name(name) -> str:
     return str(name)
 
 
+def timed(msg: str, t0: float, t1: float = None) -> str:
+    """Status text with the well's own start -> finish time, e.g. "OK ...  (1.42s)" (read by bench_scrape.py)."""
+    return f"{msg}  ({(t1 if t1 is not None else time.perf_counter()) - t0:.2f}s)"
+
+
+def search_url(api: str, base_url: str = BASE_URL) -> str:
+    return SEARCH_TPL.format(base=base_url, api=quote_plus(api), operator="", county="")
+
+
+def operator_search_url(operator: str, county: str = "", base_url: str = BASE_URL) -> str:
+    """All wells of one operator (optionally in one county) on a single results page."""
+    return SEARCH_TPL.format(base=base_url, api="", operator=quote_plus(operator), county=quote_plus(county))
+
+
+def abs_url(href: str, base_url: str = BASE_URL) -> str:
+    return href if href.startswith("http") else base_url + href
+
+
+def is_detail_page(html: str) -> bool:
+    return "Well Summary" in html or "Well Details" in html
+
+
 #  Browser 
 
-def make_driver(headless: bool = False) -> webdriver.Chrome:
+# Lean mode: nothing but the HTML (and same-site scripts) is fetched
+LEAN_BLOCKED_URLS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    "*.mp4", "*.webm", "*.mp3", "*.m4a",
+    "*.css",
+]
+
+# Text is enough: is_detail_page() looks for the same markers
+DETAIL_XPATH = "//*[contains(text(), 'Well Details') or contains(text(), 'Well Summary')]"
+
+
+def make_driver(headless: bool = False, lean: bool = False, base_url: str = BASE_URL) -> webdriver.Chrome:
     opts = Options()
     if headless:
         opts.add_argument("--headless=new")
@@ -112,41 +205,105 @@ def make_driver(headless: bool = False) -> webdriver.Chrome:
     opts.add_argument("--disable-dev-shm-usage")
     opts.add_argument("--disable-gpu")
     opts.add_argument("--window-size=1920,1080")
-    opts.add_argument(
-        "--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-        "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36"
-    )
+    opts.add_argument(f"--user-agent={USER_AGENT}")
     opts.add_experimental_option("excludeSwitches", ["enable-logging"])
     opts.add_argument("--log-level=3")
+    # network events, for bytes-per-page reporting (transfer_bytes)
+    opts.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+    if lean:
+        # every other host (ads, trackers, font / image CDNs) fails DNS lookup
+        host = urlparse(base_url).hostname or ""
+        site = host[4:] if host.startswith("www.") else host
+        opts.add_argument(f"--host-resolver-rules=MAP * ~NOTFOUND , EXCLUDE {host} , EXCLUDE *.{site}")
+        opts.add_argument("--blink-settings=imagesEnabled=false")
+        opts.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+        opts.page_load_strategy = "eager"  # return at DOMContentLoaded
     driver = webdriver.Chrome(options=opts)
-    driver.implicitly_wait(8)
+    if lean:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": LEAN_BLOCKED_URLS})
+    else:
+        driver.implicitly_wait(8)
     return driver
 
 
-#  Step 1: Search - get detail page URL 
+def transfer_bytes(driver: webdriver.Chrome) -> int:
+    """Bytes received since the last call, from Chrome's performance log."""
+    total = 0
+    try:
+        entries = driver.get_log("performance")
+    except WebDriverException:
+        return 0
+    for entry in entries:
+        msg = json.loads(entry["message"]).get("message", {})
+        if msg.get("method") == "Network.loadingFinished":
+            total += int(msg.get("params", {}).get("encodedDataLength", 0))
+    return total
+
+
+#  HTTP fast path 
 
-def get_well_url(driver: webdriver.Chrome, api: str, delay: float) -> Optional[str]:
+def make_session(pool_size: int = 4, status_retries: bool = True) -> requests.Session:
     """
-    Load search results page for this API#,
-    parse the HTML to find the well detail page link,
-    return the full URL (not click, just extract href).
+    Keep-alive session with a small connection pool and retries on 5xx.
+    status_retries=False leaves 429 / 5xx responses to the caller (AdaptivePacer).
     """
-    search_url = SEARCH_TPL.format(api=quote_plus(api))
-    driver.get(search_url)
-    time.sleep(delay)
-
-    # Wait for table to appear
+    session = requests.Session()
+    retry = Retry(total=2, backoff_factor=0.5, status_forcelist=(502, 503, 504) if status_retries else (),
+                  respect_retry_after_header=status_retries, allowed_methods=("GET",))
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({
+        "User-Agent": USER_AGENT,
+        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+        "Accept-Language": "en-US,en;q=0.9",
+    })
+    return session
+
+
+def retry_after(r: requests.Response) -> Optional[float]:
     try:
-        WebDriverWait(driver, 12).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, "table"))
-        )
-    except TimeoutException:
+        return float(r.headers.get("Retry-After", ""))
+    except ValueError:
         return None
 
-    time.sleep(1)
 
+def fetch_page(session: requests.Session, url: str, timeout: float = 15.0, pacer=None) -> tuple:
+    """
+    GET a page: (status code, text or None unless 200); (None, None) on a network
+    error. pacer (AdaptivePacer) is told the outcome.
+    """
+    t0 = time.perf_counter()
+    try:
+        r = session.get(url, timeout=timeout)
+    except requests.RequestException:
+        if pacer is not None:
+            pacer.record(None, time.perf_counter() - t0)
+        return None, None
+    if pacer is not None:
+        pacer.record(r.status_code, time.perf_counter() - t0, retry_after(r))
+    if r.status_code != 200:
+        return r.status_code, None
+    return r.status_code, r.text
+
+
+def fetch_html(session: requests.Session, url: str, timeout: float = 15.0, pacer=None) -> Optional[str]:
+    """GET a page; None on non-200 or network error."""
+    return fetch_page(session, url, timeout, pacer)[1]
+
+
+def link_is_stale(status: Optional[int], html: Optional[str]) -> bool:
+    """A mapped detail URL is dropped on a 404 or a page that is not a detail page, not on a 429 / 5xx / timeout."""
+    return status == 404 or (status == 200 and not is_detail_page(html or ""))
+
+
+#  Step 1: Search - get detail page URL 
+
+def find_well_href(html: str, api: str, base_url: str = BASE_URL) -> Optional[str]:
+    """Parse search results HTML and return the well detail page URL."""
     # Parse with BS4 - much more reliable than Selenium element clicking
-    soup = BeautifulSoup(driver.page_source, "html.parser")
+    soup = BeautifulSoup(html, "html.parser")
 
     # Find all <a> inside <table> ... <td>
     for a in soup.select("table td a"):
@@ -157,9 +314,7 @@ def get_well_url(driver: webdriver.Chrome, api: str, delay: float) -> Optional[s
         # We want links like /north-dakota/mckenzie-county/wells/...
         if "/wells/" in href:
             print(href)
-            if href.startswith("http"):
-                return href
-            return "https://www.drillingedge.com" + href
+            return abs_url(href, base_url)
 
     # Fallback: any link with the API in it
     for a in soup.find_all("a", href=True):
@@ -169,13 +324,56 @@ def get_well_url(driver: webdriver.Chrome, api: str, delay: float) -> Optional[s
         if api in href or api_nodash in href:
             if "/operators/" in href:
                 continue
-            if href.startswith("http"):
-                return href
-            return "https://www.drillingedge.com" + href
+            return abs_url(href, base_url)
 
     return None
 
 
+def get_well_url(driver: webdriver.Chrome, api: str, delay: float, base_url: str = BASE_URL,
+                 lean: bool = False) -> Optional[str]:
+    """
+    Load search results page for this API#,
+    parse the HTML to find the well detail page link,
+    return the full URL (not click, just extract href).
+    lean: no fixed sleeps, only waits on the result table / links.
+    """
+    driver.get(search_url(api, base_url))
+    if not lean:
+        time.sleep(delay)
+
+    # Wait for table to appear
+    try:
+        WebDriverWait(driver, 12).until(
+            EC.presence_of_element_located((By.CSS_SELECTOR, "table"))
+        )
+    except TimeoutException:
+        return None
+
+    if lean:
+        # rows may still be filling in; done as soon as a result link exists
+        try:
+            WebDriverWait(driver, 2).until(EC.presence_of_element_located((By.CSS_SELECTOR, "table td a")))
+        except TimeoutException:
+            pass
+    else:
+        time.sleep(1)
+
+    return find_well_href(driver.page_source, api, base_url)
+
+
+def load_detail_page(driver: webdriver.Chrome, url: str, delay: float, lean: bool = False) -> str:
+    """Open a detail page and return its HTML (lean: wait for the details text instead of sleeping)."""
+    driver.get(url)
+    if lean:
+        try:
+            WebDriverWait(driver, 12).until(EC.presence_of_element_located((By.XPATH, DETAIL_XPATH)))
+        except TimeoutException:
+            pass
+    else:
+        time.sleep(delay)
+    return driver.page_source
+
+
 #  Step 2: Parse detail page 
 default_data = {
         "api": None,
@@ -193,12 +391,12 @@ default_data = {
         "scrape_success": False
     }
 def parse_detail(driver: webdriver.Chrome, data: dict = default_data) -> Dict:
-    """Extract fields from the well detail page."""
+    """Extract fields from the well detail page loaded in the browser."""
+    return parse_detail_html(driver.page_source, data)
 
-    soup = BeautifulSoup(driver.page_source, "html.parser")
 
-    # KV pairs from the "Well Details" table 
-    # Rows have paired cells: [key, value, key, value, ...]
+def table_kv(soup: BeautifulSoup) -> Dict[str, str]:
+    """KV pairs from the "Well Details" table; rows have paired cells: [key, value, key, value, ...]"""
     kv: Dict[str, str] = {}
     for table in soup.find_all("table"):
         for tr in table.find_all("tr"):
@@ -208,7 +406,11 @@ def parse_detail(driver: webdriver.Chrome, data: dict = default_data) -> Dict:
                 v = norm(cells[i + 1].get_text(" ", strip=True))
                 if k and v:
                     kv[k] = v
+    return kv
 
+
+def fill_detail_fields(data: dict, kv: Dict[str, str], oil_badge, gas_badge) -> Dict:
+    """Map details-table pairs and the summary badge matches onto the output fields."""
     # Map some target fields from the details table
     # We'll also extract well_name, operator and county
     for k, v in kv.items():
@@ -243,15 +445,10 @@ def parse_detail(driver: webdriver.Chrome, data: dict = default_data) -> Dict:
     #  Production badges from Well Summary 
     # "1.1 k  Barrels of Oil Produced in Dec 2025"
     # "303    Barrels of Oil Produced in May 2023"
-    page_text = soup.get_text(" ", strip=True)
-
-    m = re.search(r"([\d,.]+\s*k?)\s*Barrels?\s*(?:of\s*)?Oil\s*Produced", page_text, re.I)
-    if m:
-        data["oil_barrels"] = parse_num(m.group(1))
-
-    m = re.search(r"([\d,.]+\s*k?)\s*MCF\s*(?:of\s*)?Gas\s*Produced", page_text, re.I)
-    if m:
-        data["gas_mcf"] = parse_num(m.group(1))
+    if oil_badge:
+        data["oil_barrels"] = parse_num(oil_badge.group(1))
+    if gas_badge:
+        data["gas_mcf"] = parse_num(gas_badge.group(1))
 
     #  Fallback: monthly prod columns in the details table 
     for k, v in kv.items():
@@ -273,6 +470,399 @@ def parse_detail(driver: webdriver.Chrome, data: dict = default_data) -> Dict:
     return data
 
 
+def parse_detail_html_full(html: str, data: dict = default_data) -> Dict:
+    """Reference parser: whole page with html.parser (kept for bench_parse.py)."""
+    soup = BeautifulSoup(html, "html.parser")
+    page_text = soup.get_text(" ", strip=True)
+    return fill_detail_fields(data, table_kv(soup), RE_OIL_BADGE.search(page_text), RE_GAS_BADGE.search(page_text))
+
+
+def parse_detail_html(html: str, data: dict = default_data) -> Dict:
+    """Extract fields from well detail page HTML (lxml, strained to tables + badge text)."""
+    soup = BeautifulSoup(html, DETAIL_PARSER, parse_only=DETAIL_STRAINER)
+    page_text = soup.get_text(" ", strip=True)
+    oil = RE_OIL_BADGE.search(page_text)
+    gas = RE_GAS_BADGE.search(page_text)
+    if oil is None or gas is None:
+        # badge markup outside the strained tags: regex the tag-stripped page instead
+        text = htmllib.unescape(RE_TAG.sub(" ", RE_SCRIPT.sub(" ", html)))
+        oil = oil or RE_OIL_BADGE.search(text)
+        gas = gas or RE_GAS_BADGE.search(text)
+    return fill_detail_fields(data, table_kv(soup), oil, gas)
+
+
+def parse_fetched(row: dict, detail_url: str, html: str):
+    """Parse stage: fill row from its fetched detail page. Returns (row, status text)."""
+    if not is_detail_page(html):
+        return row, "FAIL (not a detail page)"
+    page_data = parse_detail_html(html, row)
+    row.update(page_data)
+    row["drillingedge_url"] = detail_url
+    row["scrape_success"] = True
+
+    s = page_data.get("well_status") or "?"
+    o = page_data.get("oil_barrels") or "?"
+    g = page_data.get("gas_mcf") or "?"
+    return row, f"OK  status={s}  oil={o}  gas={g}"
+
+
+#  Per-well scraping 
+
+def new_row(well: dict) -> Production:
+    """Output row for one input well, pre-filled with its OCR values."""
+    name = well.get("well_name")
+
+    # filter wierd ocr result
+    if str(name).strip().lower() == "and Number":
+        name = None
+
+    return Production(
+        api=well.get("api"),
+        well_name=name,
+        operator=well.get("operator"),
+        county_state=well.get("county_state"),
+        scrape_success=False,
+        scraped_at=now_stamp(),
+    )
+
+
+class WellScraper:
+    """
+    Fetches and parses the search + detail page of one well.
+
+    engine="selenium": every page goes through Chrome (original behaviour).
+    engine="http":     pages come from a keep-alive requests.Session; Chrome is
+                       started lazily and only used when the HTML is not a
+                       usable results / detail page (e.g. needs JavaScript).
+    """
+
+    def __init__(self, engine: str = "selenium", delay: float = 2.0, headless: bool = False,
+                 base_url: str = BASE_URL, cache=None, url_map=None, pacer=None, lean: bool = False):
+        self.engine = engine
+        self.delay = delay
+        self.headless = headless
+        self.base_url = base_url
+        self.cache = cache  # optional HtmlCache: usable pages are served from / stored to disk
+        self.url_map = url_map  # optional DetailUrlMap: known detail URLs skip the search page
+        self.pacer = pacer  # optional AdaptivePacer: replaces the fixed sleep between wells
+        self.lean = lean
+        self.page_stats: List[tuple] = []  # (kind, seconds, bytes) per browser page load
+        self.session = make_session(status_retries=pacer is None) if engine == "http" else None
+        self.driver = None
+        self.browser_fallbacks = 0
+        self.last_status = None  # HTTP status of the last http_get (None: network error / timeout)
+
+    def start_browser(self) -> webdriver.Chrome:
+        if self.driver is None:
+            print(f"Starting Chrome (headless={self.headless})...", end="  ", flush=True)
+            self.driver = make_driver(headless=self.headless, lean=self.lean, base_url=self.base_url)
+        return self.driver
+
+    def quit(self):
+        if self.driver is not None:
+            self.driver.quit()
+            self.driver = None
+        if self.session is not None:
+            self.session.close()
+
+    def pace(self):
+        if self.pacer is not None:
+            self.pacer.wait()
+
+    def http_get(self, url: str) -> Optional[str]:
+        """Session GET; with --adaptive a 429 / 5xx / timeout is retried after backing off."""
+        for _ in range(3 if self.pacer is not None else 1):
+            self.pace()
+            self.last_status, html = fetch_page(self.session, url, pacer=self.pacer)
+            if html is not None or self.pacer is None or not self.pacer.backed_off:
+                break
+        return html
+
+    def browser_get(self, kind: str, fn, *args):
+        """Run one browser page load, paced and timed like an HTTP request; kind: "search" / "detail"."""
+        self.pace()
+        t0 = time.perf_counter()
+        try:
+            result = fn(*args)
+        except WebDriverException:
+            if self.pacer is not None:
+                self.pacer.record(None, time.perf_counter() - t0)
+            raise
+        seconds = time.perf_counter() - t0
+        if self.pacer is not None:
+            self.pacer.record(200, seconds)
+        self.page_stats.append((kind, seconds, transfer_bytes(self.driver)))
+        return result
+
+    def page_summary(self) -> str:
+        """Per-page browser load time and bytes transferred, by page kind."""
+        parts = []
+        for kind in ("search", "detail"):
+            rows = [(s, b) for k, s, b in self.page_stats if k == kind]
+            if rows:
+                parts.append(f"{kind}: {len(rows)} pages, {sum(s for s, _ in rows) / len(rows):.2f} s "
+                             f"and {sum(b for _, b in rows) / len(rows) / 1024:.0f} KB per page")
+        return "  ".join(parts)
+
+    def find_detail_url(self, api: str) -> Optional[str]:
+        url = search_url(api, self.base_url)
+        html = self.cache.get(url) if self.cache is not None else None
+        cached = html is not None
+        if html is None and self.session is not None:
+            html = self.http_get(url)
+            if not (html and "<table" in html):
+                html = None
+                self.browser_fallbacks += 1
+        if html is None:
+            detail_url = self.browser_get("search", get_well_url, self.start_browser(), api, self.delay,
+                                          self.base_url, self.lean)
+            html = self.driver.page_source
+        else:
+            detail_url = find_well_href(html, api, self.base_url)
+        if self.cache is not None and not cached and "<table" in html:  # a hit keeps its original expiry
+            self.cache.put(url, html)
+        return detail_url
+
+    def load_detail(self, url: str, browser_fallback: bool = True) -> str:
+        html = self.cache.get(url) if self.cache is not None else None
+        if html is not None:
+            return html
+        if self.session is not None:
+            html = self.http_get(url)
+            if not (html and is_detail_page(html)):
+                if not browser_fallback:
+                    return html or ""
+                html = None
+                self.browser_fallbacks += 1
+        if html is None:
+            html = self.browser_get("detail", load_detail_page, self.start_browser(), url, self.delay, self.lean)
+        if self.cache is not None and is_detail_page(html):
+            self.cache.put(url, html)
+        return html
+
+    def fetch(self, api: str):
+        """Fetch stage: (detail_url, detail html), or (None, None) if the search found nothing."""
+        # Known detail URL: skip the search page
+        if self.url_map is not None:
+            detail_url = self.url_map.get(api)
+            if detail_url:
+                self.last_status = 200  # unless http_get says otherwise: cache hit or browser page
+                html = self.load_detail(detail_url, browser_fallback=False)
+                if is_detail_page(html):
+                    return detail_url, html
+                if link_is_stale(self.last_status, html):
+                    self.url_map.invalidate(api)  # 404 / moved: search again
+
+        # Step 1: search - extract detail URL from results HTML
+        detail_url = self.find_detail_url(api)
+        if not detail_url:
+            return None, None
+
+        # Step 2: navigate to detail page directly
+        html = self.load_detail(detail_url)
+        if self.url_map is not None and is_detail_page(html):
+            self.url_map.set(api, detail_url)
+        return detail_url, html
+
+    def scrape(self, row: dict) -> str:
+        """Fill row in place; returns the status text printed for this well."""
+        detail_url, html = self.fetch(row["api"])
+        if not detail_url:
+            return "FAIL (no link in results)"
+
+        # Step 3: parse
+        return parse_fetched(row, detail_url, html)[1]
+
+
+#  Fetch / parse stages 
+
+def run_staged(scraper: WellScraper, todo, total: int, out: JsonlJournal, args, stats: dict):
+    """
+    Fetch loop in this process, detail pages parsed in a --parse_workers process
+    pool while the next well is fetched; rows are written in input order.
+    """
+    res_done = {}  # input index -> when its parse finished
+    window = deque()  # (i, row, parse future or final status text, fetch start, finish), input order
+
+    def flush(wait: bool = False):
+        while window and (wait or isinstance(window[0][2], str) or window[0][2].done()):
+            i, row, res, t0, t1 = window.popleft()
+            if not isinstance(res, str):
+                try:
+                    row, res = res.result()
+                except Exception as e:
+                    res = f"ERROR {type(e).__name__}: {e}"
+                t1 = res_done.pop(i, None)
+            print(f"[{i}/{total}] {row['api']}  {safe_name(row.get('well_name'))[:45]:<45s}  {timed(res, t0, t1)}")
+            out.write(row)
+            stats["success" if row["scrape_success"] else "failed"] += 1
+
+    with ProcessPoolExecutor(max_workers=args.parse_workers) as ex:
+        for i, well in todo:
+            row = new_row(well)
+            t0 = time.perf_counter()
+            try:
+                detail_url, html = scraper.fetch(row["api"])
+                res = ex.submit(parse_fetched, row, detail_url, html) if detail_url else "FAIL (no link in results)"
+            except Exception as e:
+                res = f"ERROR {type(e).__name__}: {e}"
+            if isinstance(res, str):
+                window.append((i, row, res, t0, time.perf_counter()))
+            else:
+                # finish = parse done, not the (later) in-order write
+                res.add_done_callback(lambda f, i=i: res_done.__setitem__(i, time.perf_counter()))
+                window.append((i, row, res, t0, None))
+            flush()
+            if scraper.pacer is None:
+                time.sleep(args.delay * 0.5)
+        flush(wait=True)
+
+
+#  Reparse from cache 
+
+_reparse_cache = None
+
+
+def _reparse_init(cache_dir: str):
+    global _reparse_cache
+    _reparse_cache = HtmlCache(Path(cache_dir))
+
+
+def reparse_well(well: dict, base_url: str, detail_urls: tuple = ()):
+    """
+    Rebuild one output row from cached HTML only (no network). Returns (row, status).
+    detail_urls: known detail links (URL map, previous output) tried before the search page,
+    which wells found through the URL map or --batch_search never cached.
+    """
+    row = new_row(well)
+    api = row["api"]
+    for detail_url in detail_urls:
+        html = _reparse_cache.get(detail_url, allow_stale=True, touch=False)
+        if html is not None:
+            return parse_fetched(row, detail_url, html)
+    html = _reparse_cache.get(search_url(api, base_url), allow_stale=True, touch=False)
+    if html is None:
+        return row, "MISS (search page not cached)"
+    detail_url = find_well_href(html, api, base_url)
+    if not detail_url:
+        return row, "FAIL (no link in results)"
+    html = _reparse_cache.get(detail_url, allow_stale=True, touch=False)
+    if html is None:
+        return row, "MISS (detail page not cached)"
+    return parse_fetched(row, detail_url, html)
+
+
+def run_reparse(todo, total: int, out: JsonlJournal, args, stats: dict, previous: dict = None,
+                url_map: Optional[DetailUrlMap] = None):
+    """
+    Parse cached HTML for every well in a process pool; rows written in input order.
+    previous: {api: row} of the earlier output; a well with no cached pages keeps its row.
+    """
+    previous = previous or {}
+    base_url = args.base_url.rstrip("/")
+    workers = args.parse_workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers, initializer=_reparse_init, initargs=(args.cache_dir,)) as ex:
+        wells = [well for _, well in todo]
+        known = []
+        for well in wells:
+            urls = (url_map.urls.get(well["api"]) if url_map is not None else None,
+                    (previous.get(well["api"]) or {}).get("drillingedge_url"))
+            known.append(tuple(dict.fromkeys(u for u in urls if u)))
+        results = ex.map(reparse_well, wells, [base_url] * len(wells), known, chunksize=16)
+        for (i, well), (row, msg) in zip(todo, results):
+            if msg.startswith("MISS") and row["api"] in previous:
+                row = previous[row["api"]]
+                msg += ", previous row kept"
+                stats["kept"] += 1
+            print(f"[{i}/{total}] {row['api']}  {safe_name(row.get('well_name'))[:45]:<45s}  {msg}")
+            out.write(row)
+            key = "missing" if msg.startswith("MISS") else ("success" if row["scrape_success"] else "failed")
+            stats[key] += 1
+
+
+def reparse_output(args, todo, total: int, out_jsonl: Path, skipped: int, url_map: Optional[DetailUrlMap]):
+    """
+    --reparse_only: rebuild the rows of todo from cached HTML. Without --resume the rows go
+    to a staging file that replaces out_jsonl at the end, unless the run was interrupted or
+    no well had any cached page (then out_jsonl is left as it was).
+    """
+    previous = {r["api"]: r for r in read_jsonl(out_jsonl) if r.get("api")} if out_jsonl.exists() else {}
+    target = out_jsonl if args.resume else out_jsonl.with_suffix(".reparse.jsonl")
+    if target != out_jsonl:
+        reset(target)
+    stats = {"success": 0, "failed": 0, "missing": 0, "kept": 0}
+    complete = False
+    t0 = time.perf_counter()
+    out = JsonlJournal(target, args.checkpoint_rows, args.checkpoint_secs)
+    try:
+        run_reparse(todo, total, out, args, stats, previous, url_map)
+        complete = True
+    except KeyboardInterrupt:
+        print("\n\nInterrupted!" + (" Progress saved." if target == out_jsonl else ""))
+    finally:
+        out.close()
+        print(f"\nDone. success={stats['success']}  failed={stats['failed']}  not cached={stats['missing']} "
+              f"(previous row kept: {stats['kept']})  skipped={skipped}  ({time.perf_counter() - t0:.1f}s)")
+    if target == out_jsonl:
+        print(f"Output: {out_jsonl}")
+        return
+    found = stats["success"] + stats["failed"]
+    if complete and (found or not out_jsonl.exists()):
+        os.replace(target, out_jsonl)
+        reset(target)  # staging index
+        rebuild_index(out_jsonl)
+        print(f"Output: {out_jsonl}")
+    else:
+        reset(target)
+        why = "interrupted" if not complete else "no cached pages for any well"
+        print(f"Output: {out_jsonl} left unchanged ({why})")
+
+
+def close_url_map(url_map: Optional[DetailUrlMap]):
+    if url_map is not None:
+        url_map.save()
+        print(f"URL map: {url_map.hits - url_map.invalidated} searches skipped, {url_map.invalidated} stale links dropped, "
+              f"{len(url_map)} saved to {url_map.path}")
+
+
+#  Batched search 
+
+def batch_prefetch(args, todo, url_map: DetailUrlMap, cache: Optional[HtmlCache]):
+    """
+    --batch_search: one operator/county results page per group of --batch_min or
+    more wells without a known detail URL; the URLs found go into url_map, so the
+    engines skip those wells' own search pages.
+    """
+    base_url = args.base_url.rstrip("/")
+    groups = batch_groups([(i, w) for i, w in todo if not url_map.urls.get(w["api"])], args.batch_min)
+    if not groups:
+        print(f"Batched search: no operator/county group of {args.batch_min}+ wells without a known URL")
+        return
+    scraper = WellScraper("http", args.delay, args.headless, base_url, cache)
+    found = 0
+    try:
+        for op, county, apis in groups:
+            url = operator_search_url(op, county, base_url)
+            html = cache.get(url) if cache is not None else None
+            if html is None:
+                html = scraper.http_get(url)
+                time.sleep(args.delay * 0.5)
+                if not (html and "<table" in html):
+                    print(f"  {op} / {county or '-'}: no results page, {len(apis)} wells searched one by one")
+                    continue
+                if cache is not None:
+                    cache.put(url, html)
+            hrefs = find_well_hrefs(html)
+            hit = [api for api in apis if api_key(api) in hrefs]
+            for api in hit:
+                url_map.set(api, abs_url(hrefs[api_key(api)], base_url))
+            found += len(hit)
+            print(f"  {op} / {county or '-'}: {len(hit)}/{len(apis)} wells on one results page")
+    finally:
+        scraper.quit()
+    print(f"Batched search: {len(groups)} results pages -> {found} detail URLs ({found - len(groups)} requests saved)")
+
+
 #  JSONL I/O 
 
 def read_jsonl(path: Path) -> List[dict]:
@@ -285,21 +875,55 @@ def read_jsonl(path: Path) -> List[dict]:
     return rows
 
 
-def append_jsonl(row: dict, path: Path):
-    path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("a", encoding="utf-8") as f:
-        f.write(json.dumps(row, ensure_ascii=False) + "\n")
-
-
 #  Main 
 
 def main():
-    ap = argparse.ArgumentParser(description="Scrape DrillingEdge using Selenium.")
+    ap = argparse.ArgumentParser(description="Scrape DrillingEdge using Selenium or plain HTTP.")
     ap.add_argument("--well_jsonl", required=True)
     ap.add_argument("--out_jsonl", required=True)
     ap.add_argument("--delay", type=float, default=2.0)
     ap.add_argument("--headless", action="store_true")
     ap.add_argument("--resume", action="store_true")
+    ap.add_argument("--engine", choices=("selenium", "http", "async", "pool"), default="selenium",
+                    help="http: requests.Session, Chrome only as fallback for JS-only pages; "
+                         "async: http with several wells in flight; pool: several headless Chromes")
+    ap.add_argument("--concurrency", type=int, default=4, help="async: wells in flight")
+    ap.add_argument("--rate", type=float, default=1.0, help="async: requests/sec per host")
+    ap.add_argument("--burst", type=int, default=2, help="async: token bucket size per host")
+    ap.add_argument("--workers", type=int, default=3, help="pool: browser worker processes")
+    ap.add_argument("--recycle_after", type=int, default=200, help="pool: restart a browser after N pages")
+    ap.add_argument("--cache_dir", default="", help="Disk cache for raw HTML (disabled if empty)")
+    ap.add_argument("--cache_ttl_days", type=float, default=7.0, help="Cached pages older than this are refetched")
+    ap.add_argument("--cache_max_mb", type=int, default=512, help="Cache size cap; LRU eviction beyond it")
+    ap.add_argument("--reparse_only", action="store_true",
+                    help="Rerun the parsers over cached HTML only (no network); needs --cache_dir")
+    ap.add_argument("--parse_workers", type=int, default=0,
+                    help="Parse detail pages in N processes (0 = inline; reparse_only: 0 = all cores)")
+    ap.add_argument("--url_map", default="",
+                    help="JSON file of API# -> detail URL, seeded from --out_jsonl; skips the search page")
+    ap.add_argument("--refresh", action="store_true",
+                    help="Rescrape only wells whose data is stale and merge them into --out_jsonl")
+    ap.add_argument("--budget", type=int, default=200, help="refresh: max page requests this run (0 = no limit)")
+    ap.add_argument("--refresh_active_days", type=float, default=7, help="refresh: active wells with recent production")
+    ap.add_argument("--refresh_idle_days", type=float, default=30, help="refresh: active wells, no recent production")
+    ap.add_argument("--refresh_other_days", type=float, default=90, help="refresh: other / unknown status")
+    ap.add_argument("--refresh_pa_days", type=float, default=0, help="refresh: plugged/abandoned wells (0 = never)")
+    ap.add_argument("--recent_months", type=int, default=6, help="refresh: production this recent counts as active")
+    ap.add_argument("--adaptive", action="store_true",
+                    help="Adapt the interval between requests (starts at --delay, or 1/--rate for async)")
+    ap.add_argument("--min_delay", type=float, default=0.25, help="adaptive: shortest interval (s)")
+    ap.add_argument("--max_delay", type=float, default=30.0, help="adaptive: longest interval (s)")
+    ap.add_argument("--retry_queue", default="", help="JSON file of failed wells to retry on later runs")
+    ap.add_argument("--retry_base_min", type=float, default=10.0, help="retry: first backoff (minutes), doubles per attempt")
+    ap.add_argument("--max_attempts", type=int, default=5, help="retry: give up on a well after N failures")
+    ap.add_argument("--lean_browser", action="store_true",
+                    help="Chrome blocks images/fonts/media/CSS and other hosts, eager page loads, selector waits")
+    ap.add_argument("--batch_search", action="store_true",
+                    help="Find detail URLs with one operator/county search per group of wells (needs --url_map)")
+    ap.add_argument("--batch_min", type=int, default=3, help="batch: smallest group worth its own results page")
+    ap.add_argument("--checkpoint_rows", type=int, default=25, help="fsync the output every N rows")
+    ap.add_argument("--checkpoint_secs", type=float, default=5.0, help="... or every N seconds, whichever first")
+    ap.add_argument("--base_url", default=BASE_URL, help="Site root (point at a local stand-in for testing)")
     args = ap.parse_args()
 
     well_jsonl = Path(args.well_jsonl)
@@ -308,111 +932,251 @@ def main():
     if not well_jsonl.exists():
         print(f"ERROR: {well_jsonl} not found")
         return
+    if args.reparse_only and not args.cache_dir:
+        print("ERROR: --reparse_only needs --cache_dir")
+        return
+    if args.refresh and (args.reparse_only or args.resume):
+        print("ERROR: --refresh can't be combined with --reparse_only or --resume")
+        return
+    if args.batch_search and not args.url_map:
+        print("ERROR: --batch_search needs --url_map")
+        return
 
     wells = read_jsonl(well_jsonl)
-    print(f"Loaded {len(wells)} wells from {well_jsonl}")
+    unique, counts = dedupe_wells(wells)
+    print(f"Loaded {len(wells)} wells from {well_jsonl}: {counts['unique']} unique API#s "
+          f"({counts['duplicates']} duplicate rows, {counts['no_api']} without API#)")
+
+    url_map = None
+    if args.url_map:
+        url_map = DetailUrlMap(Path(args.url_map))
+        # seed before a fresh run deletes the old output
+        seeded = url_map.seed(read_jsonl(out_jsonl)) if out_jsonl.exists() else 0
+        print(f"URL map: {len(url_map)} detail URLs ({seeded} new from {out_jsonl.name})")
+
+    retry = None
+    if args.retry_queue:
+        retry = RetryQueue(Path(args.retry_queue), args.retry_base_min * 60, args.max_attempts)
+        c = retry.counts()
+        print(f"Retry queue: due={c['due']}  waiting={c['waiting']}  gave up={c['gave_up']}")
+
+    if args.refresh:
+        existing = read_jsonl(out_jsonl) if out_jsonl.exists() else []
+        if existing:
+            # rows written before scraped_at existed count as scraped when the file was last written
+            file_time = datetime.fromtimestamp(out_jsonl.stat().st_mtime, timezone.utc).isoformat(timespec="seconds")
+            for r in existing:
+                r.setdefault("scraped_at", file_time)
+        todo, plan = plan_refresh(
+            unique,
+            {r["api"]: r for r in existing if r.get("api")},
+            lambda api: url_map is not None and url_map.urls.get(api) is not None,
+            args,
+            retry,
+        )
+        print(f"Refresh plan: new={plan['new']}  due={plan['due']}  fresh={plan['fresh']}  "
+              f"never={plan['never']}  backoff={plan['backoff']}  -> {plan['selected']} wells, "
+              f"~{plan['requests']} requests (budget {args.budget or 'unlimited'})")
+        if args.batch_search:
+            batch_prefetch(args, todo, url_map, make_cache(args))
+        scrape_and_merge(args, todo, len(wells), out_jsonl, existing, url_map, retry)
+        close_retry_queue(retry)
+        return
 
     # Resume
     done_apis = set()
     if args.resume and out_jsonl.exists():
-        for row in read_jsonl(out_jsonl):
-            if row.get("api"):
-                done_apis.add(row["api"])
-        print(f"Resume: {len(done_apis)} already done, skipping.")
+        done_apis, info = load_done(out_jsonl)
+        done_apis = {api_key(a) for a in done_apis}
+        if info["torn_bytes"]:
+            print(f"Resume: dropped a torn last line ({info['torn_bytes']} bytes)")
+        print(f"Resume: {len(done_apis)} already done, skipping. "
+              f"(index {info['indexed']}{' rebuilt' if info['rebuilt'] else ''}, {info['scanned']} rows scanned)")
+    elif not args.reparse_only:
+        reset(out_jsonl)  # --reparse_only swaps its rebuilt output in at the end (reparse_output)
+
+    skipped = counts["duplicates"] + counts["no_api"]
+    todo = []
+    retry_todo = []
+    for i, well in unique:
+        api = well["api"]
+        if api_key(api) in done_apis:
+            skipped += 1
+            # the retry pass scrapes over the network, which --reparse_only never does
+            if retry is not None and not args.reparse_only and retry.is_due(api):
+                retry_todo.append((i, well))
+            continue
+        todo.append((i, well))
+    if args.batch_search and not args.reparse_only:
+        batch_prefetch(args, todo, url_map, make_cache(args))
+
+    start = out_jsonl.stat().st_size if out_jsonl.exists() else 0
+    if args.reparse_only:
+        reparse_output(args, todo, len(wells), out_jsonl, skipped, url_map)
+        start = start if args.resume else 0
     else:
-        if out_jsonl.exists():
-            out_jsonl.unlink()
+        scrape_wells(args, todo, len(wells), out_jsonl, skipped, url_map)
+    if retry is not None and out_jsonl.exists():
+        retry.record(read_rows(out_jsonl, start))
+        if retry_todo:
+            print(f"\nRetrying {len(retry_todo)} previously failed wells (backoff passed)")
+            scrape_and_merge(args, retry_todo, len(wells), out_jsonl, read_jsonl(out_jsonl), url_map, retry)
+    close_retry_queue(retry)
+
+
+def scrape_and_merge(args, todo, total: int, out_jsonl: Path, existing: list, url_map, retry):
+    """Scrape todo into a staging file, then merge the rows into out_jsonl by API#."""
+    staging = out_jsonl.with_suffix(".refresh.jsonl")
+    reset(staging)
+    scrape_wells(args, todo, total, staging, total - len(todo), url_map)
+    if staging.exists():
+        rows = read_jsonl(staging)
+        merged = merge_rows(out_jsonl, existing, rows)
+        rebuild_index(out_jsonl)
+        reset(staging)
+        if retry is not None:
+            retry.record(rows)
+        print(f"Merged into {out_jsonl}: updated={merged['updated']}  added={merged['added']}  "
+              f"kept after failed refresh={merged['kept']}")
+
+
+def close_retry_queue(retry: Optional[RetryQueue]):
+    if retry is not None:
+        retry.save()
+        c = retry.counts()
+        print(f"Retry queue: due={c['due']}  waiting={c['waiting']}  gave up={c['gave_up']}  -> {retry.path}")
+
+
+def make_cache(args) -> Optional[HtmlCache]:
+    if not args.cache_dir:
+        return None
+    return HtmlCache(Path(args.cache_dir), args.cache_ttl_days * 86400, args.cache_max_mb * 1024 * 1024)
+
 
-    print(f"Starting Chrome (headless={args.headless})...")
-    driver = make_driver(headless=args.headless)
+def scrape_wells(args, todo, total: int, out_jsonl: Path, skipped: int, url_map: Optional[DetailUrlMap]):
+    """Run the selected engine over todo [(input index, well), ...], appending rows to out_jsonl."""
+    out = JsonlJournal(out_jsonl, args.checkpoint_rows, args.checkpoint_secs)
+    if out.torn_bytes:
+        print(f"{out_jsonl.name}: dropped a torn last line ({out.torn_bytes} bytes)")
+    try:
+        run_engine(args, todo, total, out, skipped, url_map)
+    finally:
+        out.close()
+
+
+def run_engine(args, todo, total: int, out: JsonlJournal, skipped: int, url_map: Optional[DetailUrlMap]):
+    cache = make_cache(args)
+
+    if args.engine == "async":
+        from scrape_async import run_async
+
+        stats = {"success": 0, "failed": 0, "browser_fallbacks": 0}
+        print(f"Async engine: concurrency={args.concurrency}  rate={args.rate}/s  burst={args.burst}")
+        try:
+            run_async(todo, total, out, args, stats, cache, url_map)
+        except KeyboardInterrupt:
+            print("\n\nInterrupted! Progress saved.")
+        finally:
+            print(f"\nDone. success={stats['success']}  failed={stats['failed']}  skipped={skipped}")
+            print(f"Browser fallbacks: {stats['browser_fallbacks']}")
+            if stats.get("pacer"):
+                print(f"Adaptive pacing: {stats['pacer']}")
+            if stats.get("browser_pages"):
+                print(f"Browser pages: {stats['browser_pages']}")
+            if cache is not None:
+                print(f"HTML cache: hits={cache.hits}  misses={cache.misses}")
+            close_url_map(url_map)
+            print(f"Output: {out.path}")
+        return
+
+    if args.engine == "pool":
+        from browser_pool import run_pool
+
+        stats = {"success": 0, "failed": 0, "browser_restarts": 0}
+        print(f"Browser pool: workers={args.workers}  recycle_after={args.recycle_after} pages")
+        try:
+            run_pool(todo, total, out, args, stats, url_map)
+        except KeyboardInterrupt:
+            print("\n\nInterrupted! Progress saved.")
+        finally:
+            print(f"\nDone. success={stats['success']}  failed={stats['failed']}  skipped={skipped}")
+            print(f"Browser restarts after crashes: {stats['browser_restarts']}")
+            close_url_map(url_map)
+            print(f"Output: {out.path}")
+        return
+
+    pacer = AdaptivePacer(args.delay, args.min_delay, args.max_delay) if args.adaptive else None
+    scraper = WellScraper(args.engine, args.delay, args.headless, args.base_url.rstrip("/"), cache, url_map, pacer,
+                          args.lean_browser)
+    if args.engine == "selenium":
+        scraper.start_browser()
+        print()
+
+    if args.parse_workers > 0:
+        stats = {"success": 0, "failed": 0}
+        print(f"Parse stage: {args.parse_workers} processes ({DETAIL_PARSER})")
+        try:
+            run_staged(scraper, todo, total, out, args, stats)
+        except KeyboardInterrupt:
+            print("\n\nInterrupted! Progress saved.")
+        finally:
+            scraper.quit()
+            print(f"\nDone. success={stats['success']}  failed={stats['failed']}  skipped={skipped}")
+            if args.engine == "http":
+                print(f"Browser fallbacks: {scraper.browser_fallbacks}")
+            if pacer is not None:
+                print(f"Adaptive pacing: {pacer.summary()}")
+            if scraper.page_stats:
+                print(f"Browser pages: {scraper.page_summary()}")
+            close_url_map(url_map)
+            print(f"Output: {out.path}")
+        return
 
     success = 0
     failed = 0
-    skipped = 0
 
     try:
-        for i, well in enumerate(wells, 1):
+        for i, well in todo:
             api = well.get("api")
-            if not api:
-                skipped += 1
-                continue
-            if api in done_apis:
-                skipped += 1
-                continue
-            
-            name = well.get("well_name")
-            sname = safe_name(name)
-            print(f"[{i}/{len(wells)}] {api}  {sname[:45]:<45s}", end="  ", flush=True)
-
-            # filter wierd ocr result
-            if str(name).strip().lower() == "and Number":
-                name = None
-
-            row = {
-                "api": api,
-                "well_name": name,
-                "well_status": None,
-                "well_type": None,
-                "closest_city": None,
-                "oil_barrels": None,
-                "gas_mcf": None,
-                "operator": well.get("operator"),
-                "county_state": well.get("county_state"),
-                "first_production_date": None,
-                "most_recent_production_date": None,
-                "drillingedge_url": None,
-                "scrape_success": False
-                }
+            sname = safe_name(well.get("well_name"))
+            print(f"[{i}/{total}] {api}  {sname[:45]:<45s}", end="  ", flush=True)
+
+            row = new_row(well)
+            t0 = time.perf_counter()
 
             try:
-                # Step 1: search - extract detail URL from results HTML
-                detail_url = get_well_url(driver, api, args.delay)
-                if not detail_url:
-                    print("FAIL (no link in results)")
+                print(timed(scraper.scrape(row), t0))
+                if row["scrape_success"]:
+                    success += 1
+                else:
                     failed += 1
-                    append_jsonl(row, out_jsonl)
-                    continue
-
-                # Step 2: navigate to detail page directly
-                driver.get(detail_url)
-                time.sleep(args.delay)
-
-                # Verify it's a real detail page
-                src = driver.page_source
-                if "Well Summary" not in src and "Well Details" not in src:
-                    print("FAIL (not a detail page)")
-                    failed += 1
-                    append_jsonl(row, out_jsonl)
-                    continue
-
-                # Step 3: parse
-                page_data = parse_detail(driver, row)
-                row.update(page_data)
-                row["drillingedge_url"] = detail_url
-                row["scrape_success"] = True
-                success += 1
-
-                s = page_data.get("well_status") or "?"
-                o = page_data.get("oil_barrels") or "?"
-                g = page_data.get("gas_mcf") or "?"
-                print(f"OK  status={s}  oil={o}  gas={g}")
 
             except Exception as e:
-                print(f"ERROR {type(e).__name__}: {e}")
+                print(timed(f"ERROR {type(e).__name__}: {e}", t0))
                 failed += 1
 
-            append_jsonl(row, out_jsonl)
-            time.sleep(args.delay * 0.5)
+            out.write(row)
+            if pacer is None:
+                time.sleep(args.delay * 0.5)
 
     except KeyboardInterrupt:
         print("\n\nInterrupted! Progress saved.")
     finally:
-        driver.quit()
+        scraper.quit()
         print(f"\nDone. success={success}  failed={failed}  skipped={skipped}")
-        print(f"Output: {out_jsonl}")
-        if failed > 0:
+        if args.engine == "http":
+            print(f"Browser fallbacks: {scraper.browser_fallbacks}")
+        if pacer is not None:
+            print(f"Adaptive pacing: {pacer.summary()}")
+        if scraper.page_stats:
+            print(f"Browser pages: {scraper.page_summary()}")
+        if cache is not None:
+            print(f"HTML cache: hits={cache.hits}  misses={cache.misses}  size={cache.total_bytes() / 1e6:.1f} MB")
+        close_url_map(url_map)
+        print(f"Output: {out.path}")
+        if failed > 0 and not args.retry_queue:
             print("Tip: re-run with --resume to retry failed ones won't help (they stay).")
-            print("     Delete output and re-run to retry all.")
+            print("     Add --retry_queue FILE to retry them on later --resume runs.")
 
 
 if __name__ == "__main__":
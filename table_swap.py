@@ -0,0 +1,170 @@
+"""
+Shadow-table reloads for load_to_mysql.py (--shadow / --rollback).
+
+A shadow load never touches the live tables while it runs:
+
+    1. <t>_next is created LIKE <t> for every table in the group (no foreign
+       keys, non-unique secondary indexes dropped so the load only maintains
+       the primary key).
+    2. The loader fills the _next tables.
+    3. finish_shadow rebuilds the secondary indexes and the foreign keys on
+       the _next tables (pointing at the other _next tables), which also
+       checks that every child row has its parent.
+    4. verify_counts compares the _next row counts with the rows loaded
+       and with the live tables.
+    5. swap renames live -> <t>_prev and _next -> live for the whole group in
+       one RENAME TABLE, so readers see either the old or the new generation.
+
+The previous generation stays as <t>_prev until the next shadow load;
+rollback swaps it back in with one RENAME TABLE (and a second rollback
+rolls forward again). Foreign keys follow renamed tables, so each
+generation's children keep pointing at their own well_info.
+"""
+
+import re
+import time
+
+NEXT = "_next"
+PREV = "_prev"
+RE_GEN = re.compile(r"_g\d+$")
+
+
+def exists(cur, table: str) -> bool:
+    cur.execute("SELECT COUNT(*) FROM information_schema.TABLES WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s",
+                (table,))
+    return cur.fetchone()[0] > 0
+
+
+def count(cur, table: str) -> int:
+    cur.execute(f"SELECT COUNT(*) FROM {table}")
+    return cur.fetchone()[0]
+
+
+def foreign_keys(cur, table: str) -> list:
+    """[(name, column, referenced table, referenced column, ON DELETE rule), ...] of a table."""
+    cur.execute(
+        "SELECT k.CONSTRAINT_NAME, k.COLUMN_NAME, k.REFERENCED_TABLE_NAME, k.REFERENCED_COLUMN_NAME, r.DELETE_RULE "
+        "FROM information_schema.KEY_COLUMN_USAGE k "
+        "JOIN information_schema.REFERENTIAL_CONSTRAINTS r "
+        "  ON r.CONSTRAINT_SCHEMA = k.CONSTRAINT_SCHEMA AND r.CONSTRAINT_NAME = k.CONSTRAINT_NAME "
+        "WHERE k.TABLE_SCHEMA = DATABASE() AND k.TABLE_NAME = %s AND k.REFERENCED_TABLE_NAME IS NOT NULL "
+        "ORDER BY k.CONSTRAINT_NAME, k.ORDINAL_POSITION",
+        (table,),
+    )
+    return cur.fetchall()
+
+
+def deferred_indexes(cur, table: str) -> dict:
+    """Non-unique secondary indexes of a table: {name: [column or column(prefix), ...]}."""
+    cur.execute(
+        "SELECT INDEX_NAME, COLUMN_NAME, SUB_PART FROM information_schema.STATISTICS "
+        "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND INDEX_NAME <> 'PRIMARY' AND NON_UNIQUE = 1 "
+        "ORDER BY INDEX_NAME, SEQ_IN_INDEX",
+        (table,),
+    )
+    out = {}
+    for name, col, sub in cur.fetchall():
+        out.setdefault(name, []).append(f"{col}({sub})" if sub else col)
+    return out
+
+
+class ShadowLoad:
+    """The _next generation of a group of tables (parents first), from creation to swap."""
+
+    def __init__(self, conn, cur, tables: list):
+        self.conn = conn
+        self.cur = cur
+        self.tables = list(tables)
+        self.gen = int(time.time())
+        self.indexes = {}
+        self.fks = {}
+
+    def next_name(self, table: str) -> str:
+        return table + NEXT
+
+    def create(self):
+        """Drop leftover _next tables and create empty ones shaped like the live tables."""
+        cur = self.cur
+        cur.execute("SET FOREIGN_KEY_CHECKS=0")
+        for t in reversed(self.tables):
+            cur.execute(f"DROP TABLE IF EXISTS {self.next_name(t)}")
+        cur.execute("SET FOREIGN_KEY_CHECKS=1")
+        for t in self.tables:
+            nt = self.next_name(t)
+            cur.execute(f"CREATE TABLE {nt} LIKE {t}")  # LIKE copies indexes, not foreign keys
+            self.fks[t] = foreign_keys(cur, t)
+            self.indexes[t] = deferred_indexes(cur, t)
+            if self.indexes[t]:
+                cur.execute(f"ALTER TABLE {nt} " + ", ".join(f"DROP INDEX {i}" for i in self.indexes[t]))
+        self.conn.commit()
+
+    def copy_live(self, table: str, key: str = "api"):
+        """Carry the live rows of a table with no new input over (those whose parent is still loaded)."""
+        parents = [(col, ref, refcol) for _, col, ref, refcol, _ in self.fks[table] if ref in self.tables]
+        where = " AND ".join(f"t.{col} IN (SELECT {refcol} FROM {self.next_name(ref)})" for col, ref, refcol in parents)
+        self.cur.execute(f"INSERT INTO {self.next_name(table)} SELECT t.* FROM {table} t" + (f" WHERE {where}" if where else ""))
+        self.conn.commit()
+        return self.cur.rowcount
+
+    def finish(self):
+        """Build the deferred indexes, then the foreign keys (validated against the _next parents)."""
+        cur = self.cur
+        for t in self.tables:
+            nt = self.next_name(t)
+            if self.indexes[t]:
+                cur.execute(f"ALTER TABLE {nt} " + ", ".join(
+                    f"ADD INDEX {name} ({', '.join(cols)})" for name, cols in self.indexes[t].items()))
+            for name, col, ref, refcol, rule in self.fks[t]:
+                target = self.next_name(ref) if ref in self.tables else ref
+                # constraint names are unique per schema: the live generation keeps its own
+                fk = f"{RE_GEN.sub('', name)}_g{self.gen}"
+                cur.execute(f"ALTER TABLE {nt} ADD CONSTRAINT {fk} FOREIGN KEY ({col}) "
+                            f"REFERENCES {target} ({refcol}) ON DELETE {rule}")
+        self.conn.commit()
+
+    def verify(self, expected: dict, min_ratio: float) -> list:
+        """
+        expected: {table: distinct keys loaded}. Returns a list of problems: a
+        _next count that differs from what was loaded, or that is below
+        min_ratio of the live table.
+        """
+        problems = []
+        for t in self.tables:
+            n_next = count(self.cur, self.next_name(t))
+            n_live = count(self.cur, t)
+            if t in expected and n_next != expected[t]:
+                problems.append(f"{t}: {n_next} rows in {self.next_name(t)}, {expected[t]} loaded")
+            if n_live and n_next < n_live * min_ratio:
+                problems.append(f"{t}: {n_next} rows would replace {n_live} (below {min_ratio:.0%})")
+            print(f"  [{t}] live {n_live} -> next {n_next}")
+        return problems
+
+    def swap(self):
+        """One RENAME TABLE: live -> _prev, _next -> live, for the whole group; old _prev dropped first."""
+        cur = self.cur
+        cur.execute("SET FOREIGN_KEY_CHECKS=0")
+        for t in reversed(self.tables):
+            cur.execute(f"DROP TABLE IF EXISTS {t}{PREV}")
+        cur.execute("SET FOREIGN_KEY_CHECKS=1")
+        cur.execute("RENAME TABLE " + ", ".join(
+            f"{t} TO {t}{PREV}, {self.next_name(t)} TO {t}" for t in self.tables))
+        self.conn.commit()
+
+    def discard(self):
+        """Drop the _next tables after a failed or rejected load."""
+        self.conn.rollback()
+        self.cur.execute("SET FOREIGN_KEY_CHECKS=0")
+        for t in reversed(self.tables):
+            self.cur.execute(f"DROP TABLE IF EXISTS {self.next_name(t)}")
+        self.cur.execute("SET FOREIGN_KEY_CHECKS=1")
+        self.conn.commit()
+
+
+def rollback(conn, cur, tables: list):
+    """Swap the _prev generation back in (live becomes _prev), in one RENAME TABLE."""
+    missing = [t + PREV for t in tables if not exists(cur, t + PREV)]
+    if missing:
+        raise RuntimeError(f"nothing to roll back to: {', '.join(missing)} not found")
+    cur.execute("RENAME TABLE " + ", ".join(
+        f"{t} TO {t}_swap, {t}{PREV} TO {t}, {t}_swap TO {t}{PREV}" for t in tables))
+    conn.commit()
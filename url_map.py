@@ -0,0 +1,72 @@
+"""
+Persistent API# -> DrillingEdge detail URL map for scrape_production.py.
+
+Detail URLs are stable, so once a well's page is known the search results
+page can be skipped on later runs. The map is a flat JSON object saved with
+an atomic replace; it is seeded from the drillingedge_url values already in
+production_data.jsonl and kept up to date by the scraper. Entries whose page
+turns out not to be a detail page (404, moved) are dropped.
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Optional
+
+
+class DetailUrlMap:
+    def __init__(self, path: Path, save_every: int = 25):
+        # save_every=0: never write (read-only copy, e.g. in browser pool workers)
+        self.path = Path(path)
+        self.save_every = save_every
+        self.urls: dict[str, str] = {}
+        self.hits = 0
+        self.invalidated = 0
+        self._dirty = 0
+        if self.path.exists():
+            self.urls = json.loads(self.path.read_text(encoding="utf-8"))
+
+    def __len__(self) -> int:
+        return len(self.urls)
+
+    def get(self, api: str) -> Optional[str]:
+        url = self.urls.get(api)
+        if url:
+            self.hits += 1
+        return url
+
+    def set(self, api: str, url: str):
+        if api and url and self.urls.get(api) != url:
+            self.urls[api] = url
+            self._changed()
+
+    def invalidate(self, api: str):
+        if self.urls.pop(api, None) is not None:
+            self.invalidated += 1
+            self._changed()
+
+    def seed(self, rows) -> int:
+        """Add drillingedge_url of successfully scraped rows not in the map yet; returns how many."""
+        added = 0
+        for row in rows:
+            api, url = row.get("api"), row.get("drillingedge_url")
+            if api and url and row.get("scrape_success") and api not in self.urls:
+                self.urls[api] = url
+                added += 1
+        if added:
+            self._changed()
+        return added
+
+    def _changed(self):
+        self._dirty += 1
+        if self.save_every and self._dirty >= self.save_every:
+            self.save()
+
+    def save(self):
+        if not self._dirty or not self.save_every:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        tmp.write_text(json.dumps(self.urls, indent=0, sort_keys=True), encoding="utf-8")
+        os.replace(tmp, self.path)
+        self._dirty = 0
@@ -51,6 +51,35 @@ function makeIcon(cls) {
     });
 }
 
+//  Raw OCR text (lazy) 
+
+function rawTextButton(sha, label) {
+    if (!sha) return "";
+    return `<button class="popup__raw-btn" onclick="showRawText(this, '${sha}')">${label}</button>`;
+}
+
+function showRawText(btn, sha) {
+    const box = btn.parentElement.querySelector(".popup__raw-text");
+    if (box.dataset.sha === sha) {
+        box.hidden = !box.hidden;
+        return;
+    }
+    box.hidden = false;
+    box.textContent = "Loading…";
+    fetch(`/api/text/${sha}`)
+        .then((res) => {
+            if (!res.ok) throw new Error("HTTP " + res.status);
+            return res.text();
+        })
+        .then((text) => {
+            box.dataset.sha = sha;
+            box.textContent = text;
+        })
+        .catch((err) => {
+            box.textContent = "Failed to load raw text (" + err.message + ")";
+        });
+}
+
 //  Popup 
 
 function buildPopup(w) {
@@ -196,6 +225,15 @@ function buildPopup(w) {
             </div>
         </div>
 
+        ${w.well_raw_text_sha || w.stim_raw_text_sha ? `
+        <!--  Raw OCR text (fetched on demand)  -->
+        <div class="popup__section">
+            <div class="popup__section-title">Raw OCR Text</div>
+            ${rawTextButton(w.well_raw_text_sha, "Well page")}
+            ${rawTextButton(w.stim_raw_text_sha, "Stimulation page")}
+            <pre class="popup__raw-text" hidden></pre>
+        </div>` : ""}
+
     </div>`;
 }
 
@@ -6,10 +6,13 @@ Routes:
   GET /            → serves index.html
   GET /static/<f>  → serves style.css / app.js
   GET /api/wells   → JSON: all well + stimulation + production data
+  GET /api/text/<sha> → raw OCR text blob (fetched lazily by popups)
 """
 
 import os
-from flask import Flask, jsonify, send_from_directory
+import re
+import zlib
+from flask import Flask, Response, abort, jsonify, send_from_directory
 import mysql.connector
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -74,6 +77,10 @@ def api_wells():
             s.max_treatment_rate_bbl_min,
             s.details,
 
+            /*  raw OCR text, resolved lazily via /api/text/<sha>  */
+            w.raw_text_sha       AS well_raw_text_sha,
+            s.raw_text_clean_sha AS stim_raw_text_sha,
+
             /*  production_data (web-scraped)  */
             p.well_status,
             p.well_type,
@@ -101,5 +108,25 @@ def api_wells():
     return jsonify(rows)
 
 
+@app.route("/api/text/<sha>")
+def api_text(sha):
+    if not re.fullmatch(r"[0-9a-f]{64}", sha):
+        abort(404)
+    conn = get_db()
+    cur = conn.cursor()
+    cur.execute("SELECT body FROM text_blobs WHERE sha = %s", (sha,))
+    row = cur.fetchone()
+    cur.close()
+    conn.close()
+    if row is None:
+        abort(404)
+
+    text = zlib.decompress(bytes(row[0])).decode("utf-8")
+    resp = Response(text, mimetype="text/plain; charset=utf-8")
+    # content-addressed: the body behind a hash never changes
+    resp.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+    return resp
+
+
 if __name__ == "__main__":
     app.run(host="127.0.0.1", port=5000, debug=False)
\ No newline at end of file
@@ -0,0 +1,109 @@
+"""
+Pre-scrape planning for scrape_production.py.
+
+dedupe_wells: input rows are grouped by normalized API# (10-digit
+SS-CCC-NNNNN, so "3305302102", "33-053-02102-00-00" and "33-053-02102" are
+one well); only the first row of each API# is scraped, and its output row
+stands for every input row of that well. The normalized form is only the
+grouping key: rows keep the api they came with, so output rows still join
+to well_info.api.
+
+batch_groups / find_well_hrefs (--batch_search): wells whose detail URL is
+not known yet are grouped by operator and county. One operator/county
+search results page lists many wells, so a group of --batch_min or more
+wells costs one search request instead of one per well; the detail URLs
+found on it are fanned back out to every well of the group.
+"""
+
+import re
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+from bs4 import BeautifulSoup
+
+RE_API = re.compile(r"\b\d{2}-?\d{3}-?\d{5}(?:-?\d{2}-?\d{2})?\b")
+RE_NON_DIGIT = re.compile(r"\D")
+RE_OPERATOR_PUNCT = re.compile(r"[^a-z0-9 ]+")
+RE_COUNTY = re.compile(r"\s+county\b.*$", re.I)
+OPERATOR_SUFFIXES = {"llc", "inc", "corp", "corporation", "co", "company", "ltd", "lp", "llp", "plc"}
+
+
+def norm_api(api) -> Optional[str]:
+    """'3305302102' / '33-053-02102-00-00' -> '33-053-02102'; None if not an API#."""
+    if not api:
+        return None
+    digits = RE_NON_DIGIT.sub("", str(api))
+    if len(digits) not in (10, 12, 14):
+        return None
+    return f"{digits[:2]}-{digits[2:5]}-{digits[5:10]}"
+
+
+def api_key(api) -> Optional[str]:
+    """Grouping key of an API#: norm_api, or the stripped value if it isn't one."""
+    return norm_api(api) or (str(api).strip() if api else None)
+
+
+def norm_operator(name) -> str:
+    """'Oasis Petroleum North America, LLC.' -> 'oasis petroleum north america'."""
+    words = RE_OPERATOR_PUNCT.sub(" ", str(name or "").lower()).split()
+    while words and words[-1] in OPERATOR_SUFFIXES:
+        words.pop()
+    return " ".join(words)
+
+
+def norm_county(name) -> str:
+    """'McKenzie County, North Dakota' -> 'McKenzie'."""
+    return RE_COUNTY.sub("", str(name or "").split(",")[0]).strip()
+
+
+def dedupe_wells(wells: List[dict]):
+    """
+    wells: input rows in order. Returns (unique, counts): unique is
+    [(input index, well), ...], first occurrence of each API# (by api_key) in
+    input order; well is a copy with its api as given.
+    """
+    groups: "OrderedDict[str, tuple]" = OrderedDict()
+    counts = {"rows": len(wells), "unique": 0, "duplicates": 0, "no_api": 0}
+    for i, well in enumerate(wells, 1):
+        key = api_key(well.get("api"))
+        if not key:
+            counts["no_api"] += 1
+            continue
+        if key in groups:
+            counts["duplicates"] += 1
+            rep = groups[key][1]
+            for k, v in well.items():  # another scan of the same well may have read what the first missed
+                if v not in (None, "") and rep.get(k) in (None, ""):
+                    rep[k] = v
+            continue
+        groups[key] = (i, dict(well))
+    unique = list(groups.values())
+    counts["unique"] = len(unique)
+    return unique, counts
+
+
+def batch_groups(wells, min_size: int) -> List[tuple]:
+    """wells: [(input index, well), ...] -> [(operator query, county, [api, ...]), ...] with >= min_size wells."""
+    groups: Dict[tuple, list] = OrderedDict()
+    for _, well in wells:
+        op = norm_operator(well.get("operator"))
+        if op:
+            county = norm_county(well.get("county") or well.get("county_state"))
+            groups.setdefault((op, county), []).append(well["api"])
+    return [(op, county, apis) for (op, county), apis in groups.items() if len(apis) >= min_size]
+
+
+def find_well_hrefs(html: str) -> Dict[str, str]:
+    """Search results page -> {api_key: detail href} for every result row."""
+    out = {}
+    soup = BeautifulSoup(html, "html.parser")
+    for tr in soup.select("table tr"):
+        m = RE_API.search(tr.get_text(" "))
+        if not m:
+            continue
+        for a in tr.find_all("a", href=True):
+            href = a["href"]
+            if "/wells/" in href and "/operators/" not in href:
+                out[api_key(m.group(0))] = href
+                break
+    return out